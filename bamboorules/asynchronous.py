@@ -0,0 +1,214 @@
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from bamboorules.plan import Node
+
+# Values whose truthiness is evaluated row-wise by logical operations
+PANDAS = (pd.DataFrame, pd.Series)
+
+
+class AsyncPlan:
+    """
+    JsonLogic rule evaluated asynchronously, returning the same results as
+    'Engine.execute' with the results of custom operations returning awaitables
+    (like coroutine functions) awaited.
+
+    Subtrees without custom operations are evaluated synchronously as usual.
+    The arguments of other operations are evaluated concurrently (with
+    'asyncio.gather') before calling the operation, except for logical
+    operations ('if', '?:', 'and', 'or') which evaluate their arguments one
+    after the other and only as needed, in the same order as 'execute'.
+
+    If 'max_concurrency' is given, at most that many custom operations are
+    called and awaited at once during an evaluation.
+
+    Once a condition of a logical operation evaluates to a Pandas DataFrame or
+    Series, and for scoped operations, the operation itself runs in a worker
+    thread while the arguments it evaluates are awaited on the event loop.
+
+    Example:
+    plan = AsyncPlan(engine, {"+": [{"lookup": ["a"]}, {"lookup": ["b"]}]})
+    await plan({})  # Awaits both lookups concurrently
+    """
+
+    def __init__(self, engine, logic, max_concurrency=None):
+        self.engine = engine
+        self.logic = logic
+        self.max_concurrency = max_concurrency
+        self.asynchronous = set()
+        self.custom = set()
+        self._scan(logic)
+
+    def __repr__(self):
+        return "AsyncPlan(%r)" % (self.logic,)
+
+    async def __call__(self, data=None):
+        limit = None
+        if self.max_concurrency is not None:
+            limit = asyncio.Semaphore(self.max_concurrency)
+        return await self._evaluate(self.logic, data, limit)
+
+    def _is_custom(self, operator):
+        """Check that an operation is a custom (possibly asynchronous) one."""
+        engine = self.engine
+        if operator in engine._custom_operations:
+            return True
+        return not any(
+            operator in operations
+            for operations in (
+                engine._logical_operations,
+                engine._scoped_operations,
+                engine._data_operations,
+                engine._common_operations,
+                engine._unsupported_operations,
+            )
+        )
+
+    def _scan(self, logic):
+        """
+        Register the custom operators of a JsonLogic rule and the id of every
+        subtree holding some, and check that the rule holds some.
+        """
+        engine = self.engine
+        if not engine._is_logic(logic):
+            return False  # Arrays evaluate to themselves
+        operator = engine._get_operator(logic)
+        custom = self._is_custom(operator)
+        if custom:
+            self.custom.add(operator)
+        for value in engine._get_values(logic, operator):
+            custom = self._scan(value) or custom
+        if custom:
+            self.asynchronous.add(id(logic))
+        return custom
+
+    async def _evaluate(self, logic, data, limit):
+        """Evaluate a JsonLogic rule, awaiting its custom operations."""
+        engine = self.engine
+        if id(logic) not in self.asynchronous:
+            return engine._execute(logic, data)
+
+        operator = engine._get_operator(logic)
+        values = engine._get_values(logic, operator)
+        data = engine._get_data(data)
+
+        if operator in ("if", "?:"):
+            if operator == "if" or len(values) == 3:
+                return await self._if(data, values, limit)
+        elif operator in ("and", "or"):
+            return await self._operands(data, values, operator == "or", limit)
+        if operator in engine._logical_operations:
+            return engine._logical_operations[operator](data, *values)
+
+        if operator in engine._scoped_operations:
+            operation = engine._scoped_operations[operator]
+            rest = list(values[2:])
+            return await self._bridge(
+                lambda *args: operation(data, *args, *rest), values[:2], limit
+            )
+
+        values = await self._arguments(values, data, limit)
+        if operator in engine._data_operations:
+            return engine._data_operations[operator](data, *values)
+        operation = engine._get_operation(operator)
+        if operator not in self.custom:
+            return operation(*values)
+        if limit is None:
+            return await self._call(operation, values)
+        async with limit:
+            return await self._call(operation, values)
+
+    async def _arguments(self, values, data, limit):
+        """
+        Evaluate the arguments of an operation, the ones holding custom
+        operations concurrently.
+        """
+        values = list(values)
+        pending = []
+        for i, value in enumerate(values):
+            if id(value) in self.asynchronous:
+                pending.append(i)
+            else:
+                values[i] = self.engine._execute(value, data)
+        if len(pending) == 1:
+            (i,) = pending
+            values[i] = await self._evaluate(values[i], data, limit)
+        elif pending:
+            results = await asyncio.gather(
+                *[self._evaluate(values[i], data, limit) for i in pending]
+            )
+            for i, result in zip(pending, results):
+                values[i] = result
+        return values
+
+    @staticmethod
+    async def _call(operation, values):
+        """Call an operation and await its result if it is awaitable."""
+        result = operation(*values)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _if(self, data, args, limit):
+        """Evaluate an 'if' chain like 'Engine._if', awaiting its arguments."""
+        engine = self.engine
+        for i in range(0, len(args) - 1, 2):
+            condition = await self._evaluate(args[i], data, limit)
+            if isinstance(condition, PANDAS):
+                return await self._bridge(
+                    lambda *rest: engine._select(data, condition, *rest),
+                    args[i + 1 :],
+                    limit,
+                )
+            if engine._truthy(condition):
+                return await self._evaluate(args[i + 1], data, limit)
+        if len(args) % 2:
+            return await self._evaluate(args[-1], data, limit)
+        return None
+
+    async def _operands(self, data, args, truthy, limit):
+        """
+        Evaluate an 'and' ('truthy' is False) or 'or' ('truthy' is True) like
+        'Engine._and' and 'Engine._or', awaiting its arguments.
+        """
+        engine = self.engine
+        current = False
+        for i, current in enumerate(args):
+            current = await self._evaluate(current, data, limit)
+            if isinstance(current, PANDAS):
+                return await self._bridge(
+                    lambda *rest: engine._select_operands(
+                        data, current, list(rest), truthy
+                    ),
+                    args[i + 1 :],
+                    limit,
+                )
+            if engine._truthy(current) is truthy:
+                return current
+        return current
+
+    async def _bridge(self, function, args, limit):
+        """
+        Call a synchronous function evaluating JsonLogic arguments itself (like
+        row-wise and scoped operations do) in a worker thread, with nodes
+        evaluating its arguments on the event loop.
+        """
+        loop = asyncio.get_running_loop()
+
+        def node(logic):
+            if id(logic) not in self.asynchronous:
+                return logic
+
+            def evaluate(data):
+                coroutine = self._evaluate(logic, data, limit)
+                return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+            return Node(logic, evaluate)
+
+        nodes = [node(arg) for arg in args]
+        # A thread of its own, as bridges may nest
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await loop.run_in_executor(executor, lambda: function(*nodes))
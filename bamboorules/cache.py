@@ -0,0 +1,213 @@
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import count
+
+import pandas as pd
+
+SEQUENCE = (tuple, list)
+
+PANDAS = (pd.DataFrame, pd.Series, pd.Index)
+
+# Default memory budget of cached results, in bytes
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+class ResultCache:
+    """
+    Memory-bounded LRU cache of rule evaluation results (see 'Engine').
+
+    Results are keyed by the structural key of the rule and a fingerprint of
+    the data object: Pandas objects are identified by identity and a version
+    bumped by 'invalidate', dictionaries and arrays by content.
+    Least recently used results are evicted once cached results and their keys
+    take more than 'max_bytes' (as estimated by 'sizeof') or once there are
+    more than 'max_entries' (if given) of them.
+
+    'hits' and 'misses' count the lookups that found a cached result or not.
+
+    N.B.: Pandas objects modified in place must be invalidated, and cached
+    results are shared between lookups: they must not be modified in place.
+
+    Example:
+    engine = Engine(cache=ResultCache(max_bytes=64 * 2**20))
+    engine.execute(logic, {"df": df})  # Miss
+    engine.execute(logic, {"df": df})  # Hit
+    df.loc[0, "a"] = 1
+    engine.cache.invalidate(df)
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._tokens = {}
+        self._keys = {}
+        self._counter = count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "ResultCache(%d entries, %d bytes, %d hits, %d misses)" % (
+            len(self._entries),
+            self.nbytes,
+            self.hits,
+            self.misses,
+        )
+
+    def _token(self, obj):
+        """
+        Return the version token of a Pandas object, unique across objects
+        (even if their id gets reused) and versions.
+        """
+        key = id(obj)
+        entry = self._tokens.get(key)
+        if entry is None or entry[0]() is not obj:
+
+            def forget(ref, key=key):
+                if self._tokens.get(key, (None,))[0] is ref:
+                    del self._tokens[key]
+
+            entry = (weakref.ref(obj, forget), next(self._counter))
+            self._tokens[key] = entry
+        return entry[1]
+
+    def fingerprint(self, data):
+        """
+        Return a hashable fingerprint of a data object, or None if it holds
+        values that cannot be fingerprinted (unhashable objects).
+        """
+        if isinstance(data, PANDAS):
+            with self._lock:
+                return (type(data), self._token(data))
+        if isinstance(data, Mapping):
+            items = []
+            for key, value in data.items():
+                value = self.fingerprint(value)
+                if value is None:
+                    return None
+                items.append((key, value))
+            return (dict, tuple(items))
+        if isinstance(data, SEQUENCE):
+            values = []
+            for value in data:
+                value = self.fingerprint(value)
+                if value is None:
+                    return None
+                values.append(value)
+            return (type(data), tuple(values))
+        if isinstance(data, float):
+            return (float, repr(data))
+        try:
+            hash(data)
+        except TypeError:
+            return None
+        return (type(data), data)
+
+    def invalidate(self, obj=None):
+        """
+        Invalidate cached results computed from a Pandas object modified in
+        place, or every cached result if no object is given.
+        """
+        with self._lock:
+            if obj is None:
+                self._entries.clear()
+                self._keys.clear()
+                self.nbytes = 0
+                return
+            entry = self._tokens.get(id(obj))
+            if entry is None or entry[0]() is not obj:
+                return
+            del self._tokens[id(obj)]
+            for key in self._keys.pop(entry[1], ()):
+                self._pop(key)
+
+    def clear(self):
+        """Drop every cached result and reset the counters."""
+        self.invalidate()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        """Return the cached result of a key as a (found, value) tuple."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        """Cache the result of a key, evicting least recently used results."""
+        nbytes = sizeof(value) + sizeof(key)
+        if nbytes > self.max_bytes:
+            return
+        tokens = set(_tokens(key))
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, nbytes, tokens)
+            self.nbytes += nbytes
+            for token in tokens:
+                self._keys.setdefault(token, set()).add(key)
+            while self._entries and (
+                self.nbytes > self.max_bytes
+                or (
+                    self.max_entries is not None
+                    and len(self._entries) > self.max_entries
+                )
+            ):
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key):
+        """Drop the cached result of a key, if any (with the lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, nbytes, tokens = entry
+        self.nbytes -= nbytes
+        for token in tokens:
+            keys = self._keys.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys[token]
+
+
+def _tokens(fingerprint):
+    """Yield the version tokens of the Pandas objects of a fingerprint."""
+    if not isinstance(fingerprint, tuple):
+        return
+    first = fingerprint[0] if fingerprint else None
+    if isinstance(first, type) and issubclass(first, PANDAS):
+        yield fingerprint[1]
+        return
+    for value in fingerprint:
+        yield from _tokens(value)
+
+
+def sizeof(value):
+    """
+    Estimate the memory taken by a result or key, in bytes. Classes (like the
+    types of fingerprints) are shared and not counted.
+    """
+    if isinstance(value, type):
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, SEQUENCE):
+        return sys.getsizeof(value) + sum(map(sizeof, value))
+    if isinstance(value, Mapping):
+        return sys.getsizeof(value) + sum(
+            sizeof(k) + sizeof(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
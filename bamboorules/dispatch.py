@@ -0,0 +1,181 @@
+import operator
+from itertools import product
+
+import pandas as pd
+
+SEQUENCE = (tuple, list, range)
+
+# Binary operations with their Pandas method, reflected Pandas method (applied
+# to a Pandas right argument) and Python operator (applied to scalars)
+OPERATIONS = {
+    "==": ("eq", "eq", operator.eq),
+    "<": ("lt", "gt", operator.lt),
+    "<=": ("le", "ge", operator.le),
+    "+": ("add", "radd", operator.add),
+    "-": ("sub", "rsub", operator.sub),
+    "*": ("mul", "rmul", operator.mul),
+    "/": ("truediv", "rtruediv", operator.truediv),
+    "//": ("floordiv", "rfloordiv", operator.floordiv),
+    "%": ("mod", "rmod", operator.mod),
+    "**": ("pow", "rpow", operator.pow),
+}
+
+# Binary operations evaluated as another one with swapped arguments
+SWAPPED_OPERATIONS = {">": "<", ">=": "<="}
+
+# Comparison operations, which only apply their Pandas method to a DataFrame
+# and another Pandas object or a Python sequence (not a scalar)
+COMPARISON_OPERATIONS = ("==", "<", "<=")
+
+
+def kind(value):
+    """
+    Return the kind of a value: "frame", "series", "sequence", "scalar" (as
+    told by Pandas, including NumPy scalars and Decimals) or "other".
+    """
+    if isinstance(value, pd.DataFrame):
+        return "frame"
+    if isinstance(value, pd.Series):
+        return "series"
+    if isinstance(value, SEQUENCE):
+        return "sequence"
+    if pd.api.types.is_scalar(value):
+        return "scalar"
+    return "other"
+
+
+class BinaryOperation:
+    """
+    Binary operation dispatched on the pair of types of its arguments.
+
+    The kernel evaluating the operation is resolved once per (type(a), type(b))
+    pair and cached: a Pandas argument applies the Pandas method of the
+    operation (or its reflected method if it is the right argument), after
+    aligning both arguments on their common index (inner join) unless 'aligned'
+    tells that they already share the same index, other arguments apply the
+    Python operator. Pairs of Python scalars thus reach the Python operator
+    without any Pandas call.
+
+    Kernels registered for a pair of types (see 'register') take precedence,
+    also for their subclasses.
+
+    Example:
+    ADD = BinaryOperation("+")
+    ADD(1, 2)  # Resolves and caches operator.add for (int, int)
+    ADD(pd.Series([1]), 2)  # Resolves and caches Series.add for (Series, int)
+    """
+
+    __slots__ = ("name", "method", "reflected", "python", "kernels", "registry")
+
+    def __init__(self, name):
+        self.name = name
+        self.method, self.reflected, self.python = OPERATIONS[name]
+        self.kernels = {}
+        self.registry = {}
+
+    def __repr__(self):
+        return "BinaryOperation(%r)" % (self.name,)
+
+    def __call__(self, a, b, aligned=False):
+        try:
+            kernel = self.kernels[type(a), type(b), aligned]
+        except KeyError:
+            kernel = self.resolve(a, b, aligned)
+        return kernel(a, b)
+
+    def resolve(self, a, b, aligned=False):
+        """Resolve and cache the kernel applying to the types of two arguments."""
+        kernel = self._registered(type(a), type(b))
+        if kernel is None:
+            kernel = self._default(kind(a), kind(b), type(a), type(b), aligned)
+        self.kernels[type(a), type(b), aligned] = kernel
+        return kernel
+
+    def _registered(self, left, right):
+        """Return the kernel registered for two types (or their bases), if any."""
+        if not self.registry:
+            return None
+        for pair in product(left.__mro__, right.__mro__):
+            if pair in self.registry:
+                return self.registry[pair]
+        return None
+
+    def _default(self, left_kind, right_kind, left, right, aligned):
+        """Return the built-in kernel applying to two kinds of arguments."""
+        frame_operands = ("frame", "series", "sequence")
+        if self.name not in COMPARISON_OPERATIONS:
+            frame_operands += ("scalar",)
+        if (left_kind == "frame" and right_kind in frame_operands) or (
+            left_kind == "series" and right_kind in ("series", "scalar")
+        ):
+            method = getattr(left, self.method)
+            align = not aligned and right_kind in ("frame", "series")
+            return _aligning(method) if align else method
+        if (right_kind == "frame" and left_kind in frame_operands) or (
+            right_kind == "series" and left_kind in ("series", "scalar")
+        ):
+            method = getattr(right, self.reflected)
+            align = not aligned and left_kind in ("frame", "series")
+            if align:
+                method = _aligning(method)
+            return lambda a, b: method(b, a)
+        return self.python
+
+    def register(self, left, right, kernel):
+        """
+        Register the kernel evaluating the operation on arguments of two types
+        (and their subclasses), called as 'kernel(a, b)'.
+        """
+        self.registry[left, right] = kernel
+        self.kernels.clear()
+
+    def unregister(self, left, right):
+        """Remove the kernel registered for two types."""
+        del self.registry[left, right]
+        self.kernels.clear()
+
+
+def _aligning(method):
+    """Return a Pandas method aligning its arguments first (inner join)."""
+
+    def kernel(a, b):
+        a, b = a.align(b, join="inner", copy=False)
+        return method(a, b)
+
+    return kernel
+
+
+# Dispatched binary operations by operator
+BINARY_OPERATIONS = {name: BinaryOperation(name) for name in OPERATIONS}
+
+
+def resolve(name, a, b, aligned=False):
+    """
+    Return the kernel evaluating a binary operation ('>' and '>=' included) on
+    arguments of the types of 'a' and 'b', called as 'kernel(a, b)'.
+    """
+    if name in SWAPPED_OPERATIONS:
+        swapped = BINARY_OPERATIONS[SWAPPED_OPERATIONS[name]].resolve(b, a, aligned)
+        return lambda a, b: swapped(b, a)
+    return BINARY_OPERATIONS[name].resolve(a, b, aligned)
+
+
+def register(name, left, right, kernel):
+    """
+    Register the kernel evaluating a binary operation ('==', '<', '+', ...) on
+    arguments of two types, for every engine.
+
+    Example:
+    register("+", Decimal, float, lambda a, b: a + Decimal(b))
+    register("+", pyarrow.Array, pyarrow.Array, pyarrow.compute.add)
+    """
+    if name not in BINARY_OPERATIONS:
+        raise ValueError("Unsupported binary operation %r" % (name,))
+    BINARY_OPERATIONS[name].register(left, right, kernel)
+
+
+def unregister(name, left, right):
+    """Remove the kernel registered for a binary operation and two types."""
+    if name not in BINARY_OPERATIONS:
+        raise ValueError("Unsupported binary operation %r" % (name,))
+    BINARY_OPERATIONS[name].unregister(left, right)
@@ -1,13 +1,60 @@
+import os
+import time
 from collections.abc import Mapping
-from functools import reduce
+from functools import lru_cache, partial, reduce
+from itertools import chain
+from operator import add, mul
 
+import numpy as np
 import pandas as pd
 
+from bamboorules import dispatch, fusion, inference, threads
+from bamboorules.asynchronous import AsyncPlan
+from bamboorules.dispatch import BINARY_OPERATIONS
+from bamboorules.parallel import execute_partitions
+from bamboorules.partial import REDUCING_OPERATIONS, IncrementalPlan, PartialPlan
+from bamboorules.plan import ALIGNED, Memo, Node, Plan
+from bamboorules.profiling import Profiler
+from bamboorules.records import RecordPlan
+from bamboorules.stack import StackPlan
+
 SEQUENCE = (tuple, list, range)
 
+# Operations that may have side effects or depend on more than their arguments
+IMPURE_OPERATIONS = {"method"}
+
+# Binary operations aligning their Pandas arguments
+ALIGNING_OPERATIONS = {"==", "<", "<=", ">", ">=", "+", "-", "*", "/", "//", "%"}
+
+# Operations whose results keep the index of their aligned Pandas arguments
+ALIGNED_OPERATIONS = ALIGNING_OPERATIONS | {"var", "if", "?:", "and", "or", "abs"}
+
+# Operations whose arguments may be evaluated concurrently on threads
+THREADED_OPERATIONS = ALIGNING_OPERATIONS | {"min", "max"}
+
+# 'reduce' operators running as native reductions and their Pandas equivalent
+REDUCERS = {
+    "+": "sum",
+    "*": "prod",
+    "min": "min",
+    "max": "max",
+    "and": "all",
+    "or": "any",
+}
+
 
 class Engine:
     _custom_operations = {}
+    _pure_operations = set()
+    _thread_safe_operations = set()
+    cache = None
+
+    def __init__(self, cache=None):
+        """
+        Optionally cache the results of 'execute' in a 'ResultCache', for rules
+        only made of pure operations (see 'add_operation').
+        """
+        self.cache = cache
 
     @property
     def operations(self):
@@ -41,48 +88,49 @@ class Engine:
         """Check if argument is a Pandas Series."""
         return isinstance(arg, pd.Series)
 
-    @staticmethod
-    def _is_series_or_scalar(arg):
-        """Check if argument is a Pandas Series or scalar."""
-        return isinstance(arg, pd.Series) or pd.api.types.is_scalar(arg)
-
     @staticmethod
     def _is_dataframe_or_series(arg):
         """Check if argument is a Pandas DataFrame or Series."""
         return isinstance(arg, (pd.DataFrame, pd.Series))
 
     @staticmethod
-    def _is_dataframe_series_or_sequence(arg):
-        """Check if argument is a Pandas DataFrame, Series or Python sequence."""
-        return isinstance(arg, (pd.DataFrame, pd.Series, *SEQUENCE))
-
-    @staticmethod
-    def _is_dataframe_series_sequence_or_scalar(arg):
+    def _broadcast(arg, like):
         """
-        Check if argument is a Pandas DataFrame, Series, scalar
-        or Python sequence.
+        Broadcast argument against the index (and columns) of a Pandas
+        DataFrame, Series or Index.
+        Pandas arguments are reindexed, any other argument is repeated.
         """
-        return isinstance(
-            arg, (pd.DataFrame, pd.Series, *SEQUENCE)
-        ) or pd.api.types.is_scalar(arg)
+        if isinstance(like, pd.DataFrame):
+            if isinstance(arg, pd.DataFrame):
+                return arg.reindex_like(like)
+            if isinstance(arg, pd.Series):
+                arg = arg.reindex(like.index)
+                return pd.DataFrame({column: arg for column in like.columns})
+            if arg is None or isinstance(arg, SEQUENCE):
+                return pd.DataFrame(
+                    [[arg] * len(like.columns)] * len(like.index),
+                    index=like.index,
+                    columns=like.columns,
+                    dtype=object,
+                )
+            return pd.DataFrame(arg, index=like.index, columns=like.columns)
+        index = like if isinstance(like, pd.Index) else like.index
+        if isinstance(arg, pd.DataFrame):
+            raise ValueError("Cannot broadcast a DataFrame against a Series")
+        if isinstance(arg, pd.Series):
+            return arg.reindex(index)
+        if arg is None or isinstance(arg, SEQUENCE):
+            return pd.Series([arg] * len(index), index=index, dtype=object)
+        return pd.Series(arg, index=index)
 
     # Common Operations
-    def _equal_to(self, a, b):
+
+    # Binary operations dispatch on the types of their arguments and align Pandas
+    # arguments on their common index (inner join) unless 'aligned' tells that
+    # they already share the same index (see 'dispatch.BinaryOperation').
+    def _equal_to(self, a, b, *, aligned=False):
         """Check for non-strict equality ('==') with JS-style type coercion."""
-        if (self._is_dataframe(a) and self._is_dataframe_series_or_sequence(b)) or (
-            self._is_series(a) and self._is_series_or_scalar(b)
-        ):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.eq(b)
-        elif (self._is_dataframe(b) and self._is_dataframe_series_or_sequence(a)) or (
-            self._is_series(b) and self._is_series_or_scalar(a)
-        ):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.eq(a)
-        else:
-            return a == b
+        return BINARY_OPERATIONS["=="](a, b, aligned)
 
     def _strict_equal_to(self, a, b):
         """Check for strict equality ('===') including type equality."""
@@ -98,47 +146,21 @@ class Engine:
         """Check for strict inequality ('!==') including type inequality."""
         return not self._strict_equal_to(a, b)
 
-    def _less_than(self, a, b):
+    def _less_than(self, a, b, *, aligned=False):
         """Check that A is less then B (A < B)."""
-        if (self._is_dataframe(a) and self._is_dataframe_series_or_sequence(b)) or (
-            self._is_series(a) and self._is_series_or_scalar(b)
-        ):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.lt(b)
-        elif (self._is_dataframe(b) and self._is_dataframe_series_or_sequence(a)) or (
-            self._is_series(b) and self._is_series_or_scalar(a)
-        ):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.gt(a)
-        else:
-            return a < b
+        return BINARY_OPERATIONS["<"](a, b, aligned)
 
-    def _less_than_or_equal_to(self, a, b):
+    def _less_than_or_equal_to(self, a, b, *, aligned=False):
         """Check that A is less then or equal to B (A <= B)."""
-        if (self._is_dataframe(a) and self._is_dataframe_series_or_sequence(b)) or (
-            self._is_series(a) and self._is_series_or_scalar(b)
-        ):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.le(b)
-        elif (self._is_dataframe(b) and self._is_dataframe_series_or_sequence(a)) or (
-            self._is_series(b) and self._is_series_or_scalar(a)
-        ):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.ge(a)
-        else:
-            return a <= b
+        return BINARY_OPERATIONS["<="](a, b, aligned)
 
-    def _greater_than(self, a, b):
+    def _greater_than(self, a, b, *, aligned=False):
         """Check that A is greater then B (A > B)."""
-        return self._less_than(b, a)
+        return self._less_than(b, a, aligned=aligned)
 
-    def _greater_than_or_equal_to(self, a, b):
+    def _greater_than_or_equal_to(self, a, b, *, aligned=False):
         """Check that A is greater then or equal to B (A >= B)."""
-        return self._less_than_or_equal_to(b, a)
+        return self._less_than_or_equal_to(b, a, aligned=aligned)
 
     @staticmethod
     def _truthy(a):
@@ -149,129 +171,46 @@ class Engine:
         """Check that argument evaluates to False according to core JsonLogic."""
         return not self._truthy(a)
 
-    def _add(self, a, b):
+    @staticmethod
+    def _truthy_mask(a):
+        """
+        Check that each element of a Pandas DataFrame or Series evaluates to True
+        according to core JsonLogic. Missing nullable values evaluate to False.
+        """
+        try:
+            return a.astype(bool)
+        except (TypeError, ValueError):
+            return a.fillna(False).astype(bool)
+
+    def _add(self, a, b, *, aligned=False):
         """Add B to A."""
-        if (
-            self._is_dataframe(a) and self._is_dataframe_series_sequence_or_scalar(b)
-        ) or (self._is_series(a) and self._is_series_or_scalar(b)):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.add(b)
-        elif (
-            self._is_dataframe(b) and self._is_dataframe_series_sequence_or_scalar(a)
-        ) or (self._is_series(b) and self._is_series_or_scalar(a)):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.radd(a)
-        else:
-            return a + b
+        return BINARY_OPERATIONS["+"](a, b, aligned)
 
-    def _sub(self, a, b=None):
+    def _sub(self, a, b=None, *, aligned=False):
         """Subtract B from A. If only A is provided - return its arithmetic negative."""
         if b is None:
             return -a
-        else:
-            if (
-                self._is_dataframe(a)
-                and self._is_dataframe_series_sequence_or_scalar(b)
-            ) or (self._is_series(a) and self._is_series_or_scalar(b)):
-                if self._is_dataframe_or_series(b):
-                    a, b = a.align(b, join="inner", copy=False)
-                return a.sub(b)
-            elif (
-                self._is_dataframe(b)
-                and self._is_dataframe_series_sequence_or_scalar(a)
-            ) or (self._is_series(b) and self._is_series_or_scalar(a)):
-                if self._is_dataframe_or_series(a):
-                    b, a = b.align(a, join="inner", copy=False)
-                return b.rsub(a)
-            else:
-                return a - b
+        return BINARY_OPERATIONS["-"](a, b, aligned)
 
-    def _mul(self, a, b):
+    def _mul(self, a, b, *, aligned=False):
         """Multiply A by B."""
-        if (
-            self._is_dataframe(a) and self._is_dataframe_series_sequence_or_scalar(b)
-        ) or (self._is_series(a) and self._is_series_or_scalar(b)):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.mul(b)
-        elif (
-            self._is_dataframe(b) and self._is_dataframe_series_sequence_or_scalar(a)
-        ) or (self._is_series(b) and self._is_series_or_scalar(a)):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.rmul(a)
-        else:
-            return a * b
+        return BINARY_OPERATIONS["*"](a, b, aligned)
 
-    def _truediv(self, a, b):
+    def _truediv(self, a, b, *, aligned=False):
         """Divide A by B (float division)."""
-        if (
-            self._is_dataframe(a) and self._is_dataframe_series_sequence_or_scalar(b)
-        ) or (self._is_series(a) and self._is_series_or_scalar(b)):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.truediv(b)
-        elif (
-            self._is_dataframe(b) and self._is_dataframe_series_sequence_or_scalar(a)
-        ) or (self._is_series(b) and self._is_series_or_scalar(a)):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.rtruediv(a)
-        else:
-            return a / b
+        return BINARY_OPERATIONS["/"](a, b, aligned)
 
-    def _floordiv(self, a, b):
+    def _floordiv(self, a, b, *, aligned=False):
         """Divide A by B (integer division)."""
-        if (
-            self._is_dataframe(a) and self._is_dataframe_series_sequence_or_scalar(b)
-        ) or (self._is_series(a) and self._is_series_or_scalar(b)):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.floordiv(b)
-        elif (
-            self._is_dataframe(b) and self._is_dataframe_series_sequence_or_scalar(a)
-        ) or (self._is_series(b) and self._is_series_or_scalar(a)):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.rfloordiv(a)
-        else:
-            return a // b
+        return BINARY_OPERATIONS["//"](a, b, aligned)
 
-    def _mod(self, a, b):
+    def _mod(self, a, b, *, aligned=False):
         """Modulo of A by B."""
-        if (
-            self._is_dataframe(a) and self._is_dataframe_series_sequence_or_scalar(b)
-        ) or (self._is_series(a) and self._is_series_or_scalar(b)):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.mod(b)
-        elif (
-            self._is_dataframe(b) and self._is_dataframe_series_sequence_or_scalar(a)
-        ) or (self._is_series(b) and self._is_series_or_scalar(a)):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.rmod(a)
-        else:
-            return a % b
+        return BINARY_OPERATIONS["%"](a, b, aligned)
 
-    def _pow(self, a, b):
+    def _pow(self, a, b, *, aligned=False):
         """A to the power B."""
-        if (
-            self._is_dataframe(a) and self._is_dataframe_series_sequence_or_scalar(b)
-        ) or (self._is_series(a) and self._is_series_or_scalar(b)):
-            if self._is_dataframe_or_series(b):
-                a, b = a.align(b, join="inner", copy=False)
-            return a.pow(b)
-        elif (
-            self._is_dataframe(b) and self._is_dataframe_series_sequence_or_scalar(a)
-        ) or (self._is_series(b) and self._is_series_or_scalar(a)):
-            if self._is_dataframe_or_series(a):
-                b, a = b.align(a, join="inner", copy=False)
-            return b.rpow(a)
-        else:
-            return a ** b
+        return BINARY_OPERATIONS["**"](a, b, aligned)
 
     def _abs(self, a):
         """Absolute value of A."""
@@ -304,6 +243,78 @@ class Engine:
         if self._is_dataframe_or_series(a):
             return a.max()
 
+    @staticmethod
+    def _as_strings(a):
+        """
+        Convert a Pandas Series to strings, backed by Arrow if available
+        (the default string dtype with PyArrow installed).
+        """
+        if isinstance(a.dtype, pd.StringDtype):
+            return a
+        return a.astype("str")
+
+    def _cat(self, *args):
+        """
+        Concatenate all arguments as strings.
+        Pandas Series are concatenated row-wise through vectorized string
+        operations, aligned on their common index.
+        """
+        if not any(self._is_series(arg) for arg in args):
+            return "".join(map(str, args))
+        result = ""
+        for arg in args:
+            result = self._add(
+                result, self._as_strings(arg) if self._is_series(arg) else str(arg)
+            )
+        return result
+
+    def _substr(self, source, start=0, length=None):
+        """
+        Get a portion of 'source' converted to a string, starting at 'start'
+        (counted from the end if negative) and of 'length' characters (up to the
+        end if not specified, dropping characters from the end if negative).
+        Pandas Series are sliced through vectorized string operations.
+        """
+        args = (source, start, length)
+        if self._is_series(start) or self._is_series(length):
+            like = next(arg for arg in args if self._is_series(arg))
+            rows = zip(*(self._broadcast(arg, like) for arg in args))
+            values = [
+                self._substr(*row) if pd.notna(row[0]) else row[0] for row in rows
+            ]
+            return pd.Series(values, index=like.index, dtype=object)
+        if self._is_series(source):
+            result = self._as_strings(source).str.slice(start)
+            return result if length is None else result.str.slice(0, length)
+        result = str(source)[start:]
+        return result if length is None else result[:length]
+
+    def _in(self, a, b):
+        """
+        Check that A is in B: either a substring of string B or an element of
+        array B.
+        Over Pandas Series B of strings, substrings are searched through
+        vectorized string operations, over Pandas Series A and array B
+        elements are looked up in a hash table. Missing values of Series are in
+        nothing and contain nothing.
+        """
+        if self._is_series(b):
+            if self._is_series(a):
+                a, b = a.align(b, join="inner", copy=False)
+                missing = (a.isna() | b.isna()).to_numpy()
+                values = zip(a, b, missing)
+                return pd.Series([not m and x in y for x, y, m in values], a.index)
+            if isinstance(a, str) and pd.api.types.is_string_dtype(b):
+                return self._as_strings(b).str.contains(a, regex=False, na=False)
+            values = zip(b, b.isna().to_numpy())
+            return pd.Series([not m and a in y for y, m in values], index=b.index)
+        if self._is_series(a):
+            if self._is_sequence(b):
+                return a.isin(b)
+            values = zip(a, a.isna().to_numpy())
+            return pd.Series([not m and x in b for x, m in values], index=a.index)
+        return a in b
+
     @staticmethod
     def _method(obj, method, args=[]):
         """
@@ -355,6 +366,9 @@ class Engine:
             "min_reduce": self._min_reduce,
             "max": self._max,
             "max_reduce": self._max_reduce,
+            "cat": self._cat,
+            "substr": self._substr,
+            "in": self._in,
             "method": self._method,
         }
 
@@ -382,14 +396,213 @@ class Engine:
             the second argument.
             - If the first argument evaluates to False then jump to the next pair
             (e.g.: from 0,1 to 2,3) and evaluate them.
+
+        If a condition evaluates to a Pandas DataFrame or Series, the rest of the
+        chain is evaluated row-wise (see '_select').
         """
         for i in range(0, len(args) - 1, 2):
-            if self._truthy(self.execute(args[i], data)):
-                return self.execute(args[i + 1], data)
+            condition = self._evaluate(args[i], data)
+            if self._is_dataframe_or_series(condition):
+                return self._select(data, condition, *args[i + 1 :])
+            if self._truthy(condition):
+                return self._evaluate(args[i + 1], data)
         if len(args) % 2:
-            return self.execute(args[-1], data)
+            return self._evaluate(args[-1], data)
+        else:
+            return None
+
+    def _select(self, data, condition, *args):
+        """
+        Evaluate the rest of an 'if' chain once a condition evaluated to a Pandas
+        DataFrame or Series, row-wise.
+
+        'args' are the remaining arguments of the chain, starting with the value
+        of 'condition'. Each row takes the value of its first truthy condition,
+        the 'else' value (or None) otherwise.
+        Conditions are only evaluated on rows that are not selected yet and values
+        only on the rows their condition selects (see '_evaluate_rows'). Evaluation
+        stops as soon as no row is left. Rows are matched by position, so that
+        duplicated index labels are supported.
+        """
+        like = condition
+        mask = self._truthy_mask(condition)
+        pending = ~mask
+        masks = [mask]
+        choices = [self._evaluate_rows(args[0], data, mask, like)]
+        for i in range(1, len(args) - 1, 2):
+            if not self._any(pending):
+                break
+            condition = self._evaluate_rows(args[i], data, pending, like)
+            mask = self._mask_rows(condition, like) & pending
+            pending &= ~mask
+            masks.append(mask)
+            choices.append(self._evaluate_rows(args[i + 1], data, mask, like))
         else:
+            if len(args) % 2 == 0 and self._any(pending):
+                masks.append(pending)
+                choices.append(self._evaluate_rows(args[-1], data, pending, like))
+        return self._combine(like, masks, choices)
+
+    def _select_operands(self, data, current, args, truthy):
+        """
+        Evaluate the rest of an 'and' ('truthy' is False) or 'or' ('truthy' is
+        True) once an argument evaluated to a Pandas DataFrame or Series, row-wise.
+
+        Each row takes the value of the first argument whose truthiness matches
+        'truthy', the value of the last argument otherwise.
+        Arguments are only evaluated on rows that are not decided yet (see
+        '_evaluate_rows') and evaluation stops as soon as no row is left. Rows
+        are matched by position, so that duplicated index labels are supported.
+        """
+        like = current
+        current = self._positional(current, like)
+        pending = self._broadcast(True, like)
+        masks, choices = [], []
+        for logic in args:
+            mask = self._mask_rows(current, like)
+            mask = (mask if truthy else ~mask) & pending
+            pending &= ~mask
+            masks.append(mask)
+            choices.append(current)
+            if not self._any(pending):
+                break
+            current = self._evaluate_rows(logic, data, pending, like)
+        else:
+            masks.append(pending)
+            choices.append(current)
+        return self._combine(like, masks, choices)
+
+    def _mask_like(self, arg, like):
+        """Return the truthiness of argument as a boolean mask shaped like 'like'."""
+        if self._is_dataframe_or_series(arg):
+            mask = self._broadcast(self._truthy_mask(arg), like)
+            return mask.fillna(False).astype(bool)
+        return self._broadcast(self._truthy(arg), like)
+
+    def _mask_rows(self, arg, like):
+        """
+        Return the truthiness of an argument relabelled by row positions (see
+        '_positional') as a boolean mask shaped like 'like'.
+        """
+        return self._mask_like(arg, self._positions(like)).set_axis(like.index)
+
+    @staticmethod
+    def _positions(like):
+        """Return a Pandas DataFrame or Series with its rows labelled by position."""
+        return like.set_axis(pd.RangeIndex(len(like.index)))
+
+    def _positional(self, value, like, rows=None):
+        """
+        Relabel the rows of a Pandas value evaluated on the rows of 'like' (all of
+        them, or those selected by the boolean array 'rows') by their positions
+        in 'like', so that it is scattered back positionally.
+        Pandas values indexed otherwise are aligned on 'like' by label first,
+        other values are returned as is.
+        """
+        if not self._is_dataframe_or_series(value):
+            return value
+        index = like.index
+        if value.index.equals(index):
+            return value.set_axis(pd.RangeIndex(len(index)))
+        if rows is not None and value.index.equals(index[rows]):
+            return value.set_axis(np.flatnonzero(rows))
+        return value.reindex(index).set_axis(pd.RangeIndex(len(index)))
+
+    @staticmethod
+    def _any(mask):
+        """Check that at least one element of a boolean DataFrame or Series is True."""
+        return bool(mask.to_numpy().any())
+
+    def _restrict(self, data, rows):
+        """
+        Restrict data object to the rows selected by a boolean Series.
+        Pandas DataFrames and Series sharing its index are filtered, Python
+        Mappings are walked, anything else is kept as is.
+        """
+        if self._is_dataframe_or_series(data):
+            if data.index.equals(rows.index):
+                return data[rows.to_numpy()]
+            return data
+        if self._is_dictionary(data):
+            return {key: self._restrict(value, rows) for key, value in data.items()}
+        return data
+
+    def _is_row_local(self, logic):
+        """
+        Check that a JsonLogic rule (or plan node) evaluates each row of Pandas
+        data independently of the others: it holds no reducing operation (see
+        'partial.REDUCING_OPERATIONS') nor 'reduce', whose results would depend
+        on the rows it is evaluated on.
+        """
+        pending = [logic.logic if isinstance(logic, Node) else logic]
+        while pending:
+            logic = pending.pop()
+            if self._is_sequence(logic):
+                pending.extend(logic)
+            elif self._is_logic(logic):
+                operator = self._get_operator(logic)
+                if operator in REDUCING_OPERATIONS or operator == "reduce":
+                    return False
+                pending.extend(self._get_values(logic, operator))
+        return True
+
+    def _evaluate_rows(self, logic, data, mask, like):
+        """
+        Evaluate JsonLogic rule (or plan node) on the active rows of a boolean
+        DataFrame or Series mask (shaped like 'like') only, and return its value
+        relabelled by row positions (see '_positional').
+        Rules that are not row-local (see '_is_row_local') are evaluated on all
+        rows. Return None without evaluating anything if no row is active.
+        """
+        rows = mask.any(axis=1) if self._is_dataframe(mask) else mask
+        values = rows.to_numpy()
+        if not values.any():
             return None
+        if values.all() or not self._is_row_local(logic):
+            return self._positional(self._evaluate(logic, data), like)
+        value = self._evaluate(logic, self._restrict(data, rows))
+        return self._positional(value, like, values)
+
+    def _combine(self, like, masks, choices):
+        """
+        Scatter partial results of a row-wise evaluation, relabelled by row
+        positions (see '_positional'), back into a result shaped like 'like':
+        each choice fills the elements of its (disjoint) mask, elements selected
+        by none of the masks are None.
+        """
+        positions = self._positions(like)
+        if self._is_dataframe(like):
+            covered = reduce(lambda a, b: a | b, masks)
+            result = self._broadcast(None, positions)
+            if covered.to_numpy().all():
+                result = self._broadcast(choices[-1], positions)
+            for mask, choice in zip(masks, choices):
+                if self._is_sequence(choice):
+                    choice = self._broadcast(choice, positions)
+                if self._any(mask):
+                    mask = mask.set_axis(positions.index)
+                    result = result.mask(mask, choice, axis=0)
+            return result.set_axis(like.index)
+
+        index = positions.index
+        positions, parts = [], []
+        pending = np.ones(len(index), dtype=bool)
+        for mask, choice in zip(masks, choices):
+            rows = mask.to_numpy()
+            pending &= ~rows
+            rows = np.flatnonzero(rows)
+            if len(rows):
+                positions.append(rows)
+                parts.append(self._broadcast(choice, index[rows]))
+        rows = np.flatnonzero(pending)
+        if len(rows) or not parts:
+            positions.append(rows)
+            parts.append(self._broadcast(None, index[rows]))
+
+        if len(parts) == 1:
+            return parts[0].set_axis(like.index)
+        order = np.argsort(np.concatenate(positions), kind="stable")
+        return pd.concat(parts).iloc[order].set_axis(like.index)
 
     def _iif(self, data, a, b, c):
         """
@@ -405,10 +618,14 @@ class Engine:
         that the whole expression evaluates to True).
         Otherwise return first countered falsy argument (meaning that the whole
         expression evaluates to False).
+        If an argument evaluates to a Pandas DataFrame or Series, the remaining
+        arguments are evaluated row-wise (see '_select_operands').
         """
         current = False
-        for current in args:
-            current = self.execute(current, data)
+        for i, current in enumerate(args):
+            current = self._evaluate(current, data)
+            if self._is_dataframe_or_series(current):
+                return self._select_operands(data, current, args[i + 1 :], False)
             if self._falsy(current):
                 return current  # First falsy argument
         return current  # Last argument
@@ -420,10 +637,14 @@ class Engine:
         (meaning that the whole expression evaluates to True).
         Otherwise return the last (falsy) argument (meaning that the whole
         expression evaluates to False).
+        If an argument evaluates to a Pandas DataFrame or Series, the remaining
+        arguments are evaluated row-wise (see '_select_operands').
         """
         current = False
-        for current in args:
-            current = self.execute(current, data)
+        for i, current in enumerate(args):
+            current = self._evaluate(current, data)
+            if self._is_dataframe_or_series(current):
+                return self._select_operands(data, current, args[i + 1 :], True)
             if self._truthy(current):
                 return current  # First truthy argument
         return current  # Last argument
@@ -465,15 +686,21 @@ class Engine:
         ]}
         calculates to: [1, 3, 5]
 
+        If 'scopedData' argument evaluates to a Pandas DataFrame or Series,
+        'scopedLogic' is evaluated once using it as its data object and the rows
+        it evaluates to a truthy value for are selected.
+
         If 'scopedData' argument does not evaluate to an array, an empty array
         is returned.
         """
-        scopedData = self.execute(scopedData, data)
+        scopedData = self._evaluate(scopedData, data)
+        if self._is_dataframe_or_series(scopedData):
+            return scopedData[self._scoped_mask(scopedData, scopedLogic)]
         if not self._is_sequence(scopedData):
             return []
         return list(
             filter(
-                lambda datum: self._truthy(self.execute(scopedLogic, datum)),
+                lambda datum: self._truthy(self._evaluate(scopedLogic, datum)),
                 scopedData,
             )
         )
@@ -502,13 +729,21 @@ class Engine:
         ]}
         calculates to: [2, 4, 6, 8, 10]
 
+        If 'scopedData' argument evaluates to a Pandas DataFrame or Series,
+        'scopedLogic' is evaluated once using it as its data object.
+
         If 'scopedData' argument does not evaluate to an array, an empty array
         is returned.
         """
-        scopedData = self.execute(scopedData, data)
+        scopedData = self._evaluate(scopedData, data)
+        if self._is_dataframe_or_series(scopedData):
+            result = self._evaluate(scopedLogic, scopedData)
+            if self._is_dataframe_or_series(result):
+                return result
+            return self._broadcast(result, scopedData.index)
         if not self._is_sequence(scopedData):
             return []
-        return list(map(lambda datum: self.execute(scopedLogic, datum), scopedData))
+        return list(map(lambda datum: self._evaluate(scopedLogic, datum), scopedData))
 
     def _reduce(self, data, scopedData, scopedLogic, initial=None):
         """
@@ -542,20 +777,140 @@ class Engine:
         ]}
         calculates as: ((((1+2)+3)+4)+5) = 15
 
+        Common 'scopedLogic' applying "+", "*", "min", "max", "and" or "or" to
+        {"var": "accumulator"} and {"var": "current"} (in that order) run as
+        native reductions (see '_native_reduce'), also over Pandas DataFrames
+        (column-wise) and Series.
+
         If 'scopedData' argument does not evaluate to an array, the 'initial'
         value is returned.
         """
-        scopedData = self.execute(scopedData, data)
+        scopedData = self._evaluate(scopedData, data)
+        reducer = self._get_reducer(scopedLogic)
+        if reducer is not None and self._is_dataframe_or_series(scopedData):
+            return self._native_reduce(reducer, scopedData, initial)
         if not self._is_sequence(scopedData):
             return initial
+        if reducer is not None and (initial is not None or reducer in ("and", "or")):
+            return self._native_reduce(reducer, scopedData, initial)
         return reduce(
-            lambda accumulator, current: self.execute(
+            lambda accumulator, current: self._evaluate(
                 scopedLogic, {"accumulator": accumulator, "current": current}
             ),
             scopedData,
             initial,
         )
 
+    def _get_reducer(self, scopedLogic):
+        """
+        Return the operator of a 'reduce' scopedLogic that can run as a native
+        reduction, like {"+": [{"var": "accumulator"}, {"var": "current"}]}.
+        Return None otherwise (or if the operator is overridden by a custom one).
+        """
+        if isinstance(scopedLogic, Node):
+            scopedLogic = scopedLogic.logic
+        if not self._is_logic(scopedLogic):
+            return None
+        operator = self._get_operator(scopedLogic)
+        if operator not in REDUCERS or operator in self._custom_operations:
+            return None
+        values = self._get_values(scopedLogic, operator)
+        if len(values) != 2:
+            return None
+        for value, name in zip(values, ("accumulator", "current")):
+            if not self._is_logic(value) or self._get_operator(value) != "var":
+                return None
+            if list(self._get_values(value, "var")) != [name]:
+                return None
+        return operator
+
+    def _native_reduce(self, reducer, scopedData, initial=None):
+        """
+        Reduce 'scopedData' (Python sequence, Pandas DataFrame or Series) with
+        the native equivalent of a 'reduce' operator:
+        - "+", "*", "min" and "max" use sum, product, min and max;
+        - "and" returns the first falsy element or the last one;
+        - "or" returns the first truthy element or the last one.
+        'initial' is placed before all elements if provided. DataFrames are
+        reduced column-wise.
+
+        Results on Python sequences are identical to the generic 'reduce', so
+        are those on integer Series: they are returned as Python scalars and
+        sums or products that could overflow 64-bit integers are computed with
+        Python integers instead (see '_is_exact').
+        """
+        if self._is_dataframe(scopedData):
+            if reducer in ("and", "or"):
+                return pd.Series(
+                    {
+                        column: self._native_reduce(reducer, values, initial)
+                        for column, values in scopedData.items()
+                    }
+                )
+            result = getattr(scopedData, REDUCERS[reducer])()
+        elif self._is_series(scopedData):
+            if reducer in ("and", "or"):
+                stop = reducer == "or"
+                if initial is not None and self._truthy(initial) is stop:
+                    return initial
+                if scopedData.empty:
+                    return initial
+                mask = self._truthy_mask(scopedData).to_numpy()
+                if not stop:
+                    mask = ~mask
+                if mask.any():
+                    return scopedData.iloc[mask.argmax()]
+                return scopedData.iloc[-1]
+            if scopedData.empty:
+                return initial
+            if not self._is_exact(reducer, scopedData):
+                return self._native_reduce(reducer, scopedData.tolist(), initial)
+            result = getattr(scopedData, REDUCERS[reducer])()
+            if isinstance(result, np.generic):
+                result = result.item()
+        else:
+            if reducer in ("and", "or"):
+                stop = reducer == "or"
+                for current in chain((initial,), scopedData):
+                    if self._truthy(current) is stop:
+                        return current
+                return current
+            if reducer == "+":
+                return reduce(add, scopedData, initial)
+            if reducer == "*":
+                return reduce(mul, scopedData, initial)
+            if reducer == "min":
+                return min(chain((initial,), scopedData))
+            return max(chain((initial,), scopedData))
+
+        if initial is None:
+            return result
+        if reducer == "+":
+            return self._add(initial, result)
+        if reducer == "*":
+            return self._mul(initial, result)
+        if reducer == "min":
+            if self._is_series(result):
+                return result.clip(upper=initial)
+            return min(initial, result)
+        if self._is_series(result):
+            return result.clip(lower=initial)
+        return max(initial, result)
+
+    @staticmethod
+    def _is_exact(reducer, series):
+        """
+        Check that the native sum or product of an integer Pandas Series cannot
+        overflow its dtype, from the magnitude of its elements.
+        """
+        if reducer not in ("+", "*") or series.dtype.kind not in "iu":
+            return True
+        if reducer == "+":
+            magnitude = max(abs(int(series.min())), abs(int(series.max())))
+            return magnitude * len(series) < 2**63
+        bits = np.log2(np.abs(series.to_numpy(dtype=float)) + 1).sum()
+        return bits < 62
+
     def _all(self, data, scopedData, scopedLogic):
         """
         Check if 'scopedLogic' evaluates to a truthy value for all
@@ -582,19 +937,26 @@ class Engine:
         ]}
         evaluates to: True
 
+        If 'scopedData' argument evaluates to a Pandas DataFrame or Series,
+        'scopedLogic' is evaluated once using it as its data object.
+
         If 'scopedData' argument does not evaluate to an array or if the array
         is empty, False is returned.
 
         N.B.: According to current core JsonLogic evaluation of 'scopedData'
         elements stops upon encountering first falsy value.
         """
-        scopedData = self.execute(scopedData, data)
+        scopedData = self._evaluate(scopedData, data)
+        if self._is_dataframe_or_series(scopedData):
+            if scopedData.empty:
+                return False  # "all" of an empty set is false
+            return bool(self._scoped_mask(scopedData, scopedLogic).to_numpy().all())
         if not self._is_sequence(scopedData):
             return False
         if len(scopedData) == 0:
             return False  # "all" of an empty set is false
         for datum in scopedData:
-            if self._falsy(self.execute(scopedLogic, datum)):
+            if self._falsy(self._evaluate(scopedLogic, datum)):
                 return False  # First falsy, short circuit
         return True  # All were truthy
 
@@ -624,14 +986,16 @@ class Engine:
         ]}
         evaluates to: True
 
+        If 'scopedData' argument evaluates to a Pandas DataFrame or Series,
+        'scopedLogic' is evaluated once using it as its data object.
+
         If 'scopedData' argument does not evaluate to an array or if the array
         is empty, True is returned.
 
-        N.B.: According to current core JsonLogic all 'scopedData' elements are
-        evaluated before returning the result. It does not stop at first truthy
-        value.
+        N.B.: Unlike current core JsonLogic, evaluation of 'scopedData' elements
+        stops upon encountering first truthy value.
         """
-        return len(self._filter(data, scopedData, scopedLogic)) == 0
+        return not self._some(data, scopedData, scopedLogic)
 
     def _some(self, data, scopedData, scopedLogic):
         """
@@ -659,14 +1023,33 @@ class Engine:
         ]}
         evaluates to: True
 
+        If 'scopedData' argument evaluates to a Pandas DataFrame or Series,
+        'scopedLogic' is evaluated once using it as its data object.
+
         If 'scopedData' argument does not evaluate to an array or if the array
         is empty, False is returned.
 
-        N.B.: According to current core JsonLogic all 'scopedData' elements are
-        evaluated before returning the result. It does not stop at first truthy
-        value.
+        N.B.: Unlike current core JsonLogic, evaluation of 'scopedData' elements
+        stops upon encountering first truthy value.
+        """
+        scopedData = self._evaluate(scopedData, data)
+        if self._is_dataframe_or_series(scopedData):
+            return bool(self._scoped_mask(scopedData, scopedLogic).to_numpy().any())
+        if not self._is_sequence(scopedData):
+            return False
+        for datum in scopedData:
+            if self._truthy(self._evaluate(scopedLogic, datum)):
+                return True  # First truthy, short circuit
+        return False  # None were truthy
+
+    def _scoped_mask(self, scopedData, scopedLogic):
+        """
+        Evaluate 'scopedLogic' once using a Pandas DataFrame or Series as its data
+        object and return its truthiness as a boolean mask.
         """
-        return len(self._filter(data, scopedData, scopedLogic)) > 0
+        result = self._evaluate(scopedLogic, scopedData)
+        like = scopedData if self._is_dataframe(result) else scopedData.index
+        return self._mask_like(result, like)
 
     @property
     def _scoped_operations(self):
@@ -698,18 +1081,83 @@ class Engine:
         if var_name is None or var_name == "":
             return data  # Return the whole data object
         try:
-            for key in str(var_name).split("."):
-                try:
-                    data = data[key]
-                except TypeError:
-                    data = data[int(key)]
+            return Engine._get_path(data, Engine._parse_path(str(var_name)))
         except (KeyError, TypeError, ValueError) as e:
             if reraise:
                 raise e
             else:
                 return default
-        else:
-            return data
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_path(var_name):
+        """
+        Parse a dot-notated variable name once into a tuple of segments, each
+        being its key, its integer value (None if it is not an integer) and the
+        dot-notated rest of the name starting with it (None for the last key).
+        """
+        keys = var_name.split(".")
+        segments = []
+        for i, key in enumerate(keys):
+            try:
+                index = int(key)
+            except ValueError:
+                index = None
+            rest = ".".join(keys[i:]) if i < len(keys) - 1 else None
+            segments.append((key, index, rest))
+        return tuple(segments)
+
+    @staticmethod
+    def _get_path(data, segments):
+        """
+        Get the value of a parsed variable name (see '_parse_path') from the data
+        object. Sequences are indexed by integer directly and a DataFrame column
+        named after the rest of the name (like a flattened "address.city"
+        column) is returned as is.
+        """
+        for key, index, rest in segments:
+            if index is not None and isinstance(data, SEQUENCE):
+                data = data[index]
+            elif rest is not None and isinstance(data, pd.DataFrame):
+                if rest in data.columns:
+                    return data[rest]
+                data = data[key]
+            else:
+                try:
+                    data = data[key]
+                except TypeError:
+                    data = data[int(key)]
+        return data
+
+    def _var_accessor(self, var_name=None, default=None, reraise=True):
+        """
+        Return a function getting a variable value from the data object, like
+        '_var' does, with the variable name parsed ahead of time.
+        """
+        if var_name is None or var_name == "":
+            return self._get_data
+        segments = self._parse_path(str(var_name))
+        get_path, get_data = self._get_path, self._get_data
+        if len(segments) == 1 and reraise:
+            key = segments[0][0]
+
+            def accessor(data):
+                data = get_data(data)
+                if isinstance(data, pd.DataFrame):
+                    return data[key]
+                return get_path(data, segments)
+
+            return accessor
+
+        def accessor(data):
+            try:
+                return get_path(get_data(data), segments)
+            except (KeyError, TypeError, ValueError):
+                if reraise:
+                    raise
+                return default
+
+        return accessor
 
     def _missing(self, data, *args):
         """
@@ -767,8 +1215,8 @@ class Engine:
 
     def _count(self, *args):
         """Execute 'count' operation unsupported by core JsonLogic."""
-        if self._is_dataframe_or_series(args):
-            return args.count()
+        if len(args) == 1 and self._is_dataframe_or_series(args[0]):
+            return args[0].count()
         else:
             return sum(1 if a else 0 for a in args)
 
@@ -808,6 +1256,16 @@ class Engine:
         """Return operator name from JsonLogic rule."""
         return next(iter(logic))
 
+    @staticmethod
+    def _get_data(data):
+        """
+        Return data object to evaluate a rule with: Pandas DataFrames and Series
+        as is, an empty dictionary in place of any other falsy object.
+        """
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            return data
+        return data or {}
+
     def _get_values(self, logic, operator, normalize: bool = True):
         """Return array of values from JsonLogic rule by operator name."""
         values = logic[operator]
@@ -823,7 +1281,26 @@ class Engine:
         If a single JsonLogic rule is provided - return a single resulting value.
         If an array of JsonLogic rule is provided - return an array of each rule's
         resulting values.
+
+        If the engine has a result cache (see 'ResultCache'), results of pure
+        rules are looked up by rule and data fingerprint first.
         """
+        if self.cache is None or not self._is_logic(logic):
+            return self._execute(logic, data)
+        if not self._scan(logic, Memo())[1]:
+            return self._execute(logic, data)  # Impure rule
+        fingerprint = self.cache.fingerprint(data)
+        if fingerprint is None:
+            return self._execute(logic, data)
+        key = (self._fingerprint(logic), fingerprint)
+        found, result = self.cache.get(key)
+        if not found:
+            result = self._execute(logic, data)
+            self.cache.put(key, result)
+        return result
+
+    def _execute(self, logic, data=None):
+        """Evaluate provided JsonLogic using given data (see 'execute')."""
 
         # Is this an array of JsonLogic rules?
         if self._is_sequence(logic):
@@ -841,7 +1318,7 @@ class Engine:
         values = self._get_values(logic, operator)
 
         # Get data
-        data = data or {}
+        data = self._get_data(data)
 
         # Try applying logical operators first as they violate the normal rule of
         # depth-first calculating consequents. Let each manage recursion as needed.
@@ -854,23 +1331,32 @@ class Engine:
             return self._scoped_operations[operator](data, *values)
 
         # Recursion!
-        values = [self.execute(val, data) for val in values]
+        values = [self._execute(val, data) for val in values]
 
         # Apply data retrieval operations
         if operator in self._data_operations:
             return self._data_operations[operator](data, *values)
 
+        # Apply common, unsupported and custom operations
+        return self._get_operation(operator)(*values)
+
+    def _get_operation(self, operator):
+        """
+        Return the callable of a non-logical, non-scoped and non-data operation
+        by operator name, including dot-notated custom operations.
+        """
+
         # Apply simple custom operations (if any)
         if operator in self._custom_operations:
-            return self._custom_operations[operator](*values)
+            return self._custom_operations[operator]
 
         # Apply common operations
         if operator in self._common_operations:
-            return self._common_operations[operator](*values)
+            return self._common_operations[operator]
 
         # Apply unsupported common operations if any
         if operator in self._unsupported_operations:
-            return self._unsupported_operations[operator](*values)
+            return self._unsupported_operations[operator]
 
         # Apply dot-notated custom operations (if any)
         suboperators = operator.split(".")
@@ -892,12 +1378,890 @@ class Engine:
                         "Unrecognized operation %r (failed at %r)"
                         % (operator, ".".join(suboperators[: idx + 1]))
                     )
-            return current_operation(*values)
+            return current_operation
 
         # Report unrecognized operation
         raise ValueError("Unrecognized operation %r" % operator)
 
-    def add_operation(self, name, code):
+    def _evaluate(self, logic, data):
+        """
+        Evaluate either a compiled plan node or a JsonLogic rule using given data.
+        Used by logical and scoped operations to evaluate their arguments lazily.
+        """
+        if isinstance(logic, Node):
+            return logic.evaluate(data)
+        return self._execute(logic, data)
+
+    def _is_pure(self, operator):
+        """
+        Check that an operation has no side effects and only depends on its
+        arguments. Custom operations are impure unless added with 'pure=True'.
+        """
+        if (
+            operator in self._logical_operations
+            or operator in self._scoped_operations
+            or operator in self._data_operations
+        ):
+            return True
+        if operator in self._custom_operations:
+            return operator in self._pure_operations
+        if (
+            operator in self._common_operations
+            or operator in self._unsupported_operations
+        ):
+            return operator not in IMPURE_OPERATIONS
+        return operator.split(".")[0] in self._pure_operations
+
+    def _fingerprint(self, value):
+        """Return a hashable structural key of a value found in a JsonLogic rule."""
+        if self._is_dictionary(value):
+            return (dict, tuple((k, self._fingerprint(v)) for k, v in value.items()))
+        if self._is_sequence(value):
+            return (type(value), tuple(self._fingerprint(v) for v in value))
+        if isinstance(value, float):
+            return (float, repr(value))
+        try:
+            hash(value)
+        except TypeError:
+            return (type(value), id(value))
+        return (type(value), value)
+
+    def _scan(self, logic, memo):
+        """
+        Walk a JsonLogic rule, count the occurrences of its pure subexpressions
+        and return its structural key and whether it is pure.
+        """
+        if self._is_sequence(logic) or not self._is_logic(logic):
+            return self._fingerprint(logic), True
+        operator = self._get_operator(logic)
+        pure = self._is_pure(operator)
+        keys = []
+        for value in self._get_values(logic, operator):
+            key, value_pure = self._scan(value, memo)
+            keys.append(key)
+            pure = pure and value_pure
+        key = (operator, tuple(keys))
+        memo.keys[id(logic)] = key
+        if pure:
+            memo.counts[key] = memo.counts.get(key, 0) + 1
+        return key, pure
+
+    def _compile(self, logic, memo, fuse=True):
+        """
+        Compile a JsonLogic rule into a plan node. Pure subexpressions occurring
+        several times share a single node, evaluated once per data object.
+        If 'fuse' is False, none of its subtrees is fused (see '_fuse').
+        """
+        key = memo.keys.get(id(logic))
+        if key is None or memo.counts.get(key, 0) < 2:
+            return self._trace(self._compile_node(logic, memo, fuse), memo)
+        if (key, fuse) not in memo.nodes:
+            node = self._trace(self._compile_node(logic, memo, fuse), memo)
+            evaluate, values = node.evaluate, memo.values
+
+            def cached(data):
+                entry = values.get(key)
+                if entry is not None and entry[0] is data:
+                    return entry[1]
+                value = evaluate(data)
+                values[key] = (data, value)
+                return value
+
+            memo.nodes[key, fuse] = Node(logic, cached)
+        return memo.nodes[key, fuse]
+
+    def _trace(self, node, memo):
+        """
+        Wrap the evaluation of a compiled rule node to call the hooks of a plan
+        (see 'compile') with its data object, result and wall time.
+        """
+        hooks, evaluate, logic = memo.hooks, node.evaluate, node.logic
+        if not hooks or self._is_constant(logic):
+            return node
+
+        def traced(data):
+            start = time.perf_counter()
+            result = evaluate(data)
+            elapsed = time.perf_counter() - start
+            for hook in hooks:
+                hook(logic, data, result, elapsed)
+            return result
+
+        return Node(logic, traced)
+
+    def _compile_node(self, logic, memo, fuse=True):
+        """Compile a JsonLogic rule into a plan node bound to its operation."""
+
+        # Arrays and primitives evaluate to themselves
+        if self._is_sequence(logic) or not self._is_logic(logic):
+            return Node(logic, lambda data: logic)
+
+        # Arithmetic and comparison subtrees evaluate as a single expression
+        if fuse and memo.fuse:
+            node = self._fuse(logic, memo)
+            if node is not None:
+                return node
+
+        operator = self._get_operator(logic)
+        values = self._get_values(logic, operator)
+
+        # Logical operations manage recursion themselves through their nodes
+        if operator in self._logical_operations:
+            operation = self._logical_operations[operator]
+            args = [self._compile(val, memo, fuse) for val in values]
+            dtype = self._compact_dtype(logic, memo)
+            if dtype is None:
+                return Node(logic, lambda data: operation(self._get_data(data), *args))
+
+            # Keep Series results in the compact dtype of the returned arguments
+            def evaluate(data):
+                result = operation(self._get_data(data), *args)
+                if self._is_series(result) and result.dtype != dtype:
+                    if not result.hasnans:
+                        return result.astype(dtype)
+                return result
+
+            return Node(logic, evaluate)
+
+        # Scoped operations only evaluate their data and logic arguments
+        if operator in self._scoped_operations:
+            operation = self._scoped_operations[operator]
+            args = [self._compile(val, memo, fuse) for val in values[:2]]
+            args += list(values[2:])
+            return Node(logic, lambda data: operation(self._get_data(data), *args))
+
+        evaluators = [self._compile(val, memo, fuse).evaluate for val in values]
+
+        # Variables with a constant name are looked up by a prebuilt accessor
+        if (
+            operator == "var"
+            and len(values) <= 3
+            and all(map(self._is_constant, values))
+        ):
+            return Node(logic, self._var_accessor(*values))
+
+        if operator in self._data_operations:
+            operation = self._data_operations[operator]
+
+            def evaluate(data):
+                data = self._get_data(data)
+                return operation(data, *[ev(data) for ev in evaluators])
+
+            return Node(logic, evaluate)
+
+        # Membership in literal arrays looks up a hash table built once
+        if (
+            operator == "in"
+            and operator not in self._custom_operations
+            and len(values) == 2
+            and self._is_sequence(values[1])
+        ):
+            contains = self._literal_membership(values[1])
+            if contains is not None:
+                ev0 = evaluators[0]
+                return Node(logic, lambda data: contains(ev0(data)))
+
+        try:
+            operation = self._get_operation(operator)
+        except ValueError as e:
+            error = e
+
+            def evaluate(data):
+                for ev in evaluators:
+                    ev(data)
+                raise error
+
+            return Node(logic, evaluate)
+
+        # Bind the kernel of the inferred argument types (see 'compile')
+        kernel = self._get_kernel(operator, values, memo)
+
+        # Evaluate heavy arguments concurrently on threads (see 'compile')
+        costs = self._thread_arguments(operator, values, memo)
+        if costs:
+            function = aligned = kernel or operation
+            if (
+                kernel is None
+                and memo.align
+                and operator in ALIGNING_OPERATIONS
+                and operator not in self._custom_operations
+            ):
+                aligned = partial(operation, aligned=True)
+            evaluate_arguments = threads.evaluate_arguments
+            is_aligned = memo.is_aligned
+
+            def evaluate(data):
+                args = evaluate_arguments(evaluators, costs, data)
+                if is_aligned():
+                    return aligned(*args)
+                return function(*args)
+
+            return Node(logic, evaluate)
+
+        if kernel is not None:
+            ev0, ev1 = evaluators
+            return Node(logic, lambda data: kernel(ev0(data), ev1(data)))
+
+        # Skip aligning Pandas arguments that already share the same index
+        if (
+            memo.align
+            and operator in ALIGNING_OPERATIONS
+            and operator not in self._custom_operations
+            and len(evaluators) == 2
+        ):
+            ev0, ev1 = evaluators
+            aligned = partial(operation, aligned=True)
+            is_aligned = memo.is_aligned
+
+            def evaluate(data):
+                if is_aligned():
+                    return aligned(ev0(data), ev1(data))
+                return operation(ev0(data), ev1(data))
+
+            return Node(logic, evaluate)
+
+        # Unroll the most common arities
+        if len(evaluators) == 1:
+            (ev0,) = evaluators
+            return Node(logic, lambda data: operation(ev0(data)))
+        if len(evaluators) == 2:
+            ev0, ev1 = evaluators
+            return Node(logic, lambda data: operation(ev0(data), ev1(data)))
+        return Node(logic, lambda data: operation(*[ev(data) for ev in evaluators]))
+
+    def _thread_arguments(self, operator, values, memo):
+        """
+        Return the position and number of operations of the arguments of an
+        operation that may be evaluated concurrently on threads, if at least two
+        of them hold operations and are thread-safe (see 'compile'), or None.
+        """
+        if not memo.threads or len(values) < 2:
+            return None
+        if operator in self._custom_operations:
+            if operator not in self._thread_safe_operations:
+                return None
+        elif operator not in THREADED_OPERATIONS:
+            return None
+        costs = [(i, self._thread_cost(value, memo)) for i, value in enumerate(values)]
+        costs = [(i, cost) for i, cost in costs if cost]
+        return costs if len(costs) >= 2 else None
+
+    def _thread_cost(self, logic, memo):
+        """
+        Return the number of operations (besides variables) of a JsonLogic rule,
+        or None if it holds operations that are not thread-safe.
+        """
+        if self._is_sequence(logic) or not self._is_logic(logic):
+            return 0
+        if id(logic) in memo.costs:
+            return memo.costs[id(logic)]
+        operator = self._get_operator(logic)
+        cost = None
+        if self._is_thread_safe(operator):
+            cost = 0 if operator == "var" else 1
+            for value in self._get_values(logic, operator):
+                value_cost = self._thread_cost(value, memo)
+                if value_cost is None:
+                    cost = None
+                    break
+                cost += value_cost
+        memo.costs[id(logic)] = cost
+        return cost
+
+    def _is_thread_safe(self, operator):
+        """
+        Check that an operation can be evaluated on several threads at once.
+        Custom operations are not thread-safe unless added with
+        'thread_safe=True'.
+        """
+        if operator in self._custom_operations:
+            return operator in self._thread_safe_operations
+        if (
+            operator in self._logical_operations
+            or operator in self._scoped_operations
+            or operator in self._data_operations
+            or operator in self._common_operations
+            or operator in self._unsupported_operations
+        ):
+            return operator not in IMPURE_OPERATIONS
+        return operator.split(".")[0] in self._thread_safe_operations
+
+    def _literal_membership(self, array):
+        """
+        Return a function checking that a value is in a literal array, like
+        '_in' does, with the array's hash set and Pandas Index (whose hash table
+        is reused by every lookup of a Series) built once.
+        Series of other dtypes than NumPy numbers and strings, or numbers looked
+        up in an array holding booleans, are checked with 'isin' (which matches
+        booleans and numbers the way Python does).
+        Return None if the array holds unhashable elements or missing values.
+        """
+        try:
+            members = frozenset(array)
+        except TypeError:
+            return None
+        if any(member is None or member != member for member in members):
+            return None
+        index = pd.Index(list(members))
+        index.get_indexer(index[:1])  # Build the hash table now
+        numbers = "iuf" if not any(isinstance(m, bool) for m in members) else ""
+
+        def is_indexed(dtype):
+            if isinstance(dtype, np.dtype):
+                return dtype.kind in numbers
+            return isinstance(dtype, pd.StringDtype)
+
+        def contains(a):
+            if self._is_series(a):
+                if not is_indexed(a.dtype):
+                    return a.isin(array)
+                return pd.Series(index.get_indexer(a) >= 0, index=a.index)
+            try:
+                return a in members
+            except TypeError:  # Unhashable value
+                return a in array
+
+        return contains
+
+    def _get_kernel(self, operator, values, memo):
+        """
+        Return the kernel of a binary operation specialized for the inferred
+        types of its arguments (see 'inference.get_kernel'), if any.
+        """
+        if not memo.types or len(values) != 2 or operator in self._custom_operations:
+            return None
+        left, right = (memo.types.get(id(value)) for value in values)
+        if memo.align and left and right and left.kind == right.kind == "series":
+            return None  # Aligned if needed (see '_aligned')
+        return inference.get_kernel(operator, left, right)
+
+    def _compact_dtype(self, logic, memo):
+        """
+        Return the inferred boolean or numeric dtype of a logical operation
+        returning Series (see 'inference.compact_dtype'), if any.
+        """
+        value_type = memo.types.get(id(logic))
+        if value_type is None or value_type.kind != "series":
+            return None
+        dtype = value_type.dtype
+        if not isinstance(dtype, np.dtype) or dtype.kind not in "biuf":
+            return None
+        return dtype
+
+    def _fuse(self, logic, memo):
+        """
+        Compile a JsonLogic rule lowered to a single expression into a fused plan
+        node (see 'compile'). Return None if it cannot be lowered or is too small
+        to be worth it.
+        Fusion is decided once for the whole rule: it falls back to a plan node
+        of the rule with none of its subtrees fused.
+        """
+        lowering = fusion.lower(self, logic)
+        if lowering is None or lowering.operations < 2:
+            return None
+        expression = lowering.expression
+        variables = [self._compile(var, memo).evaluate for var in lowering.variables]
+        fallback = self._compile_node(logic, memo, fuse=False).evaluate
+
+        def evaluate(data):
+            result = fusion.evaluate(expression, [ev(data) for ev in variables])
+            if result is None:
+                return fallback(data)
+            return result
+
+        return Node(logic, evaluate)
+
+    def _alignment_paths(self, logic, paths, operators):
+        """
+        Collect the variable paths and operators of a JsonLogic rule into 'paths'
+        and 'operators' and check that its operations keep the index of aligned
+        Pandas arguments.
+        'paths' is a dictionary keeping the paths in the order binary operations
+        align their arguments: the left one first, the right one for '>' and
+        '>=' (evaluated as '<' and '<=' with swapped arguments).
+        """
+        if self._is_sequence(logic):
+            return all(
+                self._alignment_paths(value, paths, operators) for value in logic
+            )
+        if not self._is_logic(logic):
+            return True
+        operator = self._get_operator(logic)
+        values = self._get_values(logic, operator)
+        if operator not in ALIGNED_OPERATIONS or operator in self._custom_operations:
+            return False
+        operators.add(operator)
+        if operator == "var":
+            if not values or not isinstance(values[0], (str, int)):
+                return False
+            path = tuple(str(values[0]).split("."))
+            if path == ("",) or not all(map(self._is_constant, values[1:])):
+                return False
+            paths.setdefault(path)
+            return True
+        if operator in dispatch.SWAPPED_OPERATIONS:
+            values = values[::-1]
+        return all(self._alignment_paths(value, paths, operators) for value in values)
+
+    def _align_data(self, data, paths, reindex=True):
+        """
+        Align the Pandas objects found along variable paths of a data object on
+        their common index, once, in the order of the first one found (see
+        '_alignment_paths') like binary operations do. Return the aligned data
+        object, or None if they cannot be aligned (duplicated index labels, whole
+        DataFrames used as values or Pandas objects nested in sequences) or if
+        their indexes differ and 'reindex' is False.
+        """
+        data = self._get_data(data)
+        if self._is_dataframe_or_series(data):
+            return data  # Columns already share the same index
+        objects = {}
+        for path in paths:
+            value = data
+            for i, key in enumerate(path):
+                if self._is_sequence(value):
+                    return None
+                if not isinstance(value, Mapping) or key not in value:
+                    break
+                value = value[key]
+                if self._is_dataframe_or_series(value):
+                    if i == len(path) - 1 and self._is_dataframe(value):
+                        return None
+                    objects[path[: i + 1]] = value
+                    break
+        if not objects:
+            return data
+        index = None
+        for value in objects.values():
+            if not value.index.is_unique:
+                return None
+            if index is None:
+                index = value.index
+            elif not index.equals(value.index):
+                if not reindex:
+                    return None
+                index = index.intersection(value.index)
+        for prefix, value in objects.items():
+            if not value.index.equals(index):
+                data = self._replace(data, prefix, value.reindex(index))
+        return data
+
+    def _replace(self, data, path, value):
+        """Return a copy of nested Mappings with the value at 'path' replaced."""
+        data = dict(data)
+        if len(path) == 1:
+            data[path[0]] = value
+        else:
+            data[path[0]] = self._replace(data[path[0]], path[1:], value)
+        return data
+
+    def _aligned(self, evaluate, paths, reindex, memo):
+        """
+        Wrap the evaluation of a compiled rule so that its Pandas inputs are
+        aligned once beforehand and binary operations skip aligning them.
+        """
+
+        def aligned(data):
+            aligned_data = self._align_data(data, paths, reindex)
+            token = ALIGNED.set(None if aligned_data is None else memo)
+            try:
+                return evaluate(data if aligned_data is None else aligned_data)
+            finally:
+                ALIGNED.reset(token)
+
+        return aligned
+
+    def compile(
+        self,
+        logic,
+        optimize=False,
+        fuse=False,
+        align=False,
+        assume_aligned=False,
+        schema=None,
+        hooks=(),
+        threads=False,
+    ):
+        """
+        Compile provided JsonLogic into a reusable plan.
+
+        The rule is walked once and every operator (including dot-notated custom
+        operations) is resolved and bound ahead of time. The returned plan is
+        called with a data object and returns the same result as 'execute':
+            plan = engine.compile(logic)
+            plan(data) == engine.execute(logic, data)
+
+        Identical pure subexpressions (see 'add_operation' for custom operations)
+        are evaluated once per data object when calling the plan. Literal arrays
+        of 'in' operations are hashed once when compiling.
+        If 'optimize' is True, the rule is simplified first (see 'optimize').
+
+        If 'fuse' is True and NumExpr is installed, the largest subtrees only made
+        of arithmetic ('+', '-', '*', '/'), comparison ('<', '<=', '>', '>=',
+        '==') and boolean 'and' / 'or' operations over variables and numeric
+        literals, like {"and": [{">": [{"var": "a"}, 0]}, {"<": [{"+": [{"var":
+        "a"}, {"var": "b"}]}, 10]}]}, are evaluated as a single NumExpr
+        expression in one pass without intermediate Series. Fused expressions
+        only apply to numeric Series sharing the same index and of at least
+        'fusion.FUSION_MIN_ROWS' rows, other data is evaluated as usual.
+
+        If 'align' is True and the rule only uses variables, arithmetic,
+        comparison, 'abs' and logical operations, the Pandas objects its variables
+        refer to (like the DataFrames of {"var": "df1.a"} and {"var": "df2.b"})
+        are aligned on their common index once per call, instead of aligning the
+        arguments of every binary operation. Rules with logical operations are
+        only planned when those objects already share the same index.
+        If 'assume_aligned' is True, the caller guarantees that every Pandas input
+        already shares the same index and binary operations never align their
+        arguments.
+
+        If a 'schema' is given (a sample DataFrame used as data object, a
+        dictionary of sample DataFrames, or a dictionary of variable dtypes,
+        see 'inference.schema_dtypes'), the type (scalar, Series or DataFrame)
+        and dtype of every subexpression is inferred from the dtypes of the
+        variables it uses. Binary operations are bound to the Pandas method
+        matching the types of their arguments, without checking them again,
+        and logical operations keep Series results in the compact dtype of the
+        values they return (like bool or int8 rather than object or int64).
+        Rules comparing or subtracting numbers and strings (or otherwise mixing
+        incompatible dtypes) raise a ValueError right away. The data object
+        must then match the schema.
+
+        Each hook of 'hooks' is called after evaluating any (non-constant) node
+        of the rule as 'hook(logic, data, result, elapsed)', with the node's
+        JsonLogic rule, data object, result and wall time in seconds (including
+        its arguments), like the 'Profiler' hook used by 'profile'. Plans
+        compiled without hooks are not instrumented at all.
+
+        If 'threads' is True, the arguments of arithmetic, comparison, 'min',
+        'max' and thread-safe custom operations (see 'add_operation') holding
+        operations, like both sides of {"+": [{"*": [{"var": "a"}, 2]}, {"/":
+        [{"var": "b"}, 3]}]}, are evaluated concurrently on a thread pool shared
+        by every plan, as long as they only hold thread-safe operations (any but
+        'method' and custom operations not added as thread-safe). NumPy releases
+        the GIL for most of the work on large arrays, so this only applies to
+        data objects of at least 'threads.THREAD_MIN_ROWS' rows and to arguments
+        whose estimated work (operations times rows) reaches
+        'threads.THREAD_MIN_WORK', others are evaluated serially.
+
+        N.B.: Custom operations are bound when compiling, adding or removing them
+        afterwards does not affect existing plans. Unrecognized operations only
+        raise once evaluated, like they do with 'execute'.
+        """
+        if optimize:
+            logic = self.optimize(logic)
+        paths, operators = {}, set()
+        align = align and self._alignment_paths(logic, paths, operators)
+        types = {}
+        if schema is not None:
+            inference.infer(self, logic, inference.schema_dtypes(schema), types)
+        memo = Memo(
+            fuse=fuse and fusion.numexpr is not None,
+            align=align,
+            aligned=assume_aligned,
+            types=types,
+            hooks=hooks,
+            threads=threads,
+        )
+        self._scan(logic, memo)
+        root = self._compile(logic, memo)
+        if align and not assume_aligned:
+            # Logical operations evaluate rows missing from other inputs
+            reindex = not operators.intersection(self._logical_operations)
+            root = Node(logic, self._aligned(root.evaluate, paths, reindex, memo))
+        return Plan(logic, root, memo)
+
+    def compile_iterative(self, logic):
+        """
+        Flatten provided JsonLogic into a reusable stack program (see
+        'StackPlan'), called with a data object like a compiled plan and
+        returning the same result as 'execute':
+            plan = engine.compile_iterative(logic)
+            plan(data) == engine.execute(logic, data)
+
+        Neither flattening nor running the program recurses on nested
+        operations, so deeply nested rules (like machine generated decision
+        trees) evaluate without RecursionError and with less work per node.
+        Logical operations still only evaluate the arguments they need.
+        """
+        return StackPlan(self, logic)
+
+    def execute_iterative(self, logic, data=None):
+        """
+        Evaluate provided JsonLogic using given data (if any) like 'execute',
+        on an explicit stack rather than by recursion (see 'compile_iterative').
+        """
+        return StackPlan(self, logic)(data)
+
+    async def execute_async(self, logic, data=None, max_concurrency=None):
+        """
+        Evaluate provided JsonLogic using given data (if any) like 'execute',
+        awaiting the results of custom operations returning awaitables (like
+        coroutine functions registered with 'add_operation').
+
+        The arguments of an operation holding custom operations are evaluated
+        concurrently (with 'asyncio.gather'), while logical operations ('if',
+        '?:', 'and', 'or') keep evaluating their arguments one after the other
+        and only as needed. Subtrees without custom operations are evaluated
+        synchronously. If 'max_concurrency' is given, at most that many custom
+        operations run at once (see 'AsyncPlan').
+
+        Example:
+        engine.add_operation("lookup", fetch_feature)  # Coroutine function
+        await engine.execute_async(
+            {"+": [{"lookup": ["a"]}, {"lookup": ["b"]}]}, max_concurrency=8
+        )
+        awaits both lookups concurrently.
+        """
+        return await AsyncPlan(self, logic, max_concurrency)(data)
+
+    def execute_records(self, logic, records):
+        """
+        Evaluate provided JsonLogic on each record of a list of Python data
+        objects (like JSON records) and return the list of results, the same as:
+            [engine.execute(logic, record) for record in records]
+
+        The values of the variables the rule uses are pulled out of the records
+        into columns once and the rule is evaluated over them through the
+        Pandas operations when it only uses variables, 'missing',
+        'missing_some', logical, comparison and '+', '-', '*' operations.
+        Records that would not evaluate the same way over columns (like records
+        with absent or None values) are evaluated one by one (see 'RecordPlan').
+
+        Example:
+        engine.execute_records({">": [{"var": "age"}, 18]}, [{"age": 20}, {"age": 5}])
+        returns [True, False].
+        """
+        return RecordPlan(self, logic)(records)
+
+    def profile(self, logic, data=None, hooks=()):
+        """
+        Evaluate provided JsonLogic using given data (if any) and return the
+        evaluation statistics of each of its nodes as a tree mirroring the rule
+        (see 'NodeProfile'), the result being held by its root.
+        Additional 'hooks' are called for every node as well (see 'compile').
+
+        Example:
+        profile = engine.profile({"+": [{"var": "df.a"}, {"var": "df.b"}]}, data)
+        print(profile)
+        prints:
+        +: 1 calls, 0.000412s (self 0.000335s), mapping[1000] -> series[1000], ...
+          var: 1 calls, 0.000041s (self 0.000041s), mapping[1000] -> series[1000], ...
+          var: 1 calls, 0.000036s (self 0.000036s), mapping[1000] -> series[1000], ...
+        """
+        if not self._is_logic(logic):
+            raise ValueError("Cannot profile %r, not a JsonLogic rule" % (logic,))
+        profiler = Profiler()
+        result = self.compile(logic, hooks=(profiler, *hooks))(data)
+        profile = profiler.tree(self, logic)
+        profile.result = result
+        return profile
+
+    def execute_stream(self, logic, chunks):
+        """
+        Evaluate provided JsonLogic over an iterator of DataFrames (chunks) used
+        as data objects, like 'pandas.read_csv(..., chunksize=...)', a generator
+        or a PyArrow batch reader (batches are converted to DataFrames).
+        Return an iterator of results, only holding one chunk at a time:
+        - for row-local rules, the result of each chunk;
+        - for rules with reducing operations ('min_reduce', 'max_reduce',
+        'count', vectorized 'all', 'some', 'none' and native 'reduce' patterns),
+        a single result computed from the partial results of each chunk, the
+        same as evaluating the rule over the whole data.
+
+        Raise a ValueError if the rule mixes row-local data and reducing
+        operations (see 'PartialPlan').
+        """
+        return self._stream(PartialPlan(self, logic), chunks)
+
+    def incremental(self, logic):
+        """
+        Return an incremental plan of provided JsonLogic for an append-only
+        DataFrame used as data object: each 'update' with the grown DataFrame
+        only evaluates the appended rows, row-local results being concatenated
+        and reducing operations (see 'execute_stream') updating running partial
+        values, so that its cost depends on the appended rows only
+        (see 'IncrementalPlan').
+
+        Raise a ValueError if the rule mixes row-local data and reducing
+        operations (see 'PartialPlan').
+        """
+        return IncrementalPlan(self, logic)
+
+    @staticmethod
+    def _stream(plan, chunks):
+        """Evaluate a partial plan over chunks (see 'execute_stream')."""
+        partial = None
+        for chunk in chunks:
+            if not isinstance(chunk, pd.DataFrame) and hasattr(chunk, "to_pandas"):
+                chunk = chunk.to_pandas()
+            if not plan.reducing:
+                yield plan(chunk)
+            elif partial is None:
+                partial = plan.partial(chunk)
+            else:
+                partial = plan.combine([partial, plan.partial(chunk)])
+        if plan.reducing:
+            yield plan.finalize(partial or plan.combine([]))
+
+    def execute_parallel(self, logic, data, processes=None, min_rows=100000):
+        """
+        Evaluate provided JsonLogic over row partitions of a DataFrame (used as
+        data object) on a pool of worker processes, 'os.cpu_count()' by default.
+
+        NumPy-backed columns are passed to workers through shared memory, other
+        columns are pickled per partition. Row-local results are concatenated
+        back in the original index order. Rules with reducing operations (see
+        'execute_stream') are evaluated into partial values per partition,
+        merged into the final result.
+
+        Evaluate in-process (like 'execute') if data is not a DataFrame, has less
+        than 'min_rows' rows or if the rule mixes row-local data and reducing
+        operations.
+        """
+        processes = processes or os.cpu_count() or 1
+        if (
+            processes < 2
+            or not self._is_dataframe(data)
+            or len(data) < min_rows
+            or not data.columns.is_unique
+        ):
+            return self.execute(logic, data)
+        try:
+            plan = PartialPlan(self, logic)
+        except ValueError:
+            return self.execute(logic, data)
+        return execute_partitions(plan, data, processes)
+
+    @staticmethod
+    def _is_literal(value):
+        """Check that a value can be written in a JsonLogic rule as a constant."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return True
+        if isinstance(value, SEQUENCE):
+            return all(map(Engine._is_literal, value))
+        return False
+
+    def _is_constant(self, logic):
+        """Check that a JsonLogic rule does not need to be evaluated."""
+        return self._is_sequence(logic) or not self._is_logic(logic)
+
+    def optimize(self, logic):
+        """
+        Simplify provided JsonLogic and return the resulting rule:
+        - Operations of pure operators (see 'add_operation' for custom
+        operations) that only take constant arguments are folded into the
+        constant they evaluate to, like {"*": [24, 60]} into 1440.
+        - Constant 'if' and '?:' conditions prune the branches they decide,
+        like {"if": [true, X, Y]} into X.
+        - Constant 'and' and 'or' arguments that cannot be returned are dropped
+        and those deciding the result drop all arguments after them, like
+        {"and": [X, true, Y]} into {"and": [X, Y]} or {"or": [true, X]} into true.
+        - Nested 'and' and 'or' operations are flattened, like
+        {"and": [X, {"and": [Y, Z]}]} into {"and": [X, Y, Z]}.
+
+        Operations raising an error or evaluating to something that cannot be
+        written in a JsonLogic rule are kept as is. Evaluating the optimized rule
+        returns the same result as evaluating the provided one.
+        """
+        if self._is_constant(logic):
+            return logic
+
+        operator = self._get_operator(logic)
+        values = self._get_values(logic, operator, normalize=False)
+        if not self._is_sequence(values):
+            values = [values]
+            normalized = False
+        else:
+            normalized = True
+
+        if operator in self._scoped_operations:
+            args = [self.optimize(val) for val in values[:2]] + list(values[2:])
+        else:
+            args = [self.optimize(val) for val in values]
+
+        if operator in ("if", "?:"):
+            return self._optimize_if(logic, operator, args)
+        if operator in ("and", "or"):
+            return self._optimize_operands(logic, operator, args)
+
+        if operator in self._scoped_operations:
+            constant = self._is_constant(args[0]) if args else True
+        else:
+            constant = all(map(self._is_constant, args))
+        if (
+            constant
+            and operator not in self._data_operations
+            and self._scan(logic, Memo())[1]
+        ):
+            try:
+                result = self.execute({operator: args})
+            except Exception:
+                pass
+            else:
+                if self._is_literal(result):
+                    return result
+
+        if all(arg is val for arg, val in zip(args, values)):
+            return logic
+        if normalized or self._is_sequence(args[0]):
+            return {operator: args}
+        return {operator: args[0]}
+
+    def _optimize_if(self, logic, operator, args):
+        """Prune the branches of an 'if' or '?:' decided by constant conditions."""
+        pruned = []
+        for i in range(0, len(args) - 1, 2):
+            condition, value = args[i], args[i + 1]
+            if not self._is_constant(condition):
+                pruned += [condition, value]
+            elif self._truthy(condition):
+                pruned.append(value)  # Becomes the 'else' value
+                break
+        else:
+            if len(args) % 2:
+                pruned.append(args[-1])
+        if not pruned:
+            return None
+        if len(pruned) == 1:
+            return pruned[0]
+        if len(pruned) == len(args) and all(map(lambda a, b: a is b, pruned, args)):
+            return logic
+        if operator == "?:" and len(pruned) != 3:
+            operator = "if"
+        return {operator: pruned}
+
+    def _optimize_operands(self, logic, operator, args):
+        """
+        Flatten nested 'and' ('or') operations and drop the constant arguments
+        that are never returned.
+        """
+        stop = operator == "or"
+        flattened = []
+        for arg in args:
+            if not self._is_constant(arg) and self._get_operator(arg) == operator:
+                flattened += self._get_values(arg, operator)
+            else:
+                flattened.append(arg)
+
+        kept = []
+        for i, arg in enumerate(flattened):
+            if self._is_constant(arg):
+                if self._truthy(arg) is stop:
+                    kept.append(arg)  # Decides the result
+                    break
+                if i < len(flattened) - 1:
+                    continue  # Never returned
+            kept.append(arg)
+        if not kept:
+            return False
+        if len(kept) == 1:
+            return kept[0]
+        if len(kept) == len(args) and all(map(lambda a, b: a is b, kept, args)):
+            return logic
+        return {operator: kept}
+
+    def add_operation(self, name, code, pure=False, thread_safe=False):
         """
         Add a custom common JsonLogic operation.
 
@@ -922,11 +2286,52 @@ class Engine:
         {"datetime.date": [2018, 1, 1]}
         can be used to retrieve January 1, 2018 date.
 
+        If 'pure' is True, the operation (and its dot-notated members) is deemed
+        free of side effects and only dependent on its arguments: compiled plans
+        then evaluate identical calls only once per data object.
+
+        If 'thread_safe' is True, the operation (and its dot-notated members) can
+        be called from several threads at once: plans compiled with 'threads'
+        then evaluate its arguments concurrently, and arguments holding it on
+        threads (see 'compile').
+
         N.B.: Custom operations may be used to override common JsonLogic functions,
         but not logical, scoped or data retrieval ones.
         """
         self._custom_operations[str(name)] = code
+        if pure:
+            self._pure_operations.add(str(name))
+        else:
+            self._pure_operations.discard(str(name))
+        if thread_safe:
+            self._thread_safe_operations.add(str(name))
+        else:
+            self._thread_safe_operations.discard(str(name))
 
     def rm_operation(self, name):
         """Remove previously added custom common JsonLogic operation."""
         del self._custom_operations[str(name)]
+        self._pure_operations.discard(str(name))
+        self._thread_safe_operations.discard(str(name))
+
+    def add_kernel(self, operator, left, right, kernel):
+        """
+        Add the kernel evaluating a binary operation ('==', '<', '<=', '+', '-',
+        '*', '/', '//', '%') on arguments of two types (and their subclasses),
+        called as 'kernel(a, b)' in place of the built-in Pandas or Python
+        operation.
+
+        Example:
+        add_kernel("+", Decimal, float, lambda a, b: a + Decimal(b))
+        {"+": [{"var": "price"}, 0.5]} then adds Decimal prices and floats.
+
+        N.B.: Kernels are shared by every engine, like custom operations, and
+        only apply to non-overridden operations. '>' and '>=' are evaluated
+        as '<' and '<=' with swapped arguments (by their kernels). Plans
+        compiled with a schema bind the kernels added when they are compiled.
+        """
+        dispatch.register(operator, left, right, kernel)
+
+    def rm_kernel(self, operator, left, right):
+        """Remove previously added binary operation kernel."""
+        dispatch.unregister(operator, left, right)
@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numexpr
+except ImportError:  # Fusion is disabled without NumExpr
+    numexpr = None
+
+# Operations lowered to an expression operator
+ARITHMETIC_OPERATORS = {"+": "+", "-": "-", "*": "*", "/": "/"}
+COMPARISON_OPERATORS = {"<": "<", "<=": "<=", ">": ">", ">=": ">=", "==": "=="}
+LOGICAL_OPERATORS = {"and": "&", "or": "|"}
+
+# NumPy dtypes evaluated by NumExpr
+FUSED_DTYPES = (
+    np.dtype("int32"),
+    np.dtype("int64"),
+    np.dtype("float32"),
+    np.dtype("float64"),
+)
+
+# Minimal number of rows for a fused expression to be worth evaluating
+FUSION_MIN_ROWS = 10000
+
+
+class Lowering:
+    """
+    JsonLogic rule lowered to a single expression string.
+
+    'expression' references each distinct variable rule of 'variables' by the
+    local name "v<position>". 'boolean' tells whether the expression evaluates
+    to booleans and 'operations' counts its operations.
+    """
+
+    __slots__ = ("expression", "variables", "boolean", "operations")
+
+    def __init__(self):
+        self.expression = None
+        self.variables = []
+        self.boolean = False
+        self.operations = 0
+
+
+def lower(engine, logic):
+    """
+    Lower a JsonLogic rule only made of arithmetic ('+', '-', '*', '/'),
+    comparison ('<', '<=', '>', '>=', '==') and boolean 'and' / 'or' operations
+    over variables and numeric literals to an expression string.
+    Return None if the rule (or any of its subtrees) cannot be lowered.
+    """
+    lowering = Lowering()
+    try:
+        lowering.expression, lowering.boolean = _lower(engine, logic, lowering, {})
+    except ValueError:
+        return None
+    return lowering
+
+
+def _lower(engine, logic, lowering, names):
+    """Return the expression of a rule and whether it evaluates to booleans."""
+    if isinstance(logic, bool):
+        return repr(logic), True
+    if isinstance(logic, int) or (isinstance(logic, float) and math.isfinite(logic)):
+        return "(%r)" % logic, False
+    if engine._is_constant(logic):
+        raise ValueError("Constant %r cannot be lowered" % (logic,))
+
+    operator = engine._get_operator(logic)
+    values = engine._get_values(logic, operator)
+    if operator in engine._custom_operations:
+        raise ValueError("Custom operation %r cannot be lowered" % operator)
+
+    if operator == "var":
+        if len(values) != 1 or not isinstance(values[0], str) or not values[0]:
+            raise ValueError("Variable %r cannot be lowered" % (values,))
+        if values[0] not in names:
+            names[values[0]] = "v%d" % len(lowering.variables)
+            lowering.variables.append(logic)
+        return names[values[0]], False
+
+    args = [_lower(engine, value, lowering, names) for value in values]
+    lowering.operations += 1
+    if operator in LOGICAL_OPERATORS:
+        if len(args) < 2 or not all(boolean for _, boolean in args):
+            raise ValueError("Non boolean %r cannot be lowered" % operator)
+        expression = (" %s " % LOGICAL_OPERATORS[operator]).join(e for e, _ in args)
+        return "(%s)" % expression, True
+    if any(boolean for _, boolean in args):
+        raise ValueError("Boolean arithmetic cannot be lowered")
+    if operator == "-" and len(args) == 1:
+        return "(-%s)" % args[0][0], False
+    if len(args) != 2:
+        raise ValueError("Operation %r cannot be lowered" % operator)
+    if operator in ARITHMETIC_OPERATORS:
+        symbol, boolean = ARITHMETIC_OPERATORS[operator], False
+    elif operator in COMPARISON_OPERATORS:
+        symbol, boolean = COMPARISON_OPERATORS[operator], True
+    else:
+        raise ValueError("Operation %r cannot be lowered" % operator)
+    return "(%s %s %s)" % (args[0][0], symbol, args[1][0]), boolean
+
+
+def evaluate(expression, values):
+    """
+    Evaluate a lowered expression with NumExpr over the values of its variables.
+    Return None if they are not numeric Series sharing the same index and long
+    enough to be worth it.
+    """
+    first = values[0]
+    if not isinstance(first, pd.Series) or len(first) < FUSION_MIN_ROWS:
+        return None
+    for value in values:
+        if (
+            not isinstance(value, pd.Series)
+            or value.dtype not in FUSED_DTYPES
+            or not value.index.equals(first.index)
+        ):
+            return None
+    local_dict = {"v%d" % i: value.to_numpy() for i, value in enumerate(values)}
+    names = {value.name for value in values}
+    return pd.Series(
+        numexpr.evaluate(expression, local_dict=local_dict),
+        index=first.index,
+        name=names.pop() if len(names) == 1 else None,
+    )
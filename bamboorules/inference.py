@@ -0,0 +1,250 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from bamboorules import dispatch
+
+# Binary operations raising over numbers and strings
+NUMERIC_OPERATIONS = ("<", "<=", ">", ">=", "+", "-", "/", "//")
+
+# Operations returning one of their arguments, row-wise over Pandas conditions
+LOGICAL_OPERATIONS = ("if", "?:", "and", "or")
+
+
+class Type:
+    """
+    Inferred type of a JsonLogic rule.
+
+    'kind' is either "scalar", "series" or "frame" and 'sample' is the value of
+    a constant scalar or an empty Pandas object of the inferred dtypes.
+    """
+
+    __slots__ = ("kind", "sample")
+
+    def __init__(self, kind, sample):
+        self.kind = kind
+        self.sample = sample
+
+    @property
+    def dtype(self):
+        """Return the dtype of a Series or scalar type."""
+        if self.kind == "series":
+            return self.sample.dtype
+        if self.kind == "scalar":
+            return pd.Series([self.sample]).dtype
+        return None
+
+    def __repr__(self):
+        if self.kind == "frame":
+            return "Type(frame)"
+        return "Type(%s, %s)" % (self.kind, self.dtype)
+
+
+def schema_dtypes(schema):
+    """
+    Return the dtype of each variable name of a schema: either a DataFrame
+    (sample of the data object) whose columns are variables, a Mapping of
+    variable names to DataFrames (whose columns are dot-notated variables like
+    "df.a") or a Mapping of variable names to dtypes.
+    """
+    if isinstance(schema, pd.DataFrame):
+        return {str(column): dtype for column, dtype in schema.dtypes.items()}
+    if not isinstance(schema, Mapping):
+        raise ValueError("Unsupported schema %r" % (schema,))
+    dtypes = {}
+    for name, value in schema.items():
+        if isinstance(value, pd.DataFrame):
+            dtypes[str(name)] = value.iloc[:0]
+            for column, dtype in value.dtypes.items():
+                dtypes["%s.%s" % (name, column)] = dtype
+        elif isinstance(value, pd.Series):
+            dtypes[str(name)] = value.dtype
+        else:
+            dtypes[str(name)] = pd.api.types.pandas_dtype(value)
+    return dtypes
+
+
+def _category(value_type):
+    """Return "boolean", "number", "string" or None (any other) for a value type."""
+    if value_type.kind == "scalar":
+        sample = value_type.sample
+        if isinstance(sample, str):
+            return "string"
+        if isinstance(sample, bool):
+            return "boolean"
+        if isinstance(sample, (int, float)):
+            return "number"
+        return None
+    dtype = value_type.dtype
+    if isinstance(dtype, pd.StringDtype):
+        return "string"
+    if isinstance(dtype, np.dtype) and dtype.kind == "b":
+        return "boolean"
+    if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+        return "number"
+    return None
+
+
+def is_binary(op):
+    """Check that an operation is a binary operation with kernels."""
+    return op in dispatch.BINARY_OPERATIONS or op in dispatch.SWAPPED_OPERATIONS
+
+
+def get_kernel(op, left, right):
+    """
+    Return the function evaluating a binary operation on arguments of known
+    types without checking them (the kernel the dispatched operation resolves
+    for their types, see 'dispatch.resolve'), or None if there is no
+    specialized kernel.
+    """
+    if not is_binary(op) or left is None or right is None:
+        return None
+    return dispatch.resolve(op, left.sample, right.sample)
+
+
+def _type_of(value):
+    """Return the type of a value evaluated over samples (None if unknown)."""
+    if isinstance(value, pd.Series):
+        return Type("series", value.iloc[:0])
+    if isinstance(value, pd.DataFrame):
+        return Type("frame", value.iloc[:0])
+    if pd.api.types.is_scalar(value):
+        return Type("scalar", value)
+    return None
+
+
+def compact_dtype(types):
+    """
+    Return the dtype the values of several boolean or numeric types fit in
+    without widening (like int8 for int8 Series and small integer constants,
+    or the smallest one holding integer constants only), or None if there is no
+    such dtype. Booleans and numbers mixed together have none, as booleans
+    would be cast to numbers.
+    """
+    args = []
+    categories = set()
+    for value_type in types:
+        if value_type is None or value_type.kind not in ("scalar", "series"):
+            return None
+        category = _category(value_type)
+        if category not in ("boolean", "number"):
+            return None
+        categories.add(category)
+        args.append(
+            value_type.sample if value_type.kind == "scalar" else value_type.dtype
+        )
+    if len(categories) > 1:
+        return None
+    if not any(isinstance(arg, np.dtype) for arg in args):
+        dtype = _smallest_integer_dtype(args)
+        if dtype is not None:
+            return dtype
+    try:
+        dtype = np.result_type(*args)
+    except TypeError:
+        return None
+    for arg in args:
+        if not isinstance(arg, np.dtype) and np.array(arg).astype(dtype) != arg:
+            return None  # Constant out of the range of the dtype
+    return dtype
+
+
+def _smallest_integer_dtype(values):
+    """
+    Return the smallest signed integer dtype holding integer constants (like
+    int8 for 0 and 1), or None if they are not all integers.
+    """
+    if not all(
+        isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+        for value in values
+    ):
+        return None
+    low, high = min(values), max(values)
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return None
+
+
+def infer(engine, logic, dtypes, types):
+    """
+    Infer the type of a JsonLogic rule (and all its subexpressions) from the
+    dtypes of variables (see 'schema_dtypes'), store the type of each rule
+    object in 'types' by id and return it (None if unknown).
+    Raise ValueError if the arguments of an operation have incompatible types.
+    """
+    value_type = _infer(engine, logic, dtypes, types)
+    types[id(logic)] = value_type
+    return value_type
+
+
+def _infer(engine, logic, dtypes, types):
+    if engine._is_sequence(logic):
+        for value in logic:
+            infer(engine, value, dtypes, types)
+        return None
+    if not engine._is_logic(logic):
+        return Type("scalar", logic) if pd.api.types.is_scalar(logic) else None
+
+    op = engine._get_operator(logic)
+    values = engine._get_values(logic, op)
+    args = [infer(engine, value, dtypes, types) for value in values]
+    if op in engine._custom_operations:
+        return None
+
+    if op == "var":
+        if not values or not isinstance(values[0], (str, int)):
+            return None
+        dtype = dtypes.get(str(values[0]))
+        if isinstance(dtype, pd.DataFrame):
+            return Type("frame", dtype)
+        if dtype is None:
+            return None
+        return Type("series", pd.Series([], dtype=dtype))
+
+    if op in LOGICAL_OPERATIONS:
+        return _infer_logical(op, args)
+
+    if not is_binary(op) or len(args) != 2 or None in args:
+        return None
+    left, right = args
+    categories = {_category(left), _category(right)}
+    numbers = categories & {"boolean", "number"}
+    if op in NUMERIC_OPERATIONS and numbers and "string" in categories:
+        raise ValueError(
+            "Incompatible types for %r: %s and %s" % (op, left.dtype, right.dtype)
+        )
+    if "frame" in (left.kind, right.kind):
+        return None
+    kernel = get_kernel(op, left, right)
+    try:
+        return _type_of(kernel(left.sample, right.sample))
+    except TypeError as e:
+        raise ValueError("Incompatible types for %r: %s" % (op, e))
+    except Exception:
+        return None  # Like dividing constants by zero, raised once evaluated
+
+
+def _infer_logical(op, args):
+    """
+    Infer the type of a logical operation: the common type of the arguments
+    it may return, a Series if any condition is one.
+    """
+    if op in ("if", "?:"):
+        conditions = args[0:-1:2]
+        results = args[1::2] + ([args[-1]] if len(args) % 2 else [None])
+    else:
+        conditions, results = args[:-1], args
+    if not args or None in conditions:
+        return None
+    series = any(value_type.kind == "series" for value_type in conditions)
+    dtype = compact_dtype(results)
+    if not series:
+        kinds = {value_type.kind for value_type in results if value_type is not None}
+        if dtype is None or kinds != {"series"}:
+            return None
+    elif dtype is None:
+        return Type("series", pd.Series([], dtype=object))
+    return Type("series", pd.Series([], dtype=dtype))
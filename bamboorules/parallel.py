@@ -0,0 +1,169 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from bamboorules.partial import PartialPlan
+
+# NumPy dtype kinds whose values can be shared as raw memory
+SHAREABLE_KINDS = "biufcmM"
+
+
+def _is_shareable(values):
+    """Check that array-like values are backed by a shareable NumPy array."""
+    return isinstance(values.dtype, np.dtype) and values.dtype.kind in SHAREABLE_KINDS
+
+
+def _attach(name):
+    """Attach to an existing shared memory block without tracking it."""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return SharedMemory(name=name)
+
+
+class SharedFrame:
+    """
+    DataFrame shared with worker processes.
+
+    NumPy-backed columns (and index) are copied once into shared memory blocks
+    that workers map without pickling. Other columns (objects, strings,
+    extension dtypes) are sliced and pickled with each partition.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.blocks = []
+        self.columns = [self._share(frame[column]) for column in frame.columns]
+        if isinstance(frame.index, pd.RangeIndex):
+            self.index = ("range", frame.index.start, frame.index.step)
+        elif _is_shareable(frame.index):
+            self.index = self._share(frame.index)
+        else:
+            self.index = None
+
+    def _share(self, values):
+        """Return the shared memory block name and dtype of values (if any)."""
+        if not _is_shareable(values):
+            return None
+        array = values.to_numpy()
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.blocks.append(block)
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+        return ("shared", block.name, array.dtype.str, len(array))
+
+    def partition(self, start, stop):
+        """Return a picklable description of rows 'start' to 'stop'."""
+        frame = self.frame
+        columns = [
+            (column, spec or frame[column].iloc[start:stop].to_numpy())
+            for column, spec in zip(frame.columns, self.columns)
+        ]
+        index = self.index or frame.index[start:stop]
+        return (columns, index, frame.index.name, start, stop)
+
+    def close(self):
+        """Release the shared memory blocks."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def load_partition(partition):
+    """
+    Rebuild a DataFrame from a partition description (see 'SharedFrame').
+    Return the DataFrame and the shared memory blocks it maps, to be closed
+    once it is no longer used.
+    """
+    columns, index, name, start, stop = partition
+    blocks = []
+
+    def load(spec):
+        if isinstance(spec, tuple) and spec[0] == "shared":
+            _, block_name, dtype, length = spec
+            block = _attach(block_name)
+            blocks.append(block)
+            return np.ndarray((length,), np.dtype(dtype), buffer=block.buf)[start:stop]
+        return spec
+
+    if isinstance(index, tuple) and index[0] == "range":
+        _, first, step = index
+        index = pd.RangeIndex(first + start * step, first + stop * step, step)
+    else:
+        index = pd.Index(load(index))
+    index.name = name
+    frame = pd.DataFrame(
+        {column: load(spec) for column, spec in columns}, index=index, copy=False
+    )
+    return frame, blocks
+
+
+def _detach(result):
+    """Copy Pandas results so that they do not map shared memory."""
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.copy(deep=True)
+    if isinstance(result, list):
+        return [_detach(value) for value in result]
+    return result
+
+
+def evaluate_partition(engine_class, operations, logic, partition):
+    """
+    Evaluate a rule on a partition in a worker process: the partial values of
+    its reducing operations, or its row-local result (see 'PartialPlan').
+    """
+    engine = engine_class()
+    if operations is not None:
+        engine._custom_operations.update(operations[0])
+        engine._pure_operations.update(operations[1])
+    plan = PartialPlan(engine, logic)
+    frame, blocks = load_partition(partition)
+    try:
+        result = plan.partial(frame) if plan.reducing else plan(frame)
+        return _detach(result)
+    finally:
+        del frame
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:  # Still mapped by a leftover view
+                pass
+
+
+def execute_partitions(plan, frame, processes):
+    """
+    Evaluate a partial plan over row partitions of a DataFrame on a pool of
+    'processes' worker processes and merge their results in index order.
+    """
+    engine = plan.engine
+    context = multiprocessing.get_context()
+    operations = None
+    if context.get_start_method() != "fork":
+        # Workers do not inherit custom operations
+        operations = (dict(engine._custom_operations), set(engine._pure_operations))
+    bounds = np.linspace(0, len(frame), processes + 1).astype(int)
+    shared = SharedFrame(frame)
+    try:
+        with ProcessPoolExecutor(processes, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    evaluate_partition,
+                    type(engine),
+                    operations,
+                    plan.logic,
+                    shared.partition(start, stop),
+                )
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        shared.close()
+
+    if plan.reducing:
+        return plan.finalize(plan.combine(results))
+    if all(isinstance(result, (pd.DataFrame, pd.Series)) for result in results):
+        return pd.concat(results)
+    return results[0]  # Does not depend on the data
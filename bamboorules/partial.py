@@ -0,0 +1,287 @@
+import pandas as pd
+
+# Operations reducing Pandas data to a value that can be computed from the
+# partial values of row partitions of the data
+REDUCING_OPERATIONS = ("min_reduce", "max_reduce", "count", "all", "some", "none")
+
+
+class Reduction:
+    """
+    Reducing operation found in a JsonLogic rule.
+
+    'logic' is the reducing operation rule, 'operator' its operator and 'args'
+    its compiled arguments: the reduced data argument first, then the scoped
+    logic and initial value of scoped operations (if any).
+    """
+
+    __slots__ = ("logic", "operator", "args", "reducer")
+
+    def __init__(self, logic, operator, args, reducer=None):
+        self.logic = logic
+        self.operator = operator
+        self.args = args
+        self.reducer = reducer
+
+
+class PartialPlan:
+    """
+    JsonLogic rule evaluated over row partitions (chunks) of Pandas data.
+
+    Rules without reducing operations are row-local: they are evaluated on each
+    partition independently ('__call__').
+
+    Otherwise each reducing operation ('min_reduce', 'max_reduce', 'count' on a
+    single argument, 'all', 'some', 'none' and native 'reduce' patterns over data
+    dependent arguments) is evaluated into a partial value per partition
+    ('partial'). Partial values are combined into a single partial value
+    ('combine') from which the final result is computed ('finalize'), the same
+    as evaluating the rule over the whole data.
+
+    Rules mixing row-local data and reducing operations would need the whole
+    data twice and are rejected.
+    """
+
+    def __init__(self, engine, logic):
+        self.engine = engine
+        self.logic = logic
+        self.reductions = []
+        self.plan = engine.compile(logic)
+        if self._split(logic) and self.reductions:
+            raise ValueError(
+                "Rule mixes row-local data and reducing operations: %r" % (logic,)
+            )
+
+    @property
+    def reducing(self):
+        """Check that the rule holds reducing operations."""
+        return bool(self.reductions)
+
+    def __call__(self, data):
+        """Evaluate a row-local rule on a partition of the data."""
+        return self.plan(data)
+
+    def _depends(self, logic):
+        """Check that a JsonLogic rule depends on the data it is evaluated with."""
+        engine = self.engine
+        if engine._is_constant(logic):
+            return False
+        operator = engine._get_operator(logic)
+        values = engine._get_values(logic, operator)
+        if operator in engine._data_operations:
+            return True
+        if operator in engine._scoped_operations:
+            return bool(values) and self._depends(values[0])
+        return any(map(self._depends, values))
+
+    def _split(self, logic):
+        """
+        Register the reducing operations of a JsonLogic rule and check that the
+        rest of it depends on the data.
+        """
+        engine = self.engine
+        if engine._is_constant(logic):
+            return False
+        operator = engine._get_operator(logic)
+        values = engine._get_values(logic, operator)
+        reduction = self._get_reduction(logic, operator, values)
+        if reduction is not None:
+            self.reductions.append(reduction)
+            return False
+        if operator in engine._data_operations:
+            return True
+        if operator in engine._scoped_operations:
+            return bool(values) and self._split(values[0])
+        return any([self._split(value) for value in values])
+
+    def _get_reduction(self, logic, operator, values):
+        """Return the reducing operation of a JsonLogic rule (if it is one)."""
+        engine = self.engine
+        if operator not in REDUCING_OPERATIONS and operator != "reduce":
+            return None
+        if operator in engine._custom_operations:
+            return None  # Overridden by a custom operation
+        if not values or not self._depends(values[0]):
+            return None
+        if operator in engine._scoped_operations:
+            if len(values) < 2:
+                return None
+            reducer = engine._get_reducer(values[1])
+            if operator == "reduce" and reducer is None:
+                return None
+            args = [engine.compile(values[0]).root] + list(values[1:])
+            return Reduction(logic, operator, args, reducer)
+        if len(values) != 1:
+            return None
+        return Reduction(logic, operator, [engine.compile(values[0]).root])
+
+    def partial(self, data):
+        """Return the partial value of each reducing operation over data."""
+        return [self._partial(reduction, data) for reduction in self.reductions]
+
+    def _partial(self, reduction, data):
+        engine = self.engine
+        value = reduction.args[0].evaluate(data)
+        if reduction.operator == "min_reduce":
+            return engine._min_reduce(value)
+        if reduction.operator == "max_reduce":
+            return engine._max_reduce(value)
+        if reduction.operator == "count":
+            return engine._count(value)
+        if not engine._is_dataframe_or_series(value):
+            value = pd.Series(value) if engine._is_sequence(value) else pd.Series()
+        if value.empty:
+            return None
+        if reduction.operator == "reduce":
+            return engine._native_reduce(reduction.reducer, value)
+        mask = engine._scoped_mask(value, reduction.args[1]).to_numpy()
+        if reduction.operator == "all":
+            return bool(mask.all())
+        return bool(mask.any())
+
+    def combine(self, partials):
+        """
+        Combine the partial values of several partitions into a single partial
+        value per reducing operation.
+        """
+        return [
+            self._combine(reduction, [partial[i] for partial in partials])
+            for i, reduction in enumerate(self.reductions)
+        ]
+
+    def _combine(self, reduction, values):
+        engine = self.engine
+        if reduction.operator in ("all", "some", "none", "reduce"):
+            values = [value for value in values if value is not None]
+            if not values:
+                return None
+            if reduction.operator == "all":
+                return all(values)
+            if reduction.operator == "reduce":
+                return engine._native_reduce(reduction.reducer, self._stack(values))
+            return any(values)
+        values = self._stack(values)
+        if reduction.operator == "min_reduce":
+            return values.min()
+        if reduction.operator == "max_reduce":
+            return values.max()
+        return values.sum()
+
+    @staticmethod
+    def _stack(values):
+        """Stack partial values of partitions into a DataFrame or Series."""
+        if values and isinstance(values[0], pd.Series):
+            return pd.DataFrame(values)
+        return pd.Series(values)
+
+    def finalize(self, partial):
+        """
+        Evaluate the rule with each reducing operation replaced by its value
+        computed from its combined partial value.
+        """
+        engine = self.engine
+        values = {}
+        for reduction, value in zip(self.reductions, partial):
+            if reduction.operator in ("all", "some"):
+                value = bool(value)
+            elif reduction.operator == "none":
+                value = not value
+            elif reduction.operator == "reduce":
+                initial = reduction.args[2] if len(reduction.args) > 2 else None
+                if value is None:
+                    value = initial
+                elif initial is not None:
+                    value = engine._native_reduce(
+                        reduction.reducer, self._stack([value]), initial
+                    )
+            values[id(reduction.logic)] = value
+        return engine.execute(self._substitute(self.logic, values))
+
+    def _substitute(self, logic, values):
+        """Replace the reducing operations of a JsonLogic rule by their value."""
+        engine = self.engine
+        if id(logic) in values:
+            return values[id(logic)]
+        if engine._is_constant(logic):
+            return logic
+        operator = engine._get_operator(logic)
+        args = engine._get_values(logic, operator)
+        return {operator: [self._substitute(arg, values) for arg in args]}
+
+
+class IncrementalPlan:
+    """
+    JsonLogic rule kept up to date over an append-only DataFrame (used as data
+    object), only evaluating the rows appended since the previous update.
+
+    Row-local rules evaluate the appended rows and keep their results, whose
+    concatenation is the result over the whole DataFrame ('result'). Rules with
+    reducing operations (see 'PartialPlan') update the running partial value of
+    each reducing operation with the partial values of the appended rows.
+
+    Example:
+    plan = engine.incremental({"max_reduce": [{"var": "latency"}]})
+    plan.update(events)  # Evaluates every row
+    events = pd.concat([events, new_events])
+    plan.update(events)  # Only evaluates the rows of new_events
+    """
+
+    def __init__(self, engine, logic):
+        self.plan = PartialPlan(engine, logic)
+        self.rows = 0
+        self.last = None
+        self.partial = None
+        self.results = []
+
+    def __len__(self):
+        """Return the number of rows evaluated so far."""
+        return self.rows
+
+    def update(self, frame):
+        """
+        Evaluate the rule over the rows appended to a DataFrame since the
+        previous update. Return the result of these rows for row-local rules,
+        the result over the whole DataFrame otherwise.
+
+        Raise a ValueError if the rows previously evaluated are not at the start
+        of the DataFrame anymore (rows removed or inserted).
+        """
+        if len(frame) < self.rows or (
+            self.rows and frame.index[self.rows - 1] != self.last
+        ):
+            raise ValueError("DataFrame is not the previous one with rows appended")
+        appended = frame.iloc[self.rows :]
+        plan = self.plan
+        if not plan.reducing:
+            result = plan(appended)
+            self.results.append(result)
+            self._advance(frame)
+            return result
+        if len(appended):
+            partials = [plan.partial(appended)]
+            if self.partial is not None:
+                partials.insert(0, self.partial)
+            self.partial = plan.combine(partials)
+        self._advance(frame)
+        return self.result
+
+    def _advance(self, frame):
+        """
+        Count the rows of a DataFrame as evaluated, once their evaluation
+        succeeded (they are evaluated again by the next update otherwise).
+        """
+        self.rows = len(frame)
+        self.last = frame.index[-1] if len(frame) else None
+
+    @property
+    def result(self):
+        """Return the result over the whole DataFrame evaluated so far."""
+        plan = self.plan
+        if plan.reducing:
+            return plan.finalize(self.partial or plan.combine([]))
+        results = self.results
+        if results and all(isinstance(r, (pd.DataFrame, pd.Series)) for r in results):
+            # Empty results of updates without appended rows lack a dtype
+            results = [r for r in results if len(r)] or results[-1:]
+            self.results = [pd.concat(results)] if len(results) > 1 else results
+            return self.results[0]
+        return results[-1] if results else None  # Does not depend on the data
@@ -0,0 +1,125 @@
+from contextvars import ContextVar
+
+# Memo of the plan whose current call evaluates inputs aligned once beforehand
+# (see 'Memo.is_aligned'), per thread and asynchronous task
+ALIGNED = ContextVar("aligned", default=None)
+
+
+class Node:
+    """
+    Compiled JsonLogic node.
+
+    'logic' keeps the original JsonLogic rule the node was compiled from and
+    'evaluate' is a closure taking a data object and returning the evaluated
+    value, with the operator and all its arguments already bound.
+    """
+
+    __slots__ = ("logic", "evaluate")
+
+    def __init__(self, logic, evaluate):
+        self.logic = logic
+        self.evaluate = evaluate
+
+    def __repr__(self):
+        return "Node(%r)" % (self.logic,)
+
+
+class Memo:
+    """
+    Common subexpressions of compiled rules.
+
+    'keys' maps the id of each compiled rule object to its structural key,
+    'counts' the number of occurrences of each pure subexpression, 'nodes' the
+    node shared by all occurrences of a subexpression (by key and whether its
+    subtrees may be fused) and 'values' the last value of each subexpression
+    along with the data object it was evaluated with. Values only live for a
+    single evaluation of a plan.
+
+    'fuse' tells whether arithmetic and comparison subtrees are compiled into
+    fused expressions, 'align' whether binary operations may skip aligning their
+    Pandas arguments and 'aligned' whether they always do so, because every
+    input shares the same index (see 'is_aligned'). 'types' maps the id of each
+    compiled rule object to its inferred type and 'hooks' are called after
+    evaluating each node (see 'Engine.compile'). 'threads' tells whether heavy
+    arguments are evaluated concurrently on the shared thread pool and 'costs'
+    maps the id of each rule object to its number of operations, or None if it
+    cannot be evaluated on a thread (see 'Engine._thread_cost').
+    """
+
+    __slots__ = (
+        "keys",
+        "counts",
+        "nodes",
+        "values",
+        "fuse",
+        "align",
+        "aligned",
+        "types",
+        "hooks",
+        "threads",
+        "costs",
+    )
+
+    def __init__(
+        self,
+        fuse=False,
+        align=False,
+        aligned=False,
+        types=None,
+        hooks=(),
+        threads=False,
+    ):
+        self.keys = {}
+        self.counts = {}
+        self.nodes = {}
+        self.values = {}
+        self.fuse = fuse
+        self.align = align or aligned
+        self.aligned = aligned
+        self.types = types or {}
+        self.hooks = tuple(hooks)
+        self.threads = threads
+        self.costs = {}
+
+    def is_aligned(self):
+        """
+        Check that binary operations skip aligning their Pandas arguments during
+        the current call of the plan: always if 'aligned', otherwise only if the
+        call aligned its inputs beforehand (see 'ALIGNED'). Concurrent calls of
+        the same plan thus never see each other's alignment.
+        """
+        return self.aligned or ALIGNED.get() is self
+
+
+class Plan:
+    """
+    Reusable evaluation plan returned by 'Engine.compile'.
+
+    Calling the plan with a data object returns the same result as
+    'Engine.execute' would for the compiled rule, without looking up any
+    operator again.
+
+    Identical pure subexpressions are only evaluated once per data object
+    during a call.
+
+    Example:
+    plan = engine.compile({"+": [{"var": "a"}, 1]})
+    plan({"a": 1})
+    returns 2.
+    """
+
+    __slots__ = ("logic", "root", "memo")
+
+    def __init__(self, logic, root, memo):
+        self.logic = logic
+        self.root = root
+        self.memo = memo
+
+    def __call__(self, data=None):
+        try:
+            return self.root.evaluate(data)
+        finally:
+            self.memo.values.clear()
+
+    def __repr__(self):
+        return "Plan(%r)" % (self.logic,)
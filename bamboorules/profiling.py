@@ -0,0 +1,146 @@
+from collections.abc import Mapping
+
+import pandas as pd
+
+from bamboorules.cache import sizeof
+
+
+def kind(value):
+    """Return the kind of a value: frame, series, array, mapping or scalar."""
+    if isinstance(value, pd.DataFrame):
+        return "frame"
+    if isinstance(value, pd.Series):
+        return "series"
+    if isinstance(value, (tuple, list)):
+        return "array"
+    if isinstance(value, Mapping):
+        return "mapping"
+    return "scalar"
+
+
+def rows(value):
+    """
+    Return the number of rows of a Pandas value, or of the first Pandas value
+    found in a Mapping (None if there is none).
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, Mapping):
+        for item in value.values():
+            count = rows(item)
+            if count is not None:
+                return count
+    return None
+
+
+class NodeProfile:
+    """
+    Evaluation statistics of a JsonLogic rule node (see 'Engine.profile').
+
+    'calls' counts the evaluations of the node and 'time' their total wall
+    time in seconds, including the evaluation of its 'children'. 'input_kind'
+    and 'input_rows' describe the last data object it was evaluated with,
+    'output_kind', 'output_rows' and 'nbytes' its last result (see 'kind',
+    'rows' and 'cache.sizeof').
+
+    Nodes sharing the same pure subexpression are only evaluated (and
+    accounted for) once, as the first occurrence of the subexpression.
+    """
+
+    __slots__ = (
+        "logic",
+        "operator",
+        "calls",
+        "time",
+        "input_kind",
+        "input_rows",
+        "output_kind",
+        "output_rows",
+        "nbytes",
+        "children",
+        "result",
+    )
+
+    def __init__(self, logic, operator):
+        self.logic = logic
+        self.operator = operator
+        self.calls = 0
+        self.time = 0.0
+        self.input_kind = None
+        self.input_rows = None
+        self.output_kind = None
+        self.output_rows = None
+        self.nbytes = None
+        self.children = []
+        self.result = None
+
+    @property
+    def self_time(self):
+        """Return the time spent in the node itself, excluding its children."""
+        return self.time - sum(child.time for child in self.children)
+
+    def walk(self):
+        """Iterate over the node and all its descendants, depth first."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def format(self, depth=0):
+        """Return a textual report of the node and its descendants."""
+        line = "%s%s: %d calls, %.6fs (self %.6fs), %s[%s] -> %s[%s], %s bytes" % (
+            "  " * depth,
+            self.operator,
+            self.calls,
+            self.time,
+            self.self_time,
+            self.input_kind,
+            self.input_rows,
+            self.output_kind,
+            self.output_rows,
+            self.nbytes,
+        )
+        return "\n".join([line] + [child.format(depth + 1) for child in self.children])
+
+    def __str__(self):
+        return self.format()
+
+    def __repr__(self):
+        return "NodeProfile(%r, calls=%d, time=%.6f)" % (
+            self.operator,
+            self.calls,
+            self.time,
+        )
+
+
+class Profiler:
+    """
+    Evaluation hook (see 'Engine.compile') recording the statistics of each
+    rule node it is called for.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+
+    def __call__(self, logic, data, result, elapsed):
+        profile = self.profiles.get(id(logic))
+        if profile is None:
+            profile = self.profiles[id(logic)] = NodeProfile(logic, None)
+        profile.calls += 1
+        profile.time += elapsed
+        profile.input_kind = kind(data)
+        profile.input_rows = rows(data)
+        profile.output_kind = kind(result)
+        profile.output_rows = rows(result)
+        profile.nbytes = sizeof(result)
+
+    def tree(self, engine, logic):
+        """Return the profile tree of a JsonLogic rule (see 'NodeProfile')."""
+        operator = engine._get_operator(logic)
+        profile = self.profiles.get(id(logic)) or NodeProfile(logic, None)
+        profile.operator = operator
+        profile.children = [
+            self.tree(engine, value)
+            for value in engine._get_values(logic, operator)
+            if engine._is_logic(value)
+        ]
+        return profile
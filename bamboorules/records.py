@@ -0,0 +1,226 @@
+import pandas as pd
+
+# Operations evaluated the same way over columns as over single records
+VECTORIZED_OPERATIONS = {
+    "var",
+    "missing",
+    "missing_some",
+    "if",
+    "?:",
+    "and",
+    "or",
+    "==",
+    "<",
+    "<=",
+    ">",
+    ">=",
+    "+",
+    "-",
+    "*",
+    "cat",
+    "substr",
+    "in",
+}
+
+# Python types of the values columnarized. Columns hold them as Python objects
+# so that operations apply Python semantics (booleans added as integers,
+# unbounded integers, branches of different types kept as is).
+COLUMN_TYPES = (bool, int, float, str)
+
+# Python types of the constant values of 'if', '?:', 'and' and 'or' operations
+# held by constant columns, so that branches of different numeric types are not
+# widened when combined into a single column
+CONSTANT_TYPES = (bool, int, float)
+
+
+class RecordPlan:
+    """
+    JsonLogic rule evaluated over a list of records (Python data objects) at
+    once, returning the same results as evaluating it on each record.
+
+    The values of the variables the rule uses are pulled out of the records
+    into the columns of a DataFrame in one pass, then the rule is evaluated
+    over the columns through the regular Pandas operations. Records whose values
+    would not evaluate the same way over columns (absent or None values,
+    nested objects) are evaluated one by one instead, like every record when
+    the rule uses operations that are not vectorized or raises over columns.
+
+    'missing' and 'missing_some' evaluate to an empty array over columns since
+    records holding absent, None or "" values are evaluated one by one.
+    Constant numeric values of logical operations are read from constant
+    columns of Python objects (see 'CONSTANT_TYPES').
+    """
+
+    def __init__(self, engine, logic):
+        self.engine = engine
+        self.logic = logic
+        self.plan = engine.compile(logic)
+        self.var_paths = {}
+        self.missing_paths = {}
+        self.constants = {}
+        self.column_plan = None
+        if self._collect(logic):
+            self.column_plan = engine.compile(self._substitute(logic))
+
+    def _collect(self, logic):
+        """
+        Collect the variable names of a JsonLogic rule and check that it can be
+        evaluated over columns.
+        """
+        engine = self.engine
+        if engine._is_sequence(logic):
+            return all(map(self._collect, logic))
+        if not engine._is_logic(logic):
+            return True
+        operator = engine._get_operator(logic)
+        values = engine._get_values(logic, operator)
+        if (
+            operator not in VECTORIZED_OPERATIONS
+            or operator in engine._custom_operations
+        ):
+            return False
+        if operator == "var":
+            if not values or len(values) > 3:
+                return False
+            if not all(map(engine._is_constant, values)):
+                return False
+            return self._add_path(self.var_paths, values[0])
+        if operator in ("missing", "missing_some"):
+            if not all(map(engine._is_constant, values)):
+                return False
+            if operator == "missing_some":
+                names = values[1] if len(values) == 2 else None
+            else:
+                names = (
+                    values[0] if values and engine._is_sequence(values[0]) else values
+                )
+            if not engine._is_sequence(names):
+                return False
+            return all(self._add_path(self.missing_paths, name) for name in names)
+        return all(map(self._collect, values))
+
+    def _add_path(self, paths, var_name):
+        """Register a variable name, unless it is the whole data object."""
+        if var_name is None or var_name == "":
+            return False
+        if not isinstance(var_name, (str, int)) or isinstance(var_name, bool):
+            return False
+        paths[str(var_name)] = self.engine._parse_path(str(var_name))
+        return True
+
+    def _substitute(self, logic):
+        """
+        Replace 'missing' and 'missing_some' operations by an empty array and
+        the constant numeric values of logical operations by variables of
+        constant columns.
+        """
+        engine = self.engine
+        if engine._is_sequence(logic):
+            return [self._substitute(value) for value in logic]
+        if not engine._is_logic(logic):
+            return logic
+        operator = engine._get_operator(logic)
+        if operator in ("missing", "missing_some"):
+            return []
+        if operator == "var":
+            return logic
+        values = engine._get_values(logic, operator)
+        if operator in ("and", "or"):
+            return {operator: [self._constant(value) for value in values]}
+        if operator == "if" or (operator == "?:" and len(values) == 3):
+            args = []
+            for i, value in enumerate(values):
+                if i % 2 == 0 and i < len(values) - 1:  # Condition
+                    args.append(self._substitute(value))
+                else:
+                    args.append(self._constant(value))
+            return {operator: args}
+        return {operator: [self._substitute(value) for value in values]}
+
+    def _constant(self, value):
+        """
+        Replace a constant numeric value by a variable of a constant column
+        holding it.
+        """
+        if type(value) not in CONSTANT_TYPES:
+            return self._substitute(value)
+        name = "#%d" % len(self.constants)
+        while name in self.var_paths or name in self.constants:
+            name = "#" + name
+        self.constants[name] = value
+        return {"var": name}
+
+    def _columnarize(self, records):
+        """
+        Pull the values of the rule's variables out of the records.
+        Return the positions of the records that can be evaluated over columns
+        and a DataFrame holding their values.
+        """
+        get_path = self.engine._get_path
+        names = list(self.var_paths)
+        var_paths = list(self.var_paths.values())
+        missing_paths = list(self.missing_paths.values())
+        values = {name: [] for name in names}
+        rows = []
+        for position, record in enumerate(records):
+            record = self.engine._get_data(record)
+            row = []
+            try:
+                for segments in missing_paths:
+                    if get_path(record, segments) in (None, ""):
+                        break
+                else:
+                    for name, segments in zip(names, var_paths):
+                        value = get_path(record, segments)
+                        if type(value) not in COLUMN_TYPES:
+                            break
+                        row.append(value)
+                    else:
+                        rows.append(position)
+                        for name, value in zip(names, row):
+                            values[name].append(value)
+            except (KeyError, TypeError, ValueError, IndexError):
+                pass
+        for name, value in self.constants.items():
+            values[name] = [value] * len(rows)
+        frame = pd.DataFrame(
+            {name: pd.Series(column, dtype=object) for name, column in values.items()},
+            index=pd.RangeIndex(len(rows)),
+        )
+        return rows, frame
+
+    def _evaluate_columns(self, records):
+        """
+        Evaluate the rule over the columns of the records that allow it.
+        Return the positions of these records and their results, or None if
+        the rule does not evaluate the same way over columns.
+        """
+        rows, frame = self._columnarize(records)
+        if not rows:
+            return None
+        try:
+            result = self.column_plan(frame)
+        except Exception:
+            return None  # Raises for some record, evaluated one by one instead
+        if isinstance(result, pd.DataFrame):
+            return None
+        if isinstance(result, pd.Series):
+            if not result.index.equals(frame.index):
+                return None
+            return rows, result.tolist()
+        return rows, [result] * len(rows)
+
+    def __call__(self, records):
+        """Evaluate the rule on each record and return the list of results."""
+        records = list(records)
+        results = [None] * len(records)
+        evaluated = [False] * len(records)
+        columns = self._evaluate_columns(records) if self.column_plan else None
+        if columns is not None:
+            for position, result in zip(*columns):
+                results[position] = result
+                evaluated[position] = True
+        for position, record in enumerate(records):
+            if not evaluated[position]:
+                results[position] = self.plan(record)
+        return results
@@ -0,0 +1,78 @@
+import pandas as pd
+
+from bamboorules import fusion
+from bamboorules.engine import Engine
+from bamboorules.plan import Memo
+
+
+class RuleSet:
+    """
+    Named collection of JsonLogic rules evaluated together.
+
+    All rules are compiled at once: pure subexpressions shared by several rules
+    (like the same {"var": "a"} lookup or {"/": [{"var": "b"}, {"var": "c"}]}
+    computation) are evaluated only once per evaluation of the whole set.
+
+    Example:
+    rules = RuleSet({
+        "adult": {">=": [{"var": "age"}, 18]},
+        "senior": {">=": [{"var": "age"}, 65]},
+    })
+    rules.evaluate(df)
+    returns a DataFrame with an "adult" and a "senior" column.
+
+    'optimize' and 'fuse' apply to every rule like they do with 'Engine.compile'.
+    """
+
+    def __init__(self, rules, engine=None, optimize=False, fuse=False):
+        self.engine = engine or Engine()
+        self.memo = Memo(fuse=fuse and fusion.numexpr is not None)
+        self.rules = {
+            str(name): self.engine.optimize(logic) if optimize else logic
+            for name, logic in rules.items()
+        }
+        for logic in self.rules.values():
+            self.engine._scan(logic, self.memo)
+        self.nodes = {
+            name: self.engine._compile(logic, self.memo)
+            for name, logic in self.rules.items()
+        }
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __repr__(self):
+        return "RuleSet(%r)" % (list(self.rules),)
+
+    def execute(self, data=None):
+        """
+        Evaluate every rule using given data (if any) and return a dictionary of
+        each rule's resulting value by rule name.
+        """
+        try:
+            return {name: node.evaluate(data) for name, node in self.nodes.items()}
+        finally:
+            self.memo.values.clear()
+
+    def evaluate(self, data=None):
+        """
+        Evaluate every rule using given data (if any) and return a DataFrame
+        with one result column per rule.
+
+        Results are indexed like the data if it is a DataFrame, like the first
+        Series result otherwise. Scalar results are repeated on every row.
+        """
+        results = self.execute(data)
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            index = data.index
+        else:
+            index = next(
+                (r.index for r in results.values() if isinstance(r, pd.Series)),
+                pd.RangeIndex(1),
+            )
+        columns = {}
+        for name, result in results.items():
+            if isinstance(result, pd.DataFrame):
+                raise ValueError("Rule %r evaluated to a DataFrame" % name)
+            columns[name] = self.engine._broadcast(result, index)
+        return pd.DataFrame(columns, index=index)
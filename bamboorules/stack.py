@@ -0,0 +1,323 @@
+from functools import partial
+
+import pandas as pd
+
+from bamboorules.plan import Node
+
+# Opcodes of the instructions of a stack program. Each instruction is an
+# (opcode, argument, extra) tuple:
+# - CONST pushes 'argument';
+# - VAR pushes 'argument(data)', a prebuilt variable accessor;
+# - CALL pops 'extra' values and pushes 'argument(*values)';
+# - DATA pops 'extra' values and pushes 'argument(data, *values)';
+# - SCOPED pushes 'argument(data, *extra)', 'extra' holding the nodes of the
+#   scoped data and logic and the remaining constant arguments;
+# - IF pops a condition and jumps to 'argument' if it is falsy (see 'Branch');
+# - AND and OR jump to 'argument' if the top value is falsy (AND) or truthy
+#   (OR), keeping it, and pop it otherwise unless it is the last operand;
+# - JUMP jumps to 'argument'.
+CONST, VAR, CALL, DATA, SCOPED, IF, AND, OR, JUMP = range(9)
+
+# Values whose truthiness is evaluated row-wise by logical operations
+PANDAS = (pd.DataFrame, pd.Series)
+
+# Tasks of the compilation work stack
+VISIT, EMIT, CALLBACK = range(3)
+
+
+class Branch:
+    """
+    Condition of an 'if' chain in a stack program.
+
+    'end' is the position of the instruction following the whole chain and
+    'rest' the nodes of the remaining arguments of the chain, evaluated
+    row-wise when the condition is a Pandas DataFrame or Series.
+    """
+
+    __slots__ = ("end", "rest")
+
+    def __init__(self):
+        self.end = None
+        self.rest = ()
+
+
+class StackPlan:
+    """
+    JsonLogic rule flattened into a program of postorder instructions run on an
+    explicit value stack, returning the same results as 'Engine.execute'.
+
+    Neither flattening nor running the program recurses on nested operations,
+    so rules of any depth are evaluated without RecursionError and without
+    a Python call per nesting level: arguments are pushed on the value stack
+    and operations pop theirs. Logical operations ('if', '?:', 'and', 'or')
+    jump over the arguments they do not evaluate, keeping their lazy semantics.
+
+    N.B.: Arguments evaluated row-wise (once a condition of a logical operation
+    evaluates to a Pandas DataFrame or Series) and the arguments of scoped
+    operations are evaluated as subprograms by their operation, so Python
+    recursion still grows with the nesting of such operations.
+
+    Example:
+    plan = StackPlan(engine, logic)
+    plan({"a": 1})
+    """
+
+    def __init__(self, engine, logic):
+        self.engine = engine
+        self.logic = logic
+        self.code = []
+        # Operation tables, looked up once per program
+        self._logical_operations = engine._logical_operations
+        self._scoped_operations = engine._scoped_operations
+        self._data_operations = engine._data_operations
+        self._operations = {}
+        self._flatten(logic)
+
+    def __call__(self, data=None):
+        return self._run(0, len(self.code), data)
+
+    def __len__(self):
+        return len(self.code)
+
+    def __repr__(self):
+        return "StackPlan(%d instructions)" % len(self.code)
+
+    def _flatten(self, logic):
+        """
+        Append the instructions of a JsonLogic rule to the program, walking it
+        with an explicit work stack of tasks: rules to visit, instructions to
+        emit and callbacks taking the current position of the program.
+        """
+        code = self.code
+        work = [(VISIT, logic)]
+        while work:
+            task, payload = work.pop()
+            if task == VISIT:
+                tasks = self._visit(payload)
+                work.extend(reversed(tasks))
+            elif task == EMIT:
+                code.append(payload)
+            else:
+                payload(len(code))
+
+    def _node(self, logic, span):
+        """Return a node evaluating a span of the program as a subprogram."""
+        return Node(logic, partial(self._run, span[0], span[1]))
+
+    def _span(self, logic, span):
+        """Return the tasks emitting a rule and recording its [start, end) span."""
+        return [
+            (CALLBACK, partial(span.__setitem__, 0)),
+            (VISIT, logic),
+            (CALLBACK, partial(span.__setitem__, 1)),
+        ]
+
+    def _emit(self, instruction, positions, position):
+        """Emit an instruction and record its position to patch it later."""
+        self.code.append(instruction)
+        positions.append(position)
+
+    def _patch_all(self, positions, target):
+        """Set the jump target of the instructions at several positions."""
+        for position in positions:
+            opcode, _, extra = self.code[position]
+            self.code[position] = (opcode, target, extra)
+
+    def _visit(self, logic):
+        """Return the tasks emitting a JsonLogic rule, in order."""
+        engine = self.engine
+
+        # Arrays and primitives evaluate to themselves
+        if engine._is_sequence(logic) or not engine._is_logic(logic):
+            return [(EMIT, (CONST, logic, None))]
+
+        operator = engine._get_operator(logic)
+        values = engine._get_values(logic, operator)
+
+        if operator in ("if", "?:") and (operator == "if" or len(values) == 3):
+            return self._visit_if(values)
+        if operator in ("and", "or"):
+            return self._visit_operands(AND if operator == "and" else OR, values)
+        if operator in self._logical_operations:
+            operation = self._logical_operations[operator]
+            return [(EMIT, (SCOPED, operation, values))]  # Raises when evaluated
+
+        if operator in self._scoped_operations:
+            return self._visit_scoped(self._scoped_operations[operator], values)
+
+        # Variables with a constant name are looked up by a prebuilt accessor
+        if (
+            operator == "var"
+            and len(values) <= 3
+            and all(map(engine._is_constant, values))
+        ):
+            return [(EMIT, (VAR, engine._var_accessor(*values), None))]
+
+        tasks = [
+            (VISIT, value) if engine._is_logic(value) else (EMIT, (CONST, value, None))
+            for value in values
+        ]
+        if operator in self._data_operations:
+            operation = self._data_operations[operator]
+            return tasks + [(EMIT, (DATA, operation, len(values)))]
+        return tasks + [(EMIT, (CALL, self._get_operation(operator), len(values)))]
+
+    def _get_operation(self, operator):
+        """
+        Return the callable of an operation (see 'Engine._get_operation'), or
+        a callable raising its error if it is unrecognized.
+        """
+        operation = self._operations.get(operator)
+        if operation is None:
+            try:
+                operation = self.engine._get_operation(operator)
+            except ValueError as e:
+                error = e
+
+                def operation(*values):
+                    raise error
+
+            self._operations[operator] = operation
+        return operation
+
+    def _visit_if(self, args):
+        """
+        Return the tasks emitting an 'if' chain: each condition is followed by
+        an IF instruction jumping to the next condition and each value by a
+        JUMP instruction to the end of the chain.
+        """
+        spans = [[None, None] for _ in args]
+        branches, jumps = [], []
+        tasks = []
+        for i in range(0, len(args) - 1, 2):
+            branch, condition = Branch(), []
+            branches.append((i, branch))
+            tasks += self._span(args[i], spans[i])
+            tasks.append((CALLBACK, partial(self._emit, (IF, None, branch), condition)))
+            tasks += self._span(args[i + 1], spans[i + 1])
+            tasks.append((CALLBACK, partial(self._emit, (JUMP, None, None), jumps)))
+            tasks.append((CALLBACK, partial(self._patch_all, condition)))
+        if len(args) % 2:
+            tasks += self._span(args[-1], spans[-1])
+        else:
+            tasks.append((EMIT, (CONST, None, None)))
+
+        def end(position):
+            self._patch_all(jumps, position)
+            for i, branch in branches:
+                branch.end = position
+                branch.rest = [
+                    self._node(arg, span)
+                    for arg, span in zip(args[i + 1 :], spans[i + 1 :])
+                ]
+
+        tasks.append((CALLBACK, end))
+        return tasks
+
+    def _visit_operands(self, opcode, args):
+        """
+        Return the tasks emitting an 'and' (AND instructions) or 'or' (OR
+        instructions) operation: each operand is followed by an instruction
+        jumping to the end of the operation once its value is decided.
+        """
+        if not args:
+            return [(EMIT, (CONST, False, None))]
+        spans = [[None, None] for _ in args]
+        rests = [[] for _ in args]
+        jumps = []
+        tasks = []
+        for i, arg in enumerate(args):
+            tasks += self._span(arg, spans[i])
+            tasks.append(
+                (CALLBACK, partial(self._emit, (opcode, None, rests[i]), jumps))
+            )
+
+        def end(position):
+            self._patch_all(jumps, position)
+            for i, rest in enumerate(rests):
+                rest.extend(
+                    self._node(arg, span)
+                    for arg, span in zip(args[i + 1 :], spans[i + 1 :])
+                )
+
+        tasks.append((CALLBACK, end))
+        return tasks
+
+    def _visit_scoped(self, operation, values):
+        """
+        Return the tasks emitting a scoped operation: its data and logic
+        arguments are emitted out of line (jumped over) and evaluated as
+        subprograms by the operation.
+        """
+        args = list(values[:2])
+        spans = [[None, None] for _ in args]
+        jump = []
+        tasks = [(CALLBACK, partial(self._emit, (JUMP, None, None), jump))]
+        for arg, span in zip(args, spans):
+            tasks += self._span(arg, span)
+
+        def emit(position):
+            self._patch_all(jump, position)
+            nodes = [self._node(arg, span) for arg, span in zip(args, spans)]
+            self.code.append((SCOPED, operation, nodes + list(values[2:])))
+
+        tasks.append((CALLBACK, emit))
+        return tasks
+
+    def _run(self, pc, end, data=None):
+        """Run the instructions of the program from 'pc' to 'end' with data."""
+        engine = self.engine
+        truthy = engine._truthy
+        code = self.code
+        data = engine._get_data(data)
+        stack = []
+        push, pop = stack.append, stack.pop
+        while pc < end:
+            opcode, argument, extra = code[pc]
+            pc += 1
+            if opcode == CALL:
+                if extra == 2:
+                    b = pop()
+                    push(argument(pop(), b))
+                elif extra == 1:
+                    push(argument(pop()))
+                elif extra:
+                    values = stack[-extra:]
+                    del stack[-extra:]
+                    push(argument(*values))
+                else:
+                    push(argument())
+            elif opcode == VAR:
+                push(argument(data))
+            elif opcode == CONST:
+                push(argument)
+            elif opcode == IF:
+                condition = pop()
+                if isinstance(condition, PANDAS):
+                    push(engine._select(data, condition, *extra.rest))
+                    pc = extra.end
+                elif not truthy(condition):
+                    pc = argument
+            elif opcode == AND or opcode == OR:
+                current = stack[-1]
+                if isinstance(current, PANDAS):
+                    stack[-1] = engine._select_operands(
+                        data, current, extra, opcode == OR
+                    )
+                    pc = argument
+                elif truthy(current) is (opcode == OR):
+                    pc = argument
+                elif extra:
+                    pop()
+            elif opcode == JUMP:
+                pc = argument
+            elif opcode == DATA:
+                if extra:
+                    values = stack[-extra:]
+                    del stack[-extra:]
+                else:
+                    values = ()
+                push(argument(data, *values))
+            else:
+                push(argument(data, *extra))
+        return pop()
@@ -0,0 +1,99 @@
+import contextvars
+import os
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Minimal number of rows of the data object for arguments to be evaluated on
+# threads (see 'rows')
+THREAD_MIN_ROWS = 1000000
+
+# Minimal estimated work of an argument for it to be evaluated on a thread: its
+# number of operations (besides variables) times the number of rows, so that
+# cheap arguments like {"*": [{"var": "a"}, 2]} need several million rows
+THREAD_MIN_WORK = 4000000
+
+# Number of threads of the shared pool
+THREADS = os.cpu_count() or 1
+
+_pool = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _mark_worker():
+    _local.worker = True
+
+
+def get_pool():
+    """Return the thread pool shared by every plan, created on first use."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=THREADS,
+                thread_name_prefix="bamboorules",
+                initializer=_mark_worker,
+            )
+        return _pool
+
+
+def rows(data):
+    """
+    Return the number of rows of a data object: the length of a Pandas
+    DataFrame or Series, or of the longest one a Mapping holds.
+    """
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return len(data)
+    if isinstance(data, Mapping):
+        return max(
+            (
+                len(value)
+                for value in data.values()
+                if isinstance(value, (pd.DataFrame, pd.Series))
+            ),
+            default=0,
+        )
+    return 0
+
+
+def evaluate_arguments(evaluators, costs, data):
+    """
+    Evaluate the arguments of an operation and return their values, the heavy
+    ones concurrently on the shared thread pool. 'costs' holds the position and
+    number of operations of the arguments that may be evaluated on threads:
+    they are heavy if the data object has at least 'THREAD_MIN_ROWS' rows and
+    their estimated work reaches 'THREAD_MIN_WORK' (see 'rows'). Arguments are
+    evaluated serially unless at least two are heavy and there are several
+    'THREADS'.
+
+    The calling thread evaluates the other arguments and the first heavy one.
+    Arguments are evaluated serially on threads of the pool, so that they
+    never wait for each other, in a copy of the caller's context (see
+    'plan.ALIGNED').
+    """
+    if THREADS < 2 or getattr(_local, "worker", False):
+        return [evaluate(data) for evaluate in evaluators]
+    count = rows(data)
+    heavy = [i for i, cost in costs if cost * count >= THREAD_MIN_WORK]
+    if count < THREAD_MIN_ROWS or len(heavy) < 2:
+        return [evaluate(data) for evaluate in evaluators]
+    pool = get_pool()
+    futures = {
+        i: pool.submit(contextvars.copy_context().run, evaluators[i], data)
+        for i in heavy[1:]
+    }
+    values = [None] * len(evaluators)
+    try:
+        for i, evaluate in enumerate(evaluators):
+            if i not in futures:
+                values[i] = evaluate(data)
+    except BaseException:
+        for future in futures.values():
+            future.cancel()
+        raise
+    for i, future in futures.items():
+        values[i] = future.result()
+    return values
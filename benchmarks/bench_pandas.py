@@ -0,0 +1,102 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from bamboorules.engine import Engine
+
+X = {"var": "x"}
+Y = {"var": "y"}
+
+# Rules over the "x" and "y" variables (Series or DataFrames)
+RULES = {
+    "+": {"+": [X, Y]},
+    "*": {"*": [X, Y]},
+    "<": {"<": [X, Y]},
+    "==": {"==": [X, Y]},
+    "scalar": {"<": [X, 0.5]},
+    "compound": {"<": [{"+": [{"*": [X, 2]}, Y]}, {"-": [X, Y]}]},
+}
+
+# Numbers of rows of the Pandas objects
+ROWS = [1000, 100000, 10000000]
+
+# Index of "y" relative to the index of "x": the same index object, the same
+# labels in another order or labels partly shared with "x"
+INDEXES = ["shared", "shuffled", "shifted"]
+
+# Ways of evaluating the rules: interpreted, compiled, compiled with variables
+# aligned once per call (see 'Engine.compile'), assumed to be aligned or with
+# arguments evaluated on threads
+MODES = ["execute", "compile", "align", "assume_aligned", "threads"]
+
+
+def make_data(rows, index, columns=None):
+    """Return the data object of the rules, with random values."""
+    random = np.random.default_rng(0)
+    x_index = pd.RangeIndex(rows)
+    if index == "shared":
+        y_index = x_index
+    elif index == "shuffled":
+        y_index = pd.Index(random.permutation(rows))
+    else:
+        y_index = pd.RangeIndex(rows // 10, rows + rows // 10)
+
+    def make(index):
+        if columns is None:
+            return pd.Series(random.random(rows), index=index)
+        return pd.DataFrame(random.random((rows, columns)), index=index)
+
+    return {"x": make(x_index), "y": make(y_index)}
+
+
+def make_evaluate(rule, index, mode):
+    """Return the function evaluating a rule with a data object."""
+    engine = Engine()
+    logic = RULES[rule]
+    if mode == "execute":
+        return partial(engine.execute, logic)
+    if mode == "assume_aligned" and index != "shared":
+        raise NotImplementedError  # Would return wrong results
+    return engine.compile(
+        logic,
+        align=mode == "align",
+        assume_aligned=mode == "assume_aligned",
+        threads=mode == "threads",
+    )
+
+
+class SeriesOperations:
+    """Binary operations over Series."""
+
+    params = (list(RULES), ROWS, INDEXES, MODES)
+    param_names = ["rule", "rows", "index", "mode"]
+    timeout = 300
+
+    def setup(self, rule, rows, index, mode):
+        self.evaluate = make_evaluate(rule, index, mode)
+        self.data = make_data(rows, index)
+
+    def time_evaluate(self, rule, rows, index, mode):
+        self.evaluate(self.data)
+
+    def peakmem_evaluate(self, rule, rows, index, mode):
+        self.evaluate(self.data)
+
+
+class FrameOperations:
+    """Binary operations over DataFrames of 2 columns."""
+
+    params = (["+", "<", "scalar", "compound"], ROWS, INDEXES, MODES)
+    param_names = ["rule", "rows", "index", "mode"]
+    timeout = 300
+
+    def setup(self, rule, rows, index, mode):
+        self.evaluate = make_evaluate(rule, index, mode)
+        self.data = make_data(rows, index, columns=2)
+
+    def time_evaluate(self, rule, rows, index, mode):
+        self.evaluate(self.data)
+
+    def peakmem_evaluate(self, rule, rows, index, mode):
+        self.evaluate(self.data)
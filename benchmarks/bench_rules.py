@@ -0,0 +1,161 @@
+from functools import partial
+
+from bamboorules.engine import Engine
+
+# Typical rules, with the data object they are evaluated with
+RULES = {
+    "comparison": (
+        {"and": [{">=": [{"var": "age"}, 18]}, {"==": [{"var": "country"}, "FR"]}]},
+        {"age": 42, "country": "FR"},
+    ),
+    "arithmetic": (
+        {"<": [{"*": [{"+": [{"var": "a"}, {"var": "b"}]}, 2]}, 100]},
+        {"a": 12, "b": 30},
+    ),
+    "if": (
+        {
+            "if": [
+                {"<": [{"var": "temp"}, 0]},
+                "freezing",
+                {"<": [{"var": "temp"}, 100]},
+                "liquid",
+                "gas",
+            ]
+        },
+        {"temp": 55},
+    ),
+    "in": (
+        {"in": [{"var": "fruit"}, ["apple", "banana", "cherry", "peach"]]},
+        {"fruit": "cherry"},
+    ),
+    "missing": (
+        {"missing": ["a", "b", "c"]},
+        {"a": 1, "b": "", "c": 3},
+    ),
+    "cat": (
+        {"cat": ["Hello, ", {"var": "name"}, "!"]},
+        {"name": "world"},
+    ),
+}
+
+# Numbers of records of record batches
+BATCHES = [100, 10000]
+
+# Depths of nested rules
+DEPTHS = [10, 50, 200, 5000]
+
+# Depth from which nested rules exceed the recursion limit of recursive modes
+MAX_RECURSIVE_DEPTH = 200
+
+# Variable paths, with their number of segments
+PATHS = [1, 3, 10]
+
+
+def nested(depth):
+    """Return a rule adding 1 to variable "a" 'depth' times."""
+    logic = {"var": "a"}
+    for _ in range(depth):
+        logic = {"+": [logic, 1]}
+    return logic
+
+
+class Rules:
+    """Typical rules, interpreted and compiled."""
+
+    params = (list(RULES), ["execute", "compile"])
+    param_names = ["rule", "mode"]
+
+    def setup(self, rule, mode):
+        engine = Engine()
+        logic, self.data = RULES[rule]
+        if mode == "compile":
+            self.evaluate = engine.compile(logic)
+        else:
+            self.evaluate = partial(engine.execute, logic)
+
+    def time_evaluate(self, rule, mode):
+        self.evaluate(self.data)
+
+
+class Records:
+    """Typical rules over batches of records, one by one or at once."""
+
+    params = (list(RULES), BATCHES, ["execute", "compile", "execute_records"])
+    param_names = ["rule", "records", "mode"]
+
+    def setup(self, rule, records, mode):
+        engine = Engine()
+        logic, data = RULES[rule]
+        self.records = [dict(data) for _ in range(records)]
+        if mode == "execute_records":
+            self.evaluate = partial(engine.execute_records, logic)
+        else:
+            if mode == "compile":
+                evaluate = engine.compile(logic)
+            else:
+                evaluate = partial(engine.execute, logic)
+            self.evaluate = lambda records: [evaluate(record) for record in records]
+
+    def time_evaluate(self, rule, records, mode):
+        self.evaluate(self.records)
+
+    def peakmem_evaluate(self, rule, records, mode):
+        self.evaluate(self.records)
+
+
+class DeepNesting:
+    """Rules nested several levels deep."""
+
+    params = (DEPTHS, ["execute", "compile", "execute_iterative", "iterative"])
+    param_names = ["depth", "mode"]
+
+    def setup(self, depth, mode):
+        engine = Engine()
+        logic = nested(depth)
+        self.data = {"a": 1}
+        if mode in ("execute", "compile") and depth > MAX_RECURSIVE_DEPTH:
+            raise NotImplementedError  # Raises RecursionError
+        if mode == "compile":
+            self.evaluate = engine.compile(logic)
+        elif mode == "iterative":
+            self.evaluate = engine.compile_iterative(logic)
+        elif mode == "execute_iterative":
+            self.evaluate = partial(engine.execute_iterative, logic)
+        else:
+            self.evaluate = partial(engine.execute, logic)
+
+    def time_evaluate(self, depth, mode):
+        self.evaluate(self.data)
+
+    def peakmem_evaluate(self, depth, mode):
+        self.evaluate(self.data)
+
+
+class VarPath:
+    """Resolution of dot-notated variable paths through dictionaries and arrays."""
+
+    params = (PATHS, ["execute", "compile"])
+    param_names = ["segments", "mode"]
+
+    def setup(self, segments, mode):
+        engine = Engine()
+        names = (["key", "items", "1"] * segments)[: segments - 1] + ["leaf"]
+        data = 1
+        for name in reversed(names):
+            data = [None, data] if name == "1" else {name: data}
+        self.data = data
+        self.evaluate = {}
+        for name, logic in (
+            ("found", {"var": ".".join(names)}),
+            ("default", {"var": [".".join(names), 0, False]}),
+        ):
+            if mode == "compile":
+                self.evaluate[name] = engine.compile(logic)
+            else:
+                self.evaluate[name] = partial(engine.execute, logic)
+
+    def time_var(self, segments, mode):
+        self.evaluate["found"](self.data)
+
+    def time_var_default(self, segments, mode):
+        self.evaluate["default"]({})
@@ -0,0 +1,57 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from bamboorules.engine import Engine
+
+# Scoped rules evaluated over the "values" variable
+RULES = {
+    "filter": {"filter": [{"var": "values"}, {"%": [{"var": ""}, 2]}]},
+    "map": {"map": [{"var": "values"}, {"*": [{"var": ""}, 2]}]},
+    "reduce": {
+        "reduce": [
+            {"var": "values"},
+            {"+": [{"var": "accumulator"}, {"var": "current"}]},
+            0,
+        ]
+    },
+    "reduce_generic": {
+        "reduce": [
+            {"var": "values"},
+            {"+": [{"var": "accumulator"}, {"*": [{"var": "current"}, 2]}]},
+            0,
+        ]
+    },
+    "all": {"all": [{"var": "values"}, {">=": [{"var": ""}, 0]}]},
+}
+
+# Numbers of elements of the scoped arrays
+SIZES = [100, 10000]
+
+
+class Scoped:
+    """Scoped operations over Python arrays and Pandas Series."""
+
+    params = (list(RULES), SIZES, ["list", "series"], ["execute", "compile"])
+    param_names = ["rule", "size", "container", "mode"]
+
+    def setup(self, rule, size, container, mode):
+        engine = Engine()
+        values = np.arange(1, size + 1)
+        if container == "series":
+            if rule == "reduce_generic":
+                raise NotImplementedError  # Evaluated element by element
+            self.data = {"values": pd.Series(values)}
+        else:
+            self.data = {"values": values.tolist()}
+        if mode == "compile":
+            self.evaluate = engine.compile(RULES[rule])
+        else:
+            self.evaluate = partial(engine.execute, RULES[rule])
+
+    def time_evaluate(self, rule, size, container, mode):
+        self.evaluate(self.data)
+
+    def peakmem_evaluate(self, rule, size, container, mode):
+        self.evaluate(self.data)
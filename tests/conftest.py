@@ -0,0 +1,24 @@
+import pytest
+
+from bamboorules import dispatch
+from bamboorules.engine import Engine
+
+
+@pytest.fixture
+def engine():
+    """
+    Engine whose custom operations and binary operation kernels, shared by
+    every engine, are removed once the test is done.
+    """
+    engine = Engine()
+    operations = set(Engine._custom_operations)
+    kernels = {
+        name: set(operation.registry)
+        for name, operation in dispatch.BINARY_OPERATIONS.items()
+    }
+    yield engine
+    for name in set(Engine._custom_operations) - operations:
+        engine.rm_operation(name)
+    for name, operation in dispatch.BINARY_OPERATIONS.items():
+        for left, right in set(operation.registry) - kernels[name]:
+            engine.rm_kernel(name, left, right)
@@ -0,0 +1,64 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+LEFT = pd.DataFrame({"a": [1.0, 2.0, 3.0, 4.0]}, index=[0, 1, 2, 3])
+RIGHT = pd.DataFrame({"b": [10.0, 20.0, 30.0, 40.0]}, index=[3, 2, 1, 0])
+PARTIAL = pd.DataFrame({"b": [10.0, 20.0, 30.0]}, index=[5, 3, 1])
+DUPLICATED = pd.DataFrame({"b": [10.0, 20.0, 30.0]}, index=[1, 1, 2])
+
+RULES = [
+    {"+": [{"var": "l.a"}, {"var": "r.b"}]},
+    {"+": [{"var": "r.b"}, {"var": "l.a"}]},
+    {">": [{"var": "l.a"}, {"*": [{"var": "r.b"}, 0.1]}]},
+    {"-": [{"+": [{"var": "s"}, {"var": "r.b"}]}, {"var": "l.a"}]},
+    {"<": [{"*": [{"var": "l.a"}, 10]}, {"var": "r.b"}]},
+    {"-": [{"abs": [{"var": "r.b"}]}, {"var": "l.a"}]},
+    {"if": [{">": [{"var": "l.a"}, 2]}, {"var": "r.b"}, {"var": "l.a"}]},
+]
+
+
+def assert_same(result, expected):
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+@pytest.mark.parametrize("logic", RULES)
+@pytest.mark.parametrize("right", [LEFT.rename(columns={"a": "b"}), RIGHT, PARTIAL])
+def test_aligned_plan_matches_execute(logic, right):
+    engine = Engine()
+    data = {"l": LEFT, "r": right, "s": 1.0}
+    assert_same(engine.compile(logic, align=True)(data), engine.execute(logic, data))
+
+
+@pytest.mark.parametrize("logic", RULES[:3])
+def test_assume_aligned_plan_matches_execute(logic):
+    engine = Engine()
+    data = {"l": LEFT, "r": LEFT.rename(columns={"a": "b"}), "s": 1.0}
+    plan = engine.compile(logic, assume_aligned=True)
+    assert_same(plan(data), engine.execute(logic, data))
+
+
+def test_unaligned_call_during_aligned_call():
+    engine = Engine()
+    logic = {"+": [{"var": "l.a"}, {"var": "r.b"}]}
+    unaligned = {"l": LEFT, "r": DUPLICATED}
+    expected = engine.execute(logic, unaligned)
+    results = []
+
+    def hook(node, data, result, elapsed):
+        if not results:
+            results.append(None)
+            # Another thread calls the plan while this call is aligned
+            thread = threading.Thread(target=lambda: results.append(plan(unaligned)))
+            thread.start()
+            thread.join()
+            # So does this thread
+            results.append(plan(unaligned))
+
+    plan = engine.compile(logic, align=True, hooks=[hook])
+    plan({"l": LEFT, "r": RIGHT})
+    assert_same(results[1], expected)
+    assert_same(results[2], expected)
@@ -0,0 +1,71 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+DATA = {"a": 3, "b": 4.5, "items": [1, 2, 3]}
+
+FEATURES = {"x": 10, "y": 0, "z": -2}
+
+RULES = [
+    {"+": [{"lookup": ["x"]}, {"-": [{"lookup": ["z"]}, {"var": "a"}]}]},
+    {"if": [{"lookup": ["y"]}, "yes", {">": [{"lookup": ["x"]}, 5]}, "big", "no"]},
+    {"and": [{"lookup": ["x"]}, {"lookup": ["y"]}, {"lookup": ["z"]}]},
+    {"or": [{"lookup": ["y"]}, {"var": "b"}]},
+    {"map": [{"var": "items"}, {"*": [{"var": ""}, {"lookup": ["x"]}]}]},
+    {"cat": [{"lookup": ["x"]}, "-", {"var": "a"}]},
+    {"<": [{"var": "a"}, {"var": "b"}]},
+]
+
+
+async def fetch(name):
+    await asyncio.sleep(0)
+    return FEATURES[name]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_async_matches_execute(logic, engine):
+    engine.add_operation("lookup", fetch)
+    result = asyncio.run(engine.execute_async(logic, DATA))
+    engine.add_operation("lookup", FEATURES.__getitem__)
+    assert result == engine.execute(logic, DATA)
+
+
+def test_async_matches_execute_on_frames(engine):
+    frame = pd.DataFrame({"a": [1, 5, 12]})
+    logic = {"if": [{"<": [{"var": "a"}, {"lookup": ["x"]}]}, "low", "high"]}
+    engine.add_operation("lookup", fetch)
+    result = asyncio.run(engine.execute_async(logic, frame))
+    engine.add_operation("lookup", FEATURES.__getitem__)
+    pd.testing.assert_series_equal(result, engine.execute(logic, frame))
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 1, 2])
+def test_async_limits_concurrency(max_concurrency, engine):
+    running, peak = [0], [0]
+
+    async def lookup(name):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return FEATURES[name]
+
+    engine.add_operation("lookup", lookup)
+    logic = {"cat": [{"lookup": ["x"]}, {"lookup": ["y"]}, {"lookup": ["z"]}]}
+    result = asyncio.run(engine.execute_async(logic, max_concurrency=max_concurrency))
+    assert result == "100-2"
+    assert peak[0] == (max_concurrency or 3)
+
+
+def test_async_only_evaluates_needed_arguments(engine):
+    calls = []
+
+    async def lookup(name):
+        calls.append(name)
+        return FEATURES[name]
+
+    engine.add_operation("lookup", lookup)
+    logic = {"and": [{"lookup": ["y"]}, {"lookup": ["x"]}]}
+    assert asyncio.run(engine.execute_async(logic)) == 0
+    assert calls == ["y"]
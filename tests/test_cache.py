@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from bamboorules.cache import ResultCache, sizeof
+from bamboorules.engine import Engine
+
+RULES = [
+    {"+": [{"var": "a"}, 1]},
+    {"if": [{">": [{"var": "a"}, 1]}, "big", "small"]},
+    {"in": [{"var": "b"}, ["x", "y"]]},
+    {"filter": [{"var": "c"}, {">": [{"var": ""}, 1]}]},
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_cached_execute_matches_execute(logic):
+    data = {"a": 2, "b": "x", "c": [1, 2, 3]}
+    engine = Engine(cache=ResultCache())
+    expected = Engine().execute(logic, data)
+    assert engine.execute(logic, data) == expected
+    assert engine.execute(logic, dict(data)) == expected
+    assert (engine.cache.hits, engine.cache.misses) == (1, 1)
+
+
+def test_cached_execute_matches_execute_on_frames():
+    frame = pd.DataFrame({"a": [1, 2, 3]})
+    logic = {"*": [{"var": "df.a"}, 2]}
+    engine = Engine(cache=ResultCache())
+    pd.testing.assert_series_equal(
+        engine.execute(logic, {"df": frame}), Engine().execute(logic, {"df": frame})
+    )
+    assert engine.execute(logic, {"df": frame}) is engine.execute(logic, {"df": frame})
+
+
+def test_keys_count_towards_max_bytes():
+    cache = ResultCache(max_bytes=2**20)
+    engine = Engine(cache=cache)
+    for i in range(50):
+        data = {"a": i, "values": list(range(i * 100, i * 100 + 1000))}
+        engine.execute({"var": "a"}, data)
+        assert cache.nbytes <= cache.max_bytes
+    assert 0 < len(cache) < 50
+    key, (value, nbytes, _) = next(iter(cache._entries.items()))
+    assert nbytes == sizeof(value) + sizeof(key)
+
+
+def test_invalidate_drops_entries():
+    frame = pd.DataFrame({"a": [1, 2, 3]})
+    other = pd.DataFrame({"a": [4, 5, 6]})
+    logic = {"+": [{"var": "df.a"}, 1]}
+    engine = Engine(cache=ResultCache())
+    engine.execute(logic, {"df": frame})
+    engine.execute({"-": [{"var": "df.a"}, 1]}, {"df": frame})
+    engine.execute(logic, {"df": other})
+    assert len(engine.cache) == 3
+
+    frame.loc[0, "a"] = 10
+    engine.cache.invalidate(frame)
+    assert len(engine.cache) == 1
+    assert engine.execute(logic, {"df": frame}).tolist() == [11, 3, 4]
+    assert engine.cache.nbytes == sum(
+        entry[1] for entry in engine.cache._entries.values()
+    )
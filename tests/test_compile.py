@@ -0,0 +1,122 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+DATA = {"a": 3, "b": 4.5, "name": "world", "items": [1, 2, 3], "user": {"age": 42}}
+
+RULES = [
+    {"+": [{"var": "a"}, {"var": "b"}]},
+    {"-": [{"var": "a"}]},
+    {"*": [{"var": "a"}, {"var": "b"}]},
+    {"/": [{"var": "b"}, {"var": "a"}]},
+    {"%": [{"var": "a"}, 2]},
+    {"<": [1, {"var": "a"}]},
+    {">=": [{"var": "user.age"}, 18]},
+    {"==": [{"var": "name"}, "world"]},
+    {"!=": [{"var": "a"}, 3]},
+    {"!": [{"var": "a"}]},
+    {"!!": [{"var": "items"}]},
+    {"and": [{"var": "a"}, {"var": "b"}]},
+    {"or": [0, "", {"var": "name"}]},
+    {"if": [{"<": [{"var": "a"}, 0]}, "negative", {"<": [{"var": "a"}, 10]}, "small"]},
+    {"?:": [{"var": "a"}, "yes", "no"]},
+    {"in": [{"var": "a"}, {"var": "items"}]},
+    {"cat": ["Hello, ", {"var": "name"}, "!"]},
+    {"substr": [{"var": "name"}, 1, 3]},
+    {"min": [{"var": "a"}, {"var": "b"}, 1]},
+    {"max": [{"var": "a"}, {"var": "b"}]},
+    {"missing": ["a", "b"]},
+    {"missing_some": [1, ["a", "b"]]},
+    {"var": ["z", "default", False]},
+    {"var": "items.1"},
+    {"map": [{"var": "items"}, {"*": [{"var": ""}, 2]}]},
+    {"filter": [{"var": "items"}, {">": [{"var": ""}, 1]}]},
+    {
+        "reduce": [
+            {"var": "items"},
+            {"+": [{"var": "current"}, {"var": "accumulator"}]},
+            0,
+        ]
+    },
+    {"all": [{"var": "items"}, {">": [{"var": ""}, 0]}]},
+    {"some": [{"var": "items"}, {">": [{"var": ""}, 2]}]},
+    {"none": [{"var": "items"}, {">": [{"var": ""}, 2]}]},
+    [{"var": "a"}, {"+": [1, 1]}],
+    42,
+]
+
+# Rules of RULES supported over Pandas Series
+FRAME_RULES = [
+    logic
+    for logic in RULES[:15]
+    if next(iter(logic)) not in ("!=", "!")  # Truthiness of Series
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_plan_matches_execute(logic):
+    engine = Engine()
+    plan = engine.compile(logic)
+    assert plan(DATA) == engine.execute(logic, DATA)
+    assert plan(dict(DATA, a=-1)) == engine.execute(logic, dict(DATA, a=-1))
+
+
+@pytest.mark.parametrize("logic", FRAME_RULES)
+def test_plan_matches_execute_on_frames(logic):
+    engine = Engine()
+    frame = pd.DataFrame({"a": [-1, 0, 3, 12], "b": [4.5, 0.0, 1.0, 2.0]})
+    data = {"a": frame["a"], "b": frame["b"], "name": "world", "items": [1, 2, 3]}
+    data["user"] = {"age": frame["a"] * 10}
+    expected = engine.execute(logic, data)
+    result = engine.compile(logic)(data)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+def test_plan_binds_custom_operations(engine):
+    engine.add_operation("double", lambda a: a * 2)
+    plan = engine.compile({"double": [{"var": "a"}]})
+    engine.rm_operation("double")
+    assert plan({"a": 2}) == 4
+
+
+def test_plan_raises_unrecognized_operations_when_evaluated():
+    plan = Engine().compile({"if": [True, 1, {"unknown": []}]})
+    assert plan({}) == 1
+    with pytest.raises(ValueError):
+        Engine().compile({"unknown": [1]})({})
+
+
+def add_lookup(engine, calls, pure):
+    """Add a 'lookup' operation recording its calls to an engine."""
+
+    def lookup(key):
+        calls.append(key)
+        return len(key)
+
+    engine.add_operation("lookup", lookup, pure=pure)
+
+
+def test_plan_evaluates_common_subexpressions_once(engine):
+    calls = []
+    add_lookup(engine, calls, pure=True)
+    shared = {"+": [{"lookup": [{"var": "name"}]}, {"var": "a"}]}
+    logic = {"if": [{">": [shared, 5]}, {"*": [shared, 2]}, shared]}
+    plan = engine.compile(logic)
+    assert plan(DATA) == engine.execute(logic, DATA)
+    calls.clear()
+    assert plan(DATA) == 16
+    assert calls == ["world"]
+    assert plan(dict(DATA, name="x")) == 4
+    assert calls == ["world", "x"]
+
+
+def test_plan_evaluates_impure_subexpressions_each_time(engine):
+    calls = []
+    add_lookup(engine, calls, pure=False)
+    logic = {"+": [{"lookup": [{"var": "name"}]}, {"lookup": [{"var": "name"}]}]}
+    assert engine.compile(logic)(DATA) == engine.execute(logic, DATA) == 10
+    assert calls == ["world"] * 4
@@ -0,0 +1,95 @@
+import operator
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame({"a": [1, 2, 3, 4], "b": [4.0, 2.0, 1.0, 0.5]})
+
+OPERATORS = {
+    "==": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+}
+
+OPERANDS = [({"var": "a"}, {"var": "b"}), ({"var": "a"}, 2), (2, {"var": "b"})]
+
+
+@pytest.mark.parametrize("left, right", OPERANDS)
+@pytest.mark.parametrize("name", list(OPERATORS))
+def test_dispatched_operations_match_per_row_execute(name, left, right):
+    engine = Engine()
+    logic = {name: [left, right]}
+    result = engine.execute(logic, FRAME)
+    rows = FRAME.to_dict("records")
+    assert result.tolist() == [engine.execute(logic, row) for row in rows]
+    assert engine.compile(logic)(FRAME).tolist() == result.tolist()
+
+
+@pytest.mark.parametrize("name", list(OPERATORS))
+def test_dispatched_operations_align_series(name):
+    engine = Engine()
+    a, b = FRAME["a"], FRAME["b"].iloc[::-1].iloc[:3]
+    result = engine.execute({name: [{"var": "a"}, {"var": "b"}]}, {"a": a, "b": b})
+    a, b = a.align(b, join="inner")
+    pd.testing.assert_series_equal(result, OPERATORS[name](a, b), check_names=False)
+
+
+@pytest.mark.parametrize("name", list(OPERATORS))
+def test_dispatched_operations_on_scalars(name):
+    engine = Engine()
+    for a, b in ((3, 2), (2.5, 2), (2, 2)):
+        assert engine.execute({name: [a, b]}) == OPERATORS[name](a, b)
+
+
+@pytest.mark.parametrize("name", list(OPERATORS))
+def test_dispatched_operations_take_two_arguments(name):
+    engine = Engine()
+    logic = {name: [{"var": "a"}, 1, 2]}
+    with pytest.raises(TypeError):
+        engine.execute(logic, {"a": 3})
+    with pytest.raises(TypeError):
+        engine.compile(logic)({"a": 3})
+
+
+def test_added_kernels_take_precedence(engine):
+    logic = {"+": [{"var": "price"}, 0.5]}
+    data = {"price": Decimal("1.25")}
+    with pytest.raises(TypeError):
+        engine.execute(logic, data)
+    engine.add_kernel("+", Decimal, float, lambda a, b: a + Decimal(str(b)))
+    try:
+        assert engine.execute(logic, data) == Decimal("1.75")
+        assert engine.compile(logic)(data) == Decimal("1.75")
+        assert engine.execute({"+": [1, 0.5]}) == 1.5
+    finally:
+        engine.rm_kernel("+", Decimal, float)
+    with pytest.raises(TypeError):
+        engine.execute(logic, data)
+
+
+def test_added_kernels_apply_to_swapped_comparisons(engine):
+    calls = []
+
+    def less(a, b):
+        calls.append((a, b))
+        return Decimal(a) < Decimal(str(b))
+
+    engine.add_kernel("<", float, Decimal, less)
+    data = {"price": Decimal("1.25")}
+    assert engine.execute({">": [{"var": "price"}, 0.5]}, data) is True
+    assert calls == [(0.5, Decimal("1.25"))]
+
+
+def test_unsupported_kernels_are_rejected():
+    with pytest.raises(ValueError):
+        Engine().add_kernel("cat", str, str, operator.add)
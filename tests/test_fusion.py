@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bamboorules import fusion
+from bamboorules.engine import Engine
+
+pytestmark = pytest.mark.skipif(fusion.numexpr is None, reason="requires numexpr")
+
+RULES = [
+    {"+": [{"*": [{"var": "a"}, 2]}, {"var": "b"}]},
+    {"<": [{"-": [{"var": "a"}, {"var": "b"}]}, 0.5]},
+    {"and": [{">": [{"var": "a"}, 0.2]}, {"<=": [{"var": "b"}, 0.8]}]},
+    {"if": [{">": [{"+": [{"var": "a"}, {"var": "b"}]}, 1]}, "high", "low"]},
+]
+
+
+def chain(depth):
+    logic = {"var": "a"}
+    for _ in range(depth):
+        logic = {"+": [logic, {"var": "b"}]}
+    return logic
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    rows = fusion.FUSION_MIN_ROWS * 2
+    return pd.DataFrame({"a": rng.random(rows), "b": rng.random(rows)})
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_fused_plan_matches_execute(logic, frame):
+    engine = Engine()
+    expected = engine.execute(logic, frame)
+    pd.testing.assert_series_equal(
+        engine.compile(logic, fuse=True)(frame), expected, check_names=False
+    )
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_fused_plan_matches_execute_on_dictionaries(logic):
+    engine = Engine()
+    data = {"a": 0.4, "b": 0.9}
+    assert engine.compile(logic, fuse=True)(data) == engine.execute(logic, data)
+
+
+def test_fusion_is_attempted_once_per_call(monkeypatch):
+    calls = []
+    evaluate = fusion.evaluate
+
+    def counting(expression, values):
+        calls.append(expression)
+        return evaluate(expression, values)
+
+    monkeypatch.setattr(fusion, "evaluate", counting)
+    engine = Engine()
+    plan = engine.compile(chain(20), fuse=True)
+    assert plan({"a": 1, "b": 2}) == 41
+    assert len(calls) == 1
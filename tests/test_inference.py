@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame(
+    {
+        "a": np.array([1, 2, 3, 4], dtype="int8"),
+        "b": [0.5, 1.5, 2.5, 3.5],
+        "s": pd.array(["a", "b", "c", "d"], dtype="string"),
+    }
+)
+
+RULES = [
+    {"+": [{"var": "a"}, 1]},
+    {"*": [{"var": "a"}, {"var": "b"}]},
+    {">": [{"var": "a"}, 2]},
+    {">=": [3, {"var": "b"}]},
+    {"==": [{"var": "s"}, "b"]},
+    {"if": [{">": [{"var": "a"}, 2]}, {"var": "a"}, 0]},
+    {"and": [{">": [{"var": "a"}, 1]}, {"<": [{"var": "b"}, 3]}]},
+    {"or": [{">": [{"var": "a"}, 2]}, 0]},
+    {"and": [{">": [{"var": "a"}, 1]}, {"var": "a"}]},
+    {"if": [{">": [{"var": "a"}, 2]}, True, 0]},
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_schema_plan_matches_execute(logic):
+    engine = Engine()
+    expected = engine.execute(logic, FRAME)
+    result = engine.compile(logic, schema=FRAME)(FRAME)
+    assert result.tolist() == expected.tolist()
+    assert [type(value) for value in result] == [type(value) for value in expected]
+
+
+def test_schema_plan_keeps_booleans():
+    engine = Engine()
+    logic = {"or": [{">": [{"var": "a"}, 2]}, 0]}
+    result = engine.compile(logic, schema=FRAME)(FRAME)
+    assert result.tolist() == [0, 0, True, True]
+    assert result.dtype == object
+
+
+def test_schema_plan_uses_added_kernels(engine):
+    logic = {"+": [{"var": "b"}, 1]}
+    engine.add_kernel("+", pd.Series, int, lambda a, b: a * 100 + b)
+    result = engine.compile(logic, schema=FRAME)(FRAME)
+    assert result.tolist() == [51, 151, 251, 351]
+
+
+def test_schema_incompatible_types():
+    with pytest.raises(ValueError):
+        Engine().compile({"+": [{"var": "s"}, 1]}, schema=FRAME)
+
+
+@pytest.mark.parametrize(
+    "values, dtype",
+    [
+        ((1, 0), "int8"),
+        ((1000, -1), "int16"),
+        ((2**40, 0), "int64"),
+        ((1, 0.5), "float64"),
+    ],
+)
+def test_schema_plan_narrows_constant_branches(values, dtype):
+    engine = Engine()
+    logic = {"if": [{">": [{"var": "b"}, 1]}, *values]}
+    result = engine.compile(logic, schema=FRAME)(FRAME)
+    assert result.dtype == dtype
+    assert result.tolist() == engine.execute(logic, FRAME).tolist()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame(
+    {
+        "i": [1, 2, 3, 4],
+        "f": [1.0, 2.5, np.nan, 4.0],
+        "s": ["a", "b", None, "d"],
+        "o": pd.Series([1, "b", None, 4.0], dtype=object),
+        "b": [True, False, True, False],
+        "n": pd.array([1, None, 0, 4], dtype="Int64"),
+    }
+)
+
+ARRAYS = [
+    [1, 4, 7],
+    [1.0, 2.5],
+    ["a", "d", "z"],
+    [1, "b", 4.0],
+    [],
+    [None, "a"],
+    [True],
+    [0, "x"],
+]
+
+
+@pytest.mark.parametrize("array", ARRAYS)
+@pytest.mark.parametrize("column", list(FRAME))
+def test_compiled_membership_matches_execute(column, array):
+    engine = Engine()
+    logic = {"in": [{"var": column}, array]}
+    expected = engine.execute(logic, FRAME)
+    result = engine.compile(logic)(FRAME)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+@pytest.mark.parametrize("array", ARRAYS)
+@pytest.mark.parametrize("value", [1, 1.0, 2.5, "a", "z", None, True])
+def test_compiled_membership_matches_execute_on_scalars(value, array):
+    engine = Engine()
+    logic = {"in": [{"var": "x"}, array]}
+    data = {"x": value}
+    assert engine.compile(logic)(data) == engine.execute(logic, data)
+
+
+def test_unhashable_members_are_compared():
+    engine = Engine()
+    logic = {"in": [{"var": "x"}, [[1, 2], 3]]}
+    for value in ([1, 2], 3, [3]):
+        data = {"x": value}
+        assert engine.compile(logic)(data) == engine.execute(logic, data)
+
+
+def test_membership_plan_is_reusable():
+    engine = Engine()
+    plan = engine.compile({"in": [{"var": "i"}, [2, 3]]})
+    assert plan(FRAME).tolist() == [False, True, True, False]
+    assert plan(FRAME.iloc[::-1]).tolist() == [False, True, True, False][::-1]
+    assert plan({"i": 3}) is True
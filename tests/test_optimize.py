@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+X = {"var": "x"}
+Y = {"var": "y"}
+
+DATA = [
+    {"x": 0, "y": ""},
+    {"x": 3, "y": "a"},
+    {"x": -1, "y": "b"},
+]
+
+RULES = [
+    {"*": [{"var": "x"}, {"*": [24, 60]}]},
+    {"if": [True, X, Y]},
+    {"if": [False, X, {"<": [1, 2]}, Y, "z"]},
+    {"?:": [{"==": [1, 1]}, X, Y]},
+    {"and": [X, True, Y]},
+    {"and": [X, False, Y]},
+    {"or": [True, X]},
+    {"or": [0, X, {"or": [Y, ""]}]},
+    {"and": [X, {"and": [Y, {"!": [False]}]}]},
+    {"cat": [{"substr": ["hello", 0, 2]}, X]},
+    {"in": [X, {"map": [[1, 2, 3], {"*": [{"var": ""}, 1]}]}]},
+    {"/": [1, 0]},
+    {"+": [{"var": "x"}, {"max": [1, 2, 3]}]},
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_optimized_rule_matches_rule(logic):
+    engine = Engine()
+    optimized = engine.optimize(logic)
+    for data in DATA:
+        try:
+            expected = engine.execute(logic, data)
+        except ZeroDivisionError:
+            with pytest.raises(ZeroDivisionError):
+                engine.execute(optimized, data)
+        else:
+            assert engine.execute(optimized, data) == expected
+
+
+@pytest.mark.parametrize(
+    "logic, optimized",
+    [
+        ({"*": [24, 60]}, 1440),
+        ({"if": [True, X, Y]}, X),
+        ({"and": [X, True, Y]}, {"and": [X, Y]}),
+        ({"or": [True, X]}, True),
+        ({"and": [X, {"and": [Y, X]}]}, {"and": [X, Y, X]}),
+        ({"/": [1, 0]}, {"/": [1, 0]}),
+    ],
+)
+def test_optimize_simplifies(logic, optimized):
+    assert Engine().optimize(logic) == optimized
+
+
+def test_optimize_keeps_impure_operations(engine):
+    engine.add_operation("now", lambda: 1)
+    assert engine.optimize({"+": [{"now": []}, 1]}) == {"+": [{"now": []}, 1]}
+    engine.add_operation("double", lambda a: a * 2, pure=True)
+    assert engine.optimize({"+": [{"double": [2]}, 1]}) == 5
+
+
+def test_optimized_plan_matches_execute_on_frames():
+    engine = Engine()
+    frame = pd.DataFrame({"x": [0, 3, -1], "y": ["", "a", "b"]})
+    logic = {"and": [{">": [X, {"-": [1, 1]}]}, {"or": [False, Y]}]}
+    pd.testing.assert_series_equal(
+        engine.compile(logic, optimize=True)(frame), engine.execute(logic, frame)
+    )
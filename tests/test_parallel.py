@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame(
+    {
+        "a": np.arange(40) % 7,
+        "b": np.linspace(0, 1, 40),
+        "c": [f"x{i % 3}" for i in range(40)],
+    },
+    index=np.arange(40)[::-1],
+)
+
+RULES = [
+    {"*": [{"var": "a"}, {"var": "b"}]},
+    {"if": [{">": [{"var": "a"}, 3]}, {"var": "c"}, "low"]},
+    {"max_reduce": [{"var": "b"}]},
+    {"+": [{"count": [{"var": "a"}]}, {"min_reduce": [{"var": "a"}]}]},
+    {"-": [{"var": "a"}, {"max_reduce": [{"var": "a"}]}]},
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_parallel_matches_execute(logic):
+    engine = Engine()
+    result = engine.execute_parallel(logic, FRAME, processes=2, min_rows=10)
+    expected = engine.execute(logic, FRAME)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+def test_parallel_evaluates_small_data_in_process():
+    engine = Engine()
+    logic = RULES[0]
+    data = {"a": 2, "b": 0.5}
+    assert engine.execute_parallel(logic, data, processes=2) == 1.0
+    result = engine.execute_parallel(logic, FRAME, processes=2)
+    pd.testing.assert_series_equal(result, engine.execute(logic, FRAME))
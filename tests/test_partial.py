@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame({"a": [3, 1, 4, 1, 5, 9, 2, 6], "b": list("abcdefgh")})
+
+RULES = [
+    {"*": [{"var": "a"}, 2]},
+    {"if": [{">": [{"var": "a"}, 2]}, {"var": "b"}, "low"]},
+    {"max_reduce": [{"var": "a"}]},
+    {"+": [{"count": [{"var": "a"}]}, {"min_reduce": [{"var": "a"}]}]},
+]
+
+
+def assert_same(result, expected):
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_incremental_matches_execute(logic):
+    engine = Engine()
+    plan = engine.incremental(logic)
+    for rows in (0, 3, 3, 5, 8):
+        plan.update(FRAME.iloc[:rows])
+        assert len(plan) == rows
+    assert_same(plan.result, engine.execute(logic, FRAME))
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_stream_matches_execute(logic):
+    engine = Engine()
+    chunks = (FRAME.iloc[i : i + 3] for i in range(0, len(FRAME), 3))
+    results = list(engine.execute_stream(logic, chunks))
+    expected = engine.execute(logic, FRAME)
+    if isinstance(expected, pd.Series):
+        assert_same(pd.concat(results), expected)
+    else:
+        assert results == [expected]
+
+
+@pytest.mark.parametrize(
+    "logic", [{"fail": [{"var": "a"}]}, {"max_reduce": [{"fail": [{"var": "a"}]}]}]
+)
+def test_failed_update_evaluates_rows_again(logic, engine):
+    failing = [True]
+
+    def fail(a):
+        if failing[0]:
+            raise RuntimeError("Unavailable")
+        return a * 10
+
+    engine.add_operation("fail", fail)
+    plan = engine.incremental(logic)
+    with pytest.raises(RuntimeError):
+        plan.update(FRAME.iloc[:4])
+    assert len(plan) == 0
+
+    failing[0] = False
+    plan.update(FRAME.iloc[:4])
+    plan.update(FRAME)
+    assert len(plan) == len(FRAME)
+    assert_same(plan.result, engine.execute(logic, FRAME))
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_stream_matches_execute_on_csv_chunks(logic, tmp_path):
+    engine = Engine()
+    path = tmp_path / "frame.csv"
+    FRAME.to_csv(path, index=False)
+    results = list(engine.execute_stream(logic, pd.read_csv(path, chunksize=5)))
+    expected = engine.execute(logic, FRAME)
+    if isinstance(expected, pd.Series):
+        assert pd.concat(results).tolist() == expected.tolist()
+    else:
+        assert results == [expected]
+
+
+class Batch:
+    def __init__(self, frame):
+        self.frame = frame
+
+    def to_pandas(self):
+        return self.frame
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_stream_converts_batches(logic):
+    engine = Engine()
+    batches = [Batch(FRAME.iloc[:4]), Batch(FRAME.iloc[4:])]
+    results = list(engine.execute_stream(logic, batches))
+    expected = engine.execute(logic, FRAME)
+    if isinstance(expected, pd.Series):
+        assert_same(pd.concat(results), expected)
+    else:
+        assert results == [expected]
+
+
+def test_stream_rejects_mixed_rules():
+    logic = {"-": [{"var": "a"}, {"max_reduce": [{"var": "a"}]}]}
+    with pytest.raises(ValueError):
+        Engine().execute_stream(logic, [FRAME])
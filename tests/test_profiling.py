@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame({"a": [1, 2, 3, 4], "b": [0.5, 1.5, 2.5, 3.5]})
+
+RULES = [
+    {"+": [{"var": "a"}, {"var": "b"}]},
+    {"if": [{">": [{"var": "a"}, 2]}, {"*": [{"var": "b"}, 2]}, 0]},
+    {"max_reduce": [{"var": "a"}]},
+    {"and": [{"var": "a"}, {"<": [{"var": "b"}, 3]}]},
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_profile_result_matches_execute(logic):
+    engine = Engine()
+    result = engine.profile(logic, FRAME).result
+    expected = engine.execute(logic, FRAME)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+def test_profile_mirrors_the_rule():
+    engine = Engine()
+    profile = engine.profile(RULES[1], FRAME)
+    assert [node.operator for node in profile.walk()] == [
+        "if",
+        ">",
+        "var",
+        "*",
+        "var",
+    ]
+    assert profile.calls == 1
+    assert (profile.input_kind, profile.input_rows) == ("frame", 4)
+    assert (profile.output_kind, profile.output_rows) == ("series", 4)
+    assert profile.nbytes > 0
+    for node in profile.walk():
+        assert node.time >= 0
+        assert node.self_time <= node.time
+    assert str(profile).splitlines()[1].startswith("  >: 1 calls")
+
+
+def test_profile_calls_additional_hooks():
+    engine = Engine()
+    seen = []
+    engine.profile(RULES[0], {"a": 1, "b": 2}, hooks=[lambda *args: seen.append(args)])
+    assert [logic for logic, *_ in seen][-1] is RULES[0]
+    assert seen[-1][2] == 3
+
+
+def test_profile_rejects_constants():
+    with pytest.raises(ValueError):
+        Engine().profile(1)
@@ -0,0 +1,51 @@
+import pytest
+
+from bamboorules.engine import Engine
+
+RECORDS = [
+    {"x": 1, "y": "a"},
+    {"x": 0, "y": "b"},
+    {"x": 2, "y": ""},
+    {"x": 2.5, "y": "c"},
+    {"x": True, "y": "d"},
+]
+
+RULES = [
+    {"if": [{"var": "x"}, 1, 2.5]},
+    {"?:": [{"var": "x"}, True, 2]},
+    {"or": [{"var": "x"}, 2.5]},
+    {"and": [1, {"var": "x"}, 2.5]},
+    {"if": [{"var": "x"}, {"+": [{"var": ["x", 0]}, 1]}, 0.5]},
+    {"if": [{"var": "x"}, 1]},
+    {"==": [{"var": "x"}, 1]},
+    {"cat": [{"var": "y"}, "-", {"var": ["x", 0]}]},
+    {"in": [{"var": "y"}, ["a", "b"]]},
+    {"missing": ["x"]},
+    {"max": [{"var": ["x", 0]}, 1]},
+]
+
+
+def typed(values):
+    return [(type(value), value) for value in values]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_execute_records_matches_execute(logic):
+    engine = Engine()
+    expected = [engine.execute(logic, record) for record in RECORDS]
+    assert typed(engine.execute_records(logic, RECORDS)) == typed(expected)
+
+
+def test_execute_records_keeps_branch_types():
+    engine = Engine()
+    records = [{"x": 1}, {"x": 0}, {"x": 2}]
+    result = engine.execute_records({"if": [{"var": "x"}, 1, 2.5]}, records)
+    assert typed(result) == typed([1, 2.5, 1])
+
+
+def test_execute_records_absent_values():
+    engine = Engine()
+    records = [{"x": 1}, {}, {"x": None}, {"x": {"y": 1}}, {"x": 0}]
+    logic = {"if": [{"var": ["x", 0, False]}, 1, 2.5]}
+    expected = [engine.execute(logic, record) for record in records]
+    assert typed(engine.execute_records(logic, records)) == typed(expected)
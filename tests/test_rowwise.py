@@ -0,0 +1,144 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame(
+    {"a": [-5, 0, 3, 12, 7], "b": [1.5, 2.5, 0.0, 4.0, 9.0]},
+    index=[10, 20, 30, 40, 50],
+)
+
+IF_RULES = [
+    {"if": [{">": [{"var": "a"}, 0]}, "positive", "other"]},
+    {"if": [{"<": [{"var": "a"}, 0]}, "negative", {"<": [{"var": "a"}, 5]}, "small"]},
+    {"if": [{"<": [{"var": "a"}, 0]}, {"var": "b"}, {"*": [{"var": "a"}, 2]}]},
+    {"if": [{">": [{"var": "a"}, 5]}, 1]},
+    {"?:": [{"var": "a"}, {"var": "b"}, "zero"]},
+]
+
+OPERAND_RULES = [
+    {"and": [{">": [{"var": "a"}, 0]}, {"var": "b"}]},
+    {"or": [{"<": [{"var": "a"}, 0]}, {"var": "b"}, "none"]},
+    {"and": [{"var": "a"}, {"<": [{"var": "b"}, 5]}, {"+": [{"var": "a"}, 1]}]},
+    {"or": [{"var": "b"}, {"var": "a"}]},
+]
+
+
+def rows(logic):
+    """Evaluate a rule on each row of FRAME as a dictionary."""
+    engine = Engine()
+    return [engine.execute(logic, row) for row in FRAME.to_dict("records")]
+
+
+@pytest.mark.parametrize("logic", IF_RULES)
+def test_if_matches_rows(logic):
+    result = Engine().execute(logic, FRAME)
+    assert result.index.equals(FRAME.index)
+    assert result.tolist() == rows(logic)
+
+
+@pytest.mark.parametrize("logic", IF_RULES)
+def test_if_plan_matches_execute(logic):
+    engine = Engine()
+    pd.testing.assert_series_equal(
+        engine.compile(logic)(FRAME), engine.execute(logic, FRAME)
+    )
+
+
+def test_if_over_frame_condition():
+    engine = Engine()
+    frame = FRAME[["a"]].rename(columns={"a": "x"})
+    logic = {"if": [{">": [{"var": "df"}, 0]}, "positive", "other"]}
+    result = engine.execute(logic, {"df": frame})
+    assert result["x"].tolist() == rows(IF_RULES[0])
+
+
+@pytest.mark.parametrize("logic", OPERAND_RULES)
+def test_operands_match_rows(logic):
+    result = Engine().execute(logic, FRAME)
+    assert result.index.equals(FRAME.index)
+    assert result.tolist() == rows(logic)
+
+
+@pytest.mark.parametrize("logic", OPERAND_RULES)
+def test_operands_plan_matches_execute(logic):
+    engine = Engine()
+    pd.testing.assert_series_equal(
+        engine.compile(logic)(FRAME), engine.execute(logic, FRAME)
+    )
+
+
+SEEN = {"seen": [{"var": "a"}]}
+
+
+@pytest.mark.parametrize(
+    "logic, lengths",
+    [
+        ({"if": [{">": [{"var": "a"}, 0]}, SEEN, "other"]}, [3]),
+        (
+            {
+                "if": [
+                    {"<": [{"var": "a"}, 0]},
+                    "negative",
+                    {">": [SEEN, 5]},
+                    SEEN,
+                    SEEN,
+                ]
+            },
+            [4, 2, 2],
+        ),
+        ({"and": [{">": [{"var": "a"}, 5]}, SEEN]}, [2]),
+        ({"or": [{">": [{"var": "a"}, -10]}, SEEN]}, []),
+    ],
+)
+def test_branches_only_evaluate_active_rows(logic, lengths, engine):
+    seen = []
+    engine.add_operation("seen", lambda a: seen.append(len(a)) or a)
+    engine.execute(logic, {"a": FRAME["a"]})
+    assert seen == lengths
+
+
+DUPLICATED = FRAME.set_axis([0, 0, 1, 1, 1])
+
+
+@pytest.mark.parametrize("logic", IF_RULES + OPERAND_RULES)
+def test_duplicated_index_matches_rows(logic):
+    engine = Engine()
+    result = engine.execute(logic, DUPLICATED)
+    assert result.index.equals(DUPLICATED.index)
+    assert result.tolist() == rows(logic)
+    pd.testing.assert_series_equal(engine.compile(logic)(DUPLICATED), result)
+
+
+def test_duplicated_index_over_frame_condition():
+    frame = pd.DataFrame({"x": [1, -2, 3], "y": [-1, 3, 0]}, index=[7, 7, 8])
+    logic = {"if": [{">": [{"var": ""}, 0]}, {"var": ""}, 0]}
+    result = Engine().execute(logic, frame)
+    assert result.index.equals(frame.index)
+    assert result.to_numpy().tolist() == [[1, 0], [0, 3], [3, 0]]
+
+
+MIN = {"min_reduce": [{"var": "a"}]}
+
+
+@pytest.mark.parametrize(
+    "logic, expected",
+    [
+        (
+            {"if": [{">": [{"var": "a"}, 0]}, {"-": [{"var": "a"}, MIN]}, 0]},
+            [0, 0, 8, 17, 12],
+        ),
+        (
+            {"and": [{">": [{"var": "a"}, 2]}, {"max_reduce": [{"var": "a"}]}]},
+            [False, False, 12, 12, 12],
+        ),
+        (
+            {"or": [{"<": [{"var": "a"}, 0]}, {"-": [{"var": "b"}, MIN]}]},
+            [True, 7.5, 5.0, 9.0, 14.0],
+        ),
+    ],
+)
+def test_reductions_in_branches_use_all_rows(logic, expected):
+    engine = Engine()
+    assert engine.execute(logic, FRAME).tolist() == expected
+    assert engine.compile(logic)(FRAME).tolist() == expected
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+from bamboorules.ruleset import RuleSet
+
+FRAME = pd.DataFrame({"age": [12, 30, 70], "income": [0.0, 1000.0, 500.0]})
+
+RULES = {
+    "adult": {">=": [{"var": "age"}, 18]},
+    "senior": {">=": [{"var": "age"}, 65]},
+    "ratio": {"/": [{"var": "income"}, {"var": "age"}]},
+    "band": {"if": [{"<": [{"var": "age"}, 18]}, "minor", "major"]},
+    "both": {"and": [{">=": [{"var": "age"}, 18]}, {"var": "income"}]},
+    "constant": {"+": [1, 2]},
+}
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+@pytest.mark.parametrize("fuse", [False, True])
+def test_ruleset_matches_execute(optimize, fuse):
+    engine = Engine()
+    rules = RuleSet(RULES, engine=engine, optimize=optimize, fuse=fuse)
+    results = rules.execute(FRAME)
+    assert list(results) == list(RULES)
+    for name, logic in RULES.items():
+        expected = engine.execute(logic, FRAME)
+        if isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(results[name], expected, check_names=False)
+        else:
+            assert results[name] == expected
+
+
+def test_ruleset_evaluate_returns_a_frame():
+    engine = Engine()
+    frame = RuleSet(RULES, engine=engine).evaluate(FRAME)
+    assert list(frame.columns) == list(RULES)
+    assert frame.index.equals(FRAME.index)
+    assert frame["constant"].tolist() == [3, 3, 3]
+    assert frame["band"].tolist() == engine.execute(RULES["band"], FRAME).tolist()
+
+
+def test_ruleset_matches_execute_on_dictionaries():
+    engine = Engine()
+    data = {"age": 40, "income": 10.0}
+    assert RuleSet(RULES, engine=engine).execute(data) == {
+        name: engine.execute(logic, data) for name, logic in RULES.items()
+    }
+
+
+def test_ruleset_evaluates_shared_subexpressions_once(engine):
+    calls = []
+    engine.add_operation("score", lambda a: calls.append(a) or a * 2, pure=True)
+    score = {"score": [{"var": "age"}]}
+    rules = RuleSet({"high": {">": [score, 50]}, "low": {"<": [score, 20]}}, engine)
+    assert rules.execute({"age": 30}) == {"high": True, "low": False}
+    assert calls == [30]
@@ -0,0 +1,130 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+SERIES = pd.Series([3, 1, 4, 1, 5, 9, 2, 6], index=range(10, 18))
+
+FRAME = pd.DataFrame({"x": [1, 2, 3, 4], "y": [4.0, 5.0, 6.0, 7.0]})
+
+SERIES_RULES = [
+    {"filter": [{"var": "v"}, {">": [{"var": ""}, 2]}]},
+    {"filter": [{"var": "v"}, {"%": [{"var": ""}, 2]}]},
+    {"map": [{"var": "v"}, {"*": [{"var": ""}, 2]}]},
+    {"map": [{"var": "v"}, {"if": [{">": [{"var": ""}, 2]}, "big", "small"]}]},
+    {"all": [{"var": "v"}, {">": [{"var": ""}, 0]}]},
+    {"all": [{"var": "v"}, {">": [{"var": ""}, 1]}]},
+    {"some": [{"var": "v"}, {">": [{"var": ""}, 8]}]},
+    {"none": [{"var": "v"}, {">": [{"var": ""}, 8]}]},
+]
+
+FRAME_RULES = [
+    {"filter": [{"var": "df"}, {">": [{"var": "x"}, 2]}]},
+    {"map": [{"var": "df"}, {"+": [{"var": "x"}, {"var": "y"}]}]},
+    {"all": [{"var": "df"}, {"<": [{"var": "x"}, {"var": "y"}]}]},
+    {"some": [{"var": "df"}, {"==": [{"var": "x"}, 3]}]},
+    {"none": [{"var": "df"}, {"==": [{"var": "x"}, 3]}]},
+]
+
+
+def listed(value):
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict("records")
+    if isinstance(value, pd.Series):
+        return value.tolist()
+    return value
+
+
+@pytest.mark.parametrize("logic", SERIES_RULES)
+@pytest.mark.parametrize("mode", ["execute", "compile"])
+def test_scoped_series_matches_lists(logic, mode):
+    engine = Engine()
+    if mode == "compile":
+        result = engine.compile(logic)({"v": SERIES})
+    else:
+        result = engine.execute(logic, {"v": SERIES})
+    assert listed(result) == engine.execute(logic, {"v": SERIES.tolist()})
+    if isinstance(result, pd.Series) and "filter" not in logic:
+        assert result.index.equals(SERIES.index)
+
+
+@pytest.mark.parametrize("logic", FRAME_RULES)
+def test_scoped_frame_matches_records(logic):
+    engine = Engine()
+    result = engine.execute(logic, {"df": FRAME})
+    expected = engine.execute(logic, {"df": FRAME.to_dict("records")})
+    assert listed(result) == expected
+
+
+def test_scoped_empty_series():
+    engine = Engine()
+    for logic in SERIES_RULES:
+        result = engine.execute(logic, {"v": SERIES.iloc[:0]})
+        assert listed(result) == engine.execute(logic, {"v": []})
+
+
+def reducing(operator, initial):
+    reducer = {operator: [{"var": "accumulator"}, {"var": "current"}]}
+    return {"reduce": [{"var": "v"}, reducer, initial]}
+
+
+def folded(operator, initial, values):
+    """Reduce values element by element, like the generic 'reduce'."""
+    engine = Engine()
+    reducer = {operator: [{"var": "accumulator"}, {"var": "current"}]}
+    accumulator = initial
+    for current in values:
+        data = {"accumulator": accumulator, "current": current}
+        accumulator = engine.execute(reducer, data)
+    return accumulator
+
+
+NUMERIC_REDUCERS = [("+", 0), ("+", 10), ("*", 1), ("min", 100), ("max", 0)]
+
+
+def assert_identical(result, expected):
+    assert result == expected
+    assert type(result) is type(expected)
+    assert getattr(result, "dtype", None) == getattr(expected, "dtype", None)
+
+
+@pytest.mark.parametrize("operator, initial", NUMERIC_REDUCERS)
+@pytest.mark.parametrize("values", [[3, 1, 4, 1, 5], [2.5, -1.0], [7], []])
+def test_native_reduce_matches_generic_reduce(operator, initial, values):
+    engine = Engine()
+    logic = reducing(operator, initial)
+    assert_identical(
+        engine.execute(logic, {"v": values}), folded(operator, initial, values)
+    )
+    dtypes = ["float64"]
+    if all(isinstance(value, int) for value in values):
+        dtypes.append("int64")
+    for dtype in dtypes:
+        series = pd.Series(values, dtype=dtype)
+        expected = folded(operator, initial, series)
+        assert_identical(engine.execute(logic, {"v": series}), expected)
+
+
+@pytest.mark.parametrize("operator, initial", NUMERIC_REDUCERS)
+def test_native_reduce_keeps_large_integers_exact(operator, initial):
+    engine = Engine()
+    values = [2**53 + 1, 3, -(2**40)]
+    logic = reducing(operator, initial)
+    assert_identical(
+        engine.execute(logic, {"v": values}), folded(operator, initial, values)
+    )
+    series = pd.Series(values, dtype="int64")
+    expected = folded(operator, initial, series)
+    assert_identical(engine.execute(logic, {"v": series}), expected)
+
+
+@pytest.mark.parametrize("operator", ["and", "or"])
+@pytest.mark.parametrize("values", [[1, 2, 0, 3], [0, "", 5], ["a", "b"], []])
+@pytest.mark.parametrize("initial", [True, False, None])
+def test_native_logical_reduce_matches_generic_reduce(operator, values, initial):
+    engine = Engine()
+    expected = folded(operator, initial, values)
+    assert engine.execute(reducing(operator, initial), {"v": values}) == expected
+    if initial is not None:  # Pandas reductions have no initial value otherwise
+        series = pd.Series(values, dtype=object)
+        assert engine.execute(reducing(operator, initial), {"v": series}) == expected
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+DATA = {"a": 3, "b": 4.5, "name": "world", "items": [1, 2, 3], "user": {"age": 42}}
+
+RULES = [
+    {"+": [{"var": "a"}, {"var": "b"}]},
+    {"-": [{"var": "a"}]},
+    {"<": [1, {"var": "a"}]},
+    {">=": [{"var": "user.age"}, 18]},
+    {"!": [{"var": "a"}]},
+    {"and": [{"var": "a"}, {"var": "b"}]},
+    {"or": [0, "", {"var": "name"}]},
+    {"if": [{"<": [{"var": "a"}, 0]}, "negative", {"<": [{"var": "a"}, 10]}, "small"]},
+    {"?:": [{"var": "a"}, "yes", "no"]},
+    {"cat": ["Hello, ", {"var": "name"}, "!"]},
+    {"missing": ["a", "b"]},
+    {"var": ["z", "default", False]},
+    {"var": "items.1"},
+    {"map": [{"var": "items"}, {"*": [{"var": ""}, 2]}]},
+    {"filter": [{"var": "items"}, {">": [{"var": ""}, 1]}]},
+    {
+        "reduce": [
+            {"var": "items"},
+            {"+": [{"var": "current"}, {"var": "accumulator"}]},
+            10,
+        ]
+    },
+    {"some": [{"var": "items"}, {">": [{"var": ""}, 2]}]},
+    [{"var": "a"}, {"+": [1, 1]}],
+    42,
+]
+
+FRAME = pd.DataFrame({"a": [1, 5, 12], "b": [0.5, 1.5, 2.5]})
+
+FRAME_RULES = [
+    {"+": [{"var": "a"}, {"var": "b"}]},
+    {"if": [{"<": [{"var": "a"}, 2]}, "low", {"<": [{"var": "a"}, 10]}, "mid", "high"]},
+    {"and": [{">": [{"var": "a"}, 1]}, {"var": "b"}]},
+    {"max_reduce": [{"var": "b"}]},
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_stack_plan_matches_execute(logic):
+    engine = Engine()
+    plan = engine.compile_iterative(logic)
+    expected = engine.execute(logic, DATA)
+    assert plan(DATA) == expected
+    assert plan(DATA) == expected
+    assert engine.execute_iterative(logic, DATA) == expected
+
+
+@pytest.mark.parametrize("logic", FRAME_RULES)
+def test_stack_plan_matches_execute_on_frames(logic):
+    engine = Engine()
+    result = engine.execute_iterative(logic, FRAME)
+    expected = engine.execute(logic, FRAME)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+def test_stack_plan_evaluates_deeply_nested_rules():
+    depth = 5000
+    logic = {"var": "a"}
+    for _ in range(depth):
+        logic = {"+": [logic, 1]}
+    engine = Engine()
+    assert engine.execute_iterative(logic, {"a": 1}) == depth + 1
+    with pytest.raises(RecursionError):
+        engine.execute(logic, {"a": 1})
+
+    condition = "leaf"
+    for i in range(depth):
+        condition = {"if": [{"==": [{"var": "a"}, i]}, i, condition]}
+    assert engine.execute_iterative(condition, {"a": depth - 1}) == depth - 1
+    assert engine.execute_iterative(condition, {"a": -1}) == "leaf"
+
+
+def test_stack_plan_only_evaluates_needed_arguments(engine):
+    calls = []
+    engine.add_operation("seen", lambda a: calls.append(a) or a)
+    logic = {
+        "and": [{"seen": [0]}, {"seen": [1]}],
+        "if": [{"seen": [True]}, {"seen": ["then"]}, {"seen": ["else"]}],
+    }
+    assert engine.execute_iterative({"and": logic["and"]}) == 0
+    assert engine.execute_iterative({"if": logic["if"]}) == "then"
+    assert calls == [0, True, "then"]
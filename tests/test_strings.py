@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+FRAME = pd.DataFrame(
+    {
+        "name": ["alice", "bob", "carol", "dan"],
+        "city": ["Paris", "Lyon", "Nice", "Lille"],
+        "n": [1, 22, 333, 4],
+        "start": [0, 1, -2, 2],
+        "length": [2, -1, 1, 10],
+    }
+)
+
+RULES = [
+    {"cat": [{"var": "name"}, "@", {"var": "city"}]},
+    {"cat": ["#", {"var": "n"}]},
+    {"substr": [{"var": "name"}, 1]},
+    {"substr": [{"var": "name"}, -2]},
+    {"substr": [{"var": "name"}, 1, 2]},
+    {"substr": [{"var": "name"}, 0, -1]},
+    {"substr": [{"var": "name"}, {"var": "start"}, {"var": "length"}]},
+    {"substr": [{"var": "n"}, 1]},
+    {"in": ["l", {"var": "city"}]},
+    {"in": [{"var": "name"}, ["bob", "dan", "eve"]]},
+    {"in": [{"var": "n"}, [1, 4]]},
+    {"in": [{"substr": [{"var": "name"}, 0, 1]}, {"var": "name"}]},
+    {"in": [{"var": "city"}, "Paris Nice"]},
+]
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_string_operations_match_per_row_execute(logic):
+    engine = Engine()
+    result = engine.execute(logic, FRAME)
+    rows = FRAME.to_dict("records")
+    assert result.tolist() == [engine.execute(logic, row) for row in rows]
+    assert result.index.equals(FRAME.index)
+    assert engine.compile(logic)(FRAME).tolist() == result.tolist()
+
+
+@pytest.mark.parametrize(
+    "logic, expected",
+    [
+        ({"cat": ["I love", " pie"]}, "I love pie"),
+        ({"cat": ["n=", 1, True]}, "n=1True"),
+        ({"substr": ["jsonlogic", 4]}, "logic"),
+        ({"substr": ["jsonlogic", -5]}, "logic"),
+        ({"substr": ["jsonlogic", 1, 3]}, "son"),
+        ({"substr": ["jsonlogic", 4, -2]}, "log"),
+        ({"in": ["Spring", "Springfield"]}, True),
+        ({"in": ["Ringo", ["John", "Paul", "George"]]}, False),
+    ],
+)
+def test_string_operations_on_scalars(logic, expected):
+    assert Engine().execute(logic) == expected
+
+
+def test_missing_values_are_in_nothing():
+    frame = pd.DataFrame({"a": ["x", None, "y"], "b": ["xy", "xy", None]})
+    engine = Engine()
+    assert engine.execute({"in": [{"var": "a"}, ["x", "y"]]}, frame).tolist() == [
+        True,
+        False,
+        True,
+    ]
+    assert engine.execute({"in": ["x", {"var": "b"}]}, frame).tolist() == [
+        True,
+        True,
+        False,
+    ]
+    assert engine.execute({"in": [{"var": "a"}, {"var": "b"}]}, frame).tolist() == [
+        True,
+        False,
+        False,
+    ]
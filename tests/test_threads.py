@@ -0,0 +1,115 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bamboorules import threads
+from bamboorules.engine import Engine
+
+ROWS = 1000
+
+RULES = [
+    {"+": [{"*": [{"var": "a"}, 2]}, {"/": [{"var": "b"}, 3]}]},
+    {"<": [{"-": [{"var": "a"}, {"var": "b"}]}, {"*": [{"var": "b"}, 0.5]}]},
+    {"max": [{"+": [1, 2]}, {"*": [3, 4]}]},
+    {"if": [{">": [{"var": "a"}, 0.5]}, {"+": [{"var": "a"}, {"var": "b"}]}, 0]},
+]
+
+
+@pytest.fixture
+def frame(monkeypatch):
+    monkeypatch.setattr(threads, "THREADS", 4)
+    monkeypatch.setattr(threads, "THREAD_MIN_ROWS", ROWS)
+    monkeypatch.setattr(threads, "THREAD_MIN_WORK", ROWS)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"a": rng.random(ROWS), "b": rng.random(ROWS)})
+
+
+def add_record(engine, names):
+    """Add a thread-safe 'record' operation recording its threads to an engine."""
+
+    def record(value):
+        names.append(threading.current_thread().name)
+        return value
+
+    engine.add_operation("record", record, thread_safe=True)
+
+
+@pytest.mark.parametrize("logic", RULES)
+def test_threaded_plan_matches_execute(logic, frame):
+    engine = Engine()
+    expected = engine.execute(logic, frame)
+    result = engine.compile(logic, threads=True)(frame)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+
+
+@pytest.mark.parametrize("align", [False, True])
+def test_threaded_plan_matches_execute_aligned(align, frame):
+    engine = Engine()
+    logic = RULES[1]
+    data = {"a": frame["a"], "b": frame["b"].iloc[::-1]}
+    expected = engine.execute(logic, data)
+    result = engine.compile(logic, threads=True, align=align)(data)
+    pd.testing.assert_series_equal(result.sort_index(), expected.sort_index())
+
+
+def test_heavy_arguments_run_on_threads(frame, engine):
+    names = []
+    add_record(engine, names)
+    logic = {"+": [{"record": [{"var": "a"}]}, {"record": [{"var": "b"}]}]}
+    engine.compile(logic, threads=True)(frame)
+    assert any(name.startswith("bamboorules") for name in names)
+
+
+def test_cheap_arguments_run_serially(frame, monkeypatch, engine):
+    names = []
+    add_record(engine, names)
+    monkeypatch.setattr(threads, "THREAD_MIN_WORK", 2 * ROWS)
+    cheap = {"+": [{"record": [{"var": "a"}]}, {"record": [{"var": "b"}]}]}
+    engine.compile(cheap, threads=True)(frame)
+    assert names == [threading.current_thread().name] * 2
+
+    names.clear()
+    heavy = {
+        "+": [
+            {"record": [{"*": [{"var": "a"}, 2]}]},
+            {"record": [{"*": [{"var": "b"}, 2]}]},
+        ]
+    }
+    engine.compile(heavy, threads=True)(frame)
+    assert any(name.startswith("bamboorules") for name in names)
+
+
+def test_small_data_runs_serially(frame, engine):
+    names = []
+    add_record(engine, names)
+    logic = {"+": [{"record": [{"var": "a"}]}, {"record": [{"var": "b"}]}]}
+    engine.compile(logic, threads=True)(frame.iloc[: ROWS - 1])
+    assert names == [threading.current_thread().name] * 2
+
+
+def test_unsafe_operations_run_serially(frame, engine):
+    names = []
+
+    def record(value):
+        names.append(threading.current_thread().name)
+        return value
+
+    engine.add_operation("record", record)
+    logic = {"+": [{"record": [{"var": "a"}]}, {"record": [{"var": "b"}]}]}
+    engine.compile(logic, threads=True)(frame)
+    assert names == [threading.current_thread().name] * 2
+
+
+def test_errors_propagate(frame, engine):
+    def fail(value):
+        raise RuntimeError("Unavailable")
+
+    engine.add_operation("fail", fail, thread_safe=True)
+    logic = {"+": [{"*": [{"var": "a"}, 2]}, {"fail": [{"var": "b"}]}]}
+    with pytest.raises(RuntimeError):
+        engine.compile(logic, threads=True)(frame)
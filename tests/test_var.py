@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from bamboorules.engine import Engine
+
+DATA = {
+    "a": 1,
+    "nested": {"list": [10, {"deep": "x"}], "2": "two"},
+    "items": [[1, 2], [3, 4]],
+}
+
+RULES = [
+    ({"var": "a"}, 1),
+    ({"var": ["a"]}, 1),
+    ({"var": "nested.list.0"}, 10),
+    ({"var": "nested.list.1.deep"}, "x"),
+    ({"var": "nested.2"}, "two"),
+    ({"var": "items.1.0"}, 3),
+    ({"var": ["absent", "default", False]}, "default"),
+    ({"var": ["nested.absent.deeper", 0, False]}, 0),
+    ({"var": ""}, DATA),
+]
+
+
+@pytest.mark.parametrize("logic, expected", RULES)
+def test_var_matches_execute(logic, expected):
+    engine = Engine()
+    assert engine.execute(logic, DATA) == expected
+    assert engine.compile(logic)(DATA) == expected
+
+
+def test_var_indexes_sequences():
+    engine = Engine()
+    data = [5, 6, 7]
+    for logic in ({"var": 1}, {"var": "2"}):
+        assert engine.compile(logic)(data) == engine.execute(logic, data)
+
+
+def test_var_raises_for_absent_keys():
+    engine = Engine()
+    with pytest.raises(KeyError):
+        engine.compile({"var": "absent"})(DATA)
+
+
+FRAME = pd.DataFrame(
+    {"a": [1, 2], "address.city": ["Paris", "Lyon"], "b.c": [1.5, 2.5]}
+)
+
+
+@pytest.mark.parametrize("name", ["a", "address.city", "b.c"])
+def test_var_returns_frame_columns(name):
+    engine = Engine()
+    logic = {"var": name}
+    expected = engine.execute(logic, FRAME)
+    pd.testing.assert_series_equal(expected, FRAME[name])
+    pd.testing.assert_series_equal(engine.compile(logic)(FRAME), expected)
+
+
+def test_var_matches_execute_in_frame_rules():
+    engine = Engine()
+    logic = {"if": [{">": [{"var": "b.c"}, 2]}, {"var": "address.city"}, "none"]}
+    result = engine.compile(logic)(FRAME)
+    pd.testing.assert_series_equal(result, engine.execute(logic, FRAME))
+    assert result.tolist() == ["none", "Lyon"]